@@ -0,0 +1,551 @@
+# bench.py
+"""
+Benchmark headless (tanpa Qt / display) untuk loader, validator, renderer,
+dan pipeline BA+ND end-to-end. Semua data sintetis, dibuat di folder temp.
+
+Contoh:
+  python bench.py                                  # hasil -> bench_result.json
+  python bench.py --ukuran 100 1000 --mahasiswa 20 --putaran 3
+  python bench.py --simpan-baseline bench_baseline.json
+  python bench.py --baseline bench_baseline.json   # exit 1 kalau ada regresi
+  python bench.py --proses 8 --pool-mahasiswa 300  # serial vs RenderPool
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable
+
+_DEPAN = (
+    "Andi Budi Citra Dewi Eko Fajar Gita Hadi Indah Joko Kartika Lestari "
+    "Made Nur Putu Rina Sari Taufik Wahyu Yuni Ahmad Siti Bambang Ratna"
+).split()
+_BELAKANG = (
+    "Wijaya Santoso Pratama Saputra Hidayat Siregar Nasution Lubis Kusuma "
+    "Gunawan Setiawan Halim Harahap Sembiring Tanjung Purba Nugroho Rahman"
+).split()
+_GELAR = (
+    "S.Si., M.Si.",
+    "S.Si., M.Sc., Ph.D.",
+    "S.Pd., M.Pd.",
+    "S.T., M.T.",
+    "S.Kom., M.Kom.",
+    "M.Si.",
+)
+
+
+@dataclass
+class Hasil:
+    nama: str
+    n: int  # jumlah item per putaran
+    putaran: int
+    median_ms: float
+    min_ms: float
+    peak_kb: float  # puncak alokasi Python (tracemalloc) selama satu putaran
+
+    @property
+    def per_item_us(self) -> float:
+        return self.median_ms * 1000 / max(self.n, 1)
+
+
+# ---------- Data sintetis ----------
+def buat_dosen_xlsx(path: Path, n: int, seed: int = 1) -> list[str]:
+    """
+    Workbook dosen sintetis (kolom nama, jenis_id, id). Return list id.
+    """
+    from openpyxl import Workbook
+
+    rnd = random.Random(seed)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("dosen")
+    ws.append(["nama", "jenis_id", "id"])
+    ids = []
+    for i in range(n):
+        nama = f"{rnd.choice(_DEPAN)} {rnd.choice(_BELAKANG)}, {rnd.choice(_GELAR)}"
+        if rnd.random() < 0.2:
+            nama = "Dr. " + nama
+        jenis = "NIP" if rnd.random() < 0.8 else "NUP"
+        idnum = str(197001012000031000 + i * 7)
+        ws.append([nama, jenis, idnum])
+        ids.append(idnum)
+    wb.save(path)
+    return ids
+
+
+def buat_dosen_csv(path: Path, n: int, seed: int = 1) -> list[str]:
+    """
+    Versi .csv buat_dosen_xlsx (tanpa openpyxl). Return list id.
+    """
+    rnd = random.Random(seed)
+    ids = []
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["nama", "jenis_id", "id"])
+        for i in range(n):
+            nama = f"{rnd.choice(_DEPAN)} {rnd.choice(_BELAKANG)}, {rnd.choice(_GELAR)}"
+            idnum = str(197001012000031000 + i * 7)
+            w.writerow([nama, "NIP", idnum])
+            ids.append(idnum)
+    return ids
+
+
+def buat_roster_csv(path: Path, n: int, dosen_ids: list[str], seed: int = 2):
+    """
+    Roster ujian sintetis: n mahasiswa, dosen diambil dari dosen_ids.
+    """
+    rnd = random.Random(seed)
+    mulai = date(2025, 12, 1)
+    kolom = [
+        "nama_mahasiswa",
+        "npm",
+        "judul_skripsi",
+        "urutan",
+        "tanggal",
+        "jam_mulai",
+        "jam_selesai",
+        "pembimbing_1",
+        "pembimbing_2",
+        "penguji_1",
+        "penguji_2",
+        "id_nd",
+        "tanggal_nd",
+        "lokasi_ujian",
+        "prodi",
+    ]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(kolom)
+        for i in range(n):
+            pb1, pb2, pj1, pj2 = rnd.sample(dosen_ids, 4)
+            jam = 8 + (i % 4) * 2
+            w.writerow(
+                [
+                    f"{rnd.choice(_DEPAN)} {rnd.choice(_BELAKANG)}",
+                    f"2112{i:06d}",
+                    f"Analisis Model Matematika untuk Kasus {i}",
+                    str(i % 8 + 1),
+                    (mulai + timedelta(days=i // 4)).isoformat(),
+                    f"{jam:02d}:00",
+                    f"{jam + 2:02d}:00",
+                    pb1,
+                    pb2 if i % 2 else "",
+                    pj1,
+                    pj2,
+                    f"{i + 1}ND",
+                    "2025-11-20",
+                    "Ruang Sidang 1",
+                    "Matematika",
+                ]
+            )
+
+
+# ---------- Pengukuran ----------
+def ukur(
+    nama: str,
+    fn: Callable[[], object],
+    n: int = 1,
+    putaran: int = 5,
+    setup: Callable[[], object] | None = None,
+    memori: bool = True,
+) -> Hasil:
+    """
+    Jalankan fn sebanyak `putaran` kali (setup tidak ikut diukur), lalu satu
+    kali lagi di bawah tracemalloc untuk puncak memori (lewati dengan
+    memori=False, peak_kb jadi 0).
+    """
+    durasi = []
+    for _ in range(putaran):
+        if setup:
+            setup()
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        durasi.append((time.perf_counter() - t0) * 1000)
+
+    peak = 0
+    if memori:
+        if setup:
+            setup()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    hasil = Hasil(
+        nama=nama,
+        n=n,
+        putaran=putaran,
+        median_ms=statistics.median(durasi),
+        min_ms=min(durasi),
+        peak_kb=peak / 1024,
+    )
+    print(
+        f"{nama:<40} {hasil.median_ms:10.2f} ms  "
+        f"{hasil.per_item_us:10.1f} us/item  {hasil.peak_kb:10.0f} KB",
+        file=sys.stderr,
+    )
+    return hasil
+
+
+def _maxrss_kb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 if sys.platform == "darwin" else float(rss)
+
+
+def jalankan(
+    ukuran: list[int],
+    mahasiswa: int,
+    putaran: int,
+    tmp: Path,
+    proses: int = 0,
+) -> dict:
+    from core.batch import jalankan_roster
+    from core.dokumen import UjianData, siapkan_berita_acara, siapkan_nota_dinas
+    from core.excel_loader import Dosen, load_dosen_excel
+    from core.validator import FormData, validate_form
+    from core.word_generator import generate_docx, sanitize_filename
+
+    hasil: list[Hasil] = []
+
+    # --- loader ---
+    ids_kecil: list[str] = []
+    for n in ukuran:
+        xlsx = tmp / f"dosen_{n}.xlsx"
+        ids = buat_dosen_xlsx(xlsx, n)
+        if not ids_kecil or n < len(ids_kecil):
+            ids_kecil = ids
+        hasil.append(
+            ukur(
+                f"load_dosen_excel[{n}] cold",
+                lambda: load_dosen_excel(xlsx, use_snapshot=False),
+                n=n,
+                putaran=putaran,
+            )
+        )
+        load_dosen_excel(xlsx)  # tulis snapshot
+        hasil.append(
+            ukur(
+                f"load_dosen_excel[{n}] snapshot",
+                lambda: load_dosen_excel(xlsx),
+                n=n,
+                putaran=putaran,
+            )
+        )
+
+    # --- validator & sanitize ---
+    form = FormData(
+        nama_mahasiswa="Andi Wijaya",
+        npm="2112012345",
+        judul_skripsi="Analisis Model Matematika",
+        urutan=1,
+        hari="Senin",
+        jam_mulai="09:00",
+        jam_selesai="11:00",
+        pembimbing_1="Budi Santoso, M.Si.",
+        pembimbing_2="",
+        penguji_1="Citra Dewi, M.Sc.",
+        penguji_2="Eko Pratama, M.T.",
+    )
+    loop = 10_000
+    hasil.append(
+        ukur(
+            "validate_form",
+            lambda: [validate_form(form) for _ in range(loop)],
+            n=loop,
+            putaran=putaran,
+        )
+    )
+    nama_file = 'Berita Acara: Andi/Wijaya <2112012345>  "draft"?'
+    hasil.append(
+        ukur(
+            "sanitize_filename",
+            lambda: [sanitize_filename(nama_file) for _ in range(loop)],
+            n=loop,
+            putaran=putaran,
+        )
+    )
+
+    # --- render per template ---
+    d = [Dosen(f"Dosen {i}, M.Si.", "NIP", str(1000 + i)) for i in range(4)]
+    out = tmp / "out"
+    for jumlah_pb in (1, 2):
+        u = UjianData(
+            nama_mahasiswa="Andi Wijaya",
+            npm="2112012345",
+            judul_skripsi="Analisis Model Matematika",
+            urutan=1,
+            tanggal=date(2025, 12, 23),
+            jam_mulai="09:00",
+            jam_selesai="11:00",
+            pembimbing_1=d[0],
+            pembimbing_2=d[1] if jumlah_pb == 2 else None,
+            penguji_1=d[2],
+            penguji_2=d[3],
+            id_nd="123ND",
+            tanggal_nd=date(2025, 12, 1),
+            lokasi_ujian="Ruang Sidang 1",
+            prodi="Matematika",
+        )
+        for label, siapkan in (
+            ("ba", siapkan_berita_acara),
+            ("nd", siapkan_nota_dinas),
+        ):
+            dok = siapkan(u)
+            hasil.append(
+                ukur(
+                    f"generate_docx[{label}_{jumlah_pb}pembimbing]",
+                    lambda dok=dok: generate_docx(
+                        dok.template_path,
+                        out,
+                        dok.nama_mahasiswa,
+                        dok.npm,
+                        dok.context,
+                        dok.output_filename,
+                        force=True,
+                    ),
+                    putaran=putaran,
+                )
+            )
+
+    # --- end-to-end ---
+    roster = tmp / f"roster_{mahasiswa}.csv"
+    buat_roster_csv(roster, mahasiswa, ids_kecil)
+    dosen_by_id = load_dosen_excel(tmp / f"dosen_{len(ids_kecil)}.xlsx")
+    e2e_out = tmp / "e2e"
+
+    def bersihkan():
+        # output baru setiap putaran, supaya manifest tidak melewati render
+        import shutil
+
+        shutil.rmtree(e2e_out, ignore_errors=True)
+
+    def e2e():
+        hasil_roster = jalankan_roster(roster, dosen_by_id, e2e_out)
+        gagal = [h for h in hasil_roster if not h.ok]
+        if gagal:
+            raise RuntimeError(f"Baris {gagal[0].baris}: {gagal[0].pesan}")
+
+    hasil.append(
+        ukur(
+            f"roster BA+ND[{mahasiswa}]",
+            e2e,
+            n=mahasiswa,
+            putaran=max(1, putaran // 2),
+            setup=bersihkan,
+        )
+    )
+
+    if proses > 1:
+        from core.paths import semua_template
+        from core.render_pool import RenderPool
+
+        # pool dibuat di luar pengukuran: yang diukur render, bukan start worker
+        with RenderPool(workers=proses, templates=semua_template()) as pool:
+
+            def e2e_paralel():
+                hasil_roster = jalankan_roster(roster, dosen_by_id, e2e_out, pool=pool)
+                gagal = [h for h in hasil_roster if not h.ok]
+                if gagal:
+                    raise RuntimeError(f"Baris {gagal[0].baris}: {gagal[0].pesan}")
+
+            hasil.append(
+                ukur(
+                    f"roster BA+ND[{mahasiswa}] {proses} proses",
+                    e2e_paralel,
+                    n=mahasiswa,
+                    putaran=max(1, putaran // 2),
+                    setup=bersihkan,
+                )
+            )
+
+    return {
+        "meta": {
+            "waktu": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu": os.cpu_count(),
+            "maxrss_kb": _maxrss_kb(),
+        },
+        "hasil": {h.nama: asdict(h) for h in hasil},
+    }
+
+
+def jalankan_pool(mahasiswa: int, proses: int, putaran: int, tmp: Path) -> dict:
+    """
+    Roster BA+ND besar (mis. 300 pasang): serial vs RenderPool(proses) pada
+    roster dan output yang sama. Tanpa tracemalloc: run serial ratusan dokumen
+    sudah lama, dan tracemalloc memperlambat berkali lipat.
+    """
+    import shutil
+
+    from core.batch import jalankan_roster
+    from core.excel_loader import load_dosen_excel
+    from core.paths import semua_template
+    from core.render_pool import RenderPool
+
+    dosen_csv = tmp / "pool_dosen.csv"
+    roster = tmp / f"pool_roster_{mahasiswa}.csv"
+    buat_roster_csv(roster, mahasiswa, buat_dosen_csv(dosen_csv, 200))
+    dosen_by_id = load_dosen_excel(dosen_csv, use_snapshot=False)
+    out = tmp / "pool_out"
+
+    def bersihkan():
+        shutil.rmtree(out, ignore_errors=True)
+
+    def roster_ba_nd(pool: RenderPool | None):
+        hasil_roster = jalankan_roster(roster, dosen_by_id, out, pool=pool)
+        gagal = [h for h in hasil_roster if not h.ok]
+        if gagal:
+            raise RuntimeError(f"Baris {gagal[0].baris}: {gagal[0].pesan}")
+
+    serial = ukur(
+        f"pool BA+ND[{mahasiswa}] serial",
+        lambda: roster_ba_nd(None),
+        n=mahasiswa,
+        putaran=putaran,
+        setup=bersihkan,
+        memori=False,
+    )
+    # pool dibuat di luar pengukuran: yang diukur render, bukan start worker
+    with RenderPool(workers=proses, templates=semua_template()) as pool:
+        paralel = ukur(
+            f"pool BA+ND[{mahasiswa}] {proses} proses",
+            lambda: roster_ba_nd(pool),
+            n=mahasiswa,
+            putaran=putaran,
+            setup=bersihkan,
+            memori=False,
+        )
+    speedup = serial.median_ms / paralel.median_ms
+    print(
+        f"RenderPool({proses}) vs serial, {mahasiswa} BA+ND: {speedup:.2f}x "
+        f"({os.cpu_count()} core)",
+        file=sys.stderr,
+    )
+    return {
+        "hasil": [serial, paralel],
+        "ringkasan": {
+            "mahasiswa": mahasiswa,
+            "proses": proses,
+            "serial_ms": serial.median_ms,
+            "pool_ms": paralel.median_ms,
+            "speedup": speedup,
+        },
+    }
+
+
+def bandingkan(sekarang: dict, baseline: dict, toleransi: float) -> list[str]:
+    """
+    Return daftar regresi: median waktu atau puncak memori naik > toleransi.
+    """
+    regresi = []
+    for nama, h in sekarang["hasil"].items():
+        b = baseline.get("hasil", {}).get(nama)
+        if not b:
+            continue
+        if h["median_ms"] > b["median_ms"] * (1 + toleransi):
+            regresi.append(
+                f"{nama}: {b['median_ms']:.2f} -> {h['median_ms']:.2f} ms "
+                f"(+{(h['median_ms'] / b['median_ms'] - 1) * 100:.0f}%)"
+            )
+        # selisih kecil (< 64 KB) diabaikan, itu noise alokator
+        if (
+            h["peak_kb"] > b["peak_kb"] * (1 + toleransi)
+            and h["peak_kb"] - b["peak_kb"] > 64
+        ):
+            regresi.append(
+                f"{nama}: memori {b['peak_kb']:.0f} -> {h['peak_kb']:.0f} KB"
+            )
+    return regresi
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--ukuran",
+        type=int,
+        nargs="+",
+        default=[100, 1000, 10_000, 50_000],
+        help="Jumlah baris workbook dosen sintetis",
+    )
+    parser.add_argument("--mahasiswa", type=int, default=50)
+    parser.add_argument("--putaran", type=int, default=5)
+    parser.add_argument(
+        "--proses",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Ukur juga roster dengan RenderPool sebanyak ini (<=1: lewati)",
+    )
+    parser.add_argument(
+        "--pool-mahasiswa",
+        type=int,
+        default=300,
+        help="Roster BA+ND serial vs RenderPool --proses sebanyak ini (0: lewati)",
+    )
+    parser.add_argument("--output", type=Path, default=Path("bench_result.json"))
+    parser.add_argument("--baseline", type=Path, help="Bandingkan dengan file ini")
+    parser.add_argument(
+        "--simpan-baseline", type=Path, help="Simpan hasil juga sebagai baseline"
+    )
+    parser.add_argument(
+        "--toleransi",
+        type=float,
+        default=0.2,
+        help="Batas kenaikan sebelum dianggap regresi (0.2 = 20%%)",
+    )
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="bench_") as d:
+        tmp = Path(d)
+        # snapshot dosen & cache lain jangan menyentuh cache user
+        os.environ["BERITA_ACARA_CACHE_DIR"] = str(tmp / "cache")
+        data = jalankan(
+            sorted(args.ukuran), args.mahasiswa, args.putaran, tmp, args.proses
+        )
+        if args.pool_mahasiswa > 0 and args.proses > 1:
+            pool = jalankan_pool(
+                args.pool_mahasiswa, args.proses, max(1, args.putaran // 5), tmp
+            )
+            data["hasil"].update({h.nama: asdict(h) for h in pool["hasil"]})
+            data["pool"] = pool["ringkasan"]
+
+    teks = json.dumps(data, indent=2, ensure_ascii=False)
+    args.output.write_text(teks, encoding="utf-8")
+    if args.simpan_baseline:
+        args.simpan_baseline.write_text(teks, encoding="utf-8")
+    print(f"Hasil: {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regresi = bandingkan(data, baseline, args.toleransi)
+        if regresi:
+            print("REGRESI:", file=sys.stderr)
+            for r in regresi:
+                print(f"  {r}", file=sys.stderr)
+            return 1
+        print("Tidak ada regresi terhadap baseline.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
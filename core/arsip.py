@@ -0,0 +1,414 @@
+# core/arsip.py
+"""
+Arsip ujian yang pernah di-generate (SQLite), untuk:
+- isi ulang form dari ujian terakhir satu NPM (termasuk "Ujian ke-" berikutnya)
+- generate ulang dokumen dari context yang tersimpan
+- cari ujian lama per NPM / dosen / tanggal / ID ND tanpa membuka folder output
+
+  with Arsip() as arsip:
+      arsip.catat(JENIS_BERITA_ACARA, u, out_path)
+      for r in arsip.cari(dosen_id="19780101"):
+          ...
+
+Satu baris per dokumen (BA dan ND satu ujian = dua baris), berisi data ujian
+dan context render lengkap (JSON). Database memakai WAL: pembaca (form, dialog
+riwayat) tidak menunggu penulis (job generate). WAL butuh disk lokal, jadi file
+default ada di data_dir(), bukan di folder output yang bisa berupa share.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Mapping
+
+from core.dokumen import (
+    JENIS_BERITA_ACARA,
+    JENIS_NOTA_DINAS,
+    Dokumen,
+    UjianData,
+    context_berita_acara,
+    context_nota_dinas,
+    nama_file_berita_acara,
+    nama_file_nota_dinas,
+)
+from core.excel_loader import Dosen
+from core.paths import (
+    data_dir,
+    pilih_template_berdasarkan_pembimbing,
+    pilih_template_nota_dinas_berdasarkan_pembimbing,
+)
+from core.profiling import span
+
+if TYPE_CHECKING:
+    from core.batch import HasilBaris
+
+NAMA_FILE = "arsip.sqlite3"
+# naikkan kalau skema berubah (lihat _migrasi)
+SKEMA_VERSION = 1
+PERAN_DOSEN = ("pembimbing_1", "pembimbing_2", "penguji_1", "penguji_2")
+
+_CONTEXT = {
+    JENIS_BERITA_ACARA: context_berita_acara,
+    JENIS_NOTA_DINAS: context_nota_dinas,
+}
+_NAMA_FILE = {
+    JENIS_BERITA_ACARA: nama_file_berita_acara,
+    JENIS_NOTA_DINAS: nama_file_nota_dinas,
+}
+_PILIH_TEMPLATE = {
+    JENIS_BERITA_ACARA: pilih_template_berdasarkan_pembimbing,
+    JENIS_NOTA_DINAS: pilih_template_nota_dinas_berdasarkan_pembimbing,
+}
+
+_SKEMA = """
+CREATE TABLE IF NOT EXISTS ujian (
+    id INTEGER PRIMARY KEY,
+    jenis TEXT NOT NULL,
+    npm TEXT NOT NULL,
+    nama_mahasiswa TEXT NOT NULL,
+    judul_skripsi TEXT NOT NULL,
+    urutan INTEGER NOT NULL,
+    tanggal TEXT NOT NULL,
+    jam_mulai TEXT NOT NULL,
+    jam_selesai TEXT NOT NULL,
+    pembimbing_1 TEXT NOT NULL,
+    pembimbing_2 TEXT NOT NULL,
+    penguji_1 TEXT NOT NULL,
+    penguji_2 TEXT NOT NULL,
+    id_nd TEXT NOT NULL,
+    tanggal_nd TEXT NOT NULL,
+    lokasi_ujian TEXT NOT NULL,
+    prodi TEXT NOT NULL,
+    output_filename TEXT NOT NULL,
+    context TEXT NOT NULL,
+    output TEXT NOT NULL,
+    dibuat TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_ujian_npm ON ujian (npm, tanggal);
+CREATE INDEX IF NOT EXISTS ix_ujian_tanggal ON ujian (tanggal);
+CREATE INDEX IF NOT EXISTS ix_ujian_id_nd ON ujian (id_nd);
+
+-- satu baris per (ujian, dosen): cari per dosen tanpa OR di empat kolom
+CREATE TABLE IF NOT EXISTS ujian_dosen (
+    ujian_id INTEGER NOT NULL REFERENCES ujian (id) ON DELETE CASCADE,
+    dosen_id TEXT NOT NULL,
+    peran TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_ujian_dosen ON ujian_dosen (dosen_id, ujian_id);
+CREATE INDEX IF NOT EXISTS ix_ujian_dosen_ujian ON ujian_dosen (ujian_id);
+"""
+
+_KOLOM = (
+    "jenis",
+    "npm",
+    "nama_mahasiswa",
+    "judul_skripsi",
+    "urutan",
+    "tanggal",
+    "jam_mulai",
+    "jam_selesai",
+    *PERAN_DOSEN,
+    "id_nd",
+    "tanggal_nd",
+    "lokasi_ujian",
+    "prodi",
+    "output_filename",
+    "context",
+    "output",
+    "dibuat",
+)
+_INSERT = (
+    f"INSERT INTO ujian ({', '.join(_KOLOM)}) "
+    f"VALUES ({', '.join('?' * len(_KOLOM))})"
+)
+
+
+def path_default() -> Path:
+    return data_dir() / NAMA_FILE
+
+
+@dataclass(frozen=True)
+class Rekaman:
+    """
+    Satu dokumen yang pernah di-generate. Dosen disimpan sebagai id.
+    """
+
+    id: int
+    jenis: str
+    npm: str
+    nama_mahasiswa: str
+    judul_skripsi: str
+    urutan: int
+    tanggal: date
+    jam_mulai: str
+    jam_selesai: str
+    pembimbing_1: str
+    pembimbing_2: str
+    penguji_1: str
+    penguji_2: str
+    id_nd: str
+    tanggal_nd: date | None
+    lokasi_ujian: str
+    prodi: str
+    output_filename: str
+    context: dict
+    output: str
+    dibuat: str
+
+    @classmethod
+    def dari_row(cls, row: sqlite3.Row) -> Rekaman:
+        data = dict(row)
+        data["tanggal"] = date.fromisoformat(data["tanggal"])
+        data["tanggal_nd"] = (
+            date.fromisoformat(data["tanggal_nd"]) if data["tanggal_nd"] else None
+        )
+        data["context"] = json.loads(data["context"])
+        return cls(**data)
+
+    def ke_ujian(self, dosen_by_id: Mapping[str, Dosen]) -> UjianData:
+        """
+        Data form. Dosen yang sudah tidak ada di Excel dosen jadi None.
+        """
+        return UjianData(
+            nama_mahasiswa=self.nama_mahasiswa,
+            npm=self.npm,
+            judul_skripsi=self.judul_skripsi,
+            urutan=self.urutan,
+            tanggal=self.tanggal,
+            jam_mulai=self.jam_mulai,
+            jam_selesai=self.jam_selesai,
+            pembimbing_1=dosen_by_id.get(self.pembimbing_1),
+            pembimbing_2=dosen_by_id.get(self.pembimbing_2),
+            penguji_1=dosen_by_id.get(self.penguji_1),
+            penguji_2=dosen_by_id.get(self.penguji_2),
+            id_nd=self.id_nd,
+            tanggal_nd=self.tanggal_nd,
+            lokasi_ujian=self.lokasi_ujian,
+            prodi=self.prodi,
+        )
+
+    def dokumen(self) -> Dokumen:
+        """
+        Dokumen siap simpan dengan context persis seperti saat dicatat (nama
+        dosen, nomor ND, tanggal), memakai template yang berlaku sekarang.
+        """
+        jumlah_pembimbing = 2 if self.pembimbing_2 else 1
+        return Dokumen(
+            jenis=self.jenis,
+            template_path=_PILIH_TEMPLATE[self.jenis](jumlah_pembimbing),
+            nama_mahasiswa=self.nama_mahasiswa,
+            npm=self.npm,
+            context=dict(self.context),
+            output_filename=self.output_filename,
+        )
+
+
+def _id(d: Dosen | None) -> str:
+    return d.id if d else ""
+
+
+def _nilai(jenis: str, u: UjianData, output: Path | str, dibuat: str) -> tuple:
+    if jenis not in _CONTEXT:
+        raise ValueError(f"Jenis dokumen tidak dikenal: {jenis}")
+    context = _CONTEXT[jenis](u)
+    return (
+        jenis,
+        u.npm,
+        u.nama_mahasiswa,
+        u.judul_skripsi,
+        u.urutan,
+        u.tanggal.isoformat(),
+        u.jam_mulai,
+        u.jam_selesai,
+        _id(u.pembimbing_1),
+        _id(u.pembimbing_2),
+        _id(u.penguji_1),
+        _id(u.penguji_2),
+        u.id_nd,
+        u.tanggal_nd.isoformat() if u.tanggal_nd else "",
+        u.lokasi_ujian,
+        u.prodi,
+        _NAMA_FILE[jenis](u),
+        json.dumps(context, ensure_ascii=False, sort_keys=True, default=str),
+        str(output),
+        dibuat,
+    )
+
+
+class Arsip:
+    """
+    Satu koneksi, dipakai bersama thread GUI dan thread job (dikunci per
+    operasi). Buka sekali per aplikasi / perintah CLI.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = Path(path) if path else path_default()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, timeout=10, check_same_thread=False
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL: commit tidak fsync, tetap konsisten setelah crash
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._migrasi()
+
+    def _migrasi(self) -> None:
+        with self._lock, self._conn:
+            versi = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if versi > SKEMA_VERSION:
+                raise RuntimeError(
+                    f"Arsip {self.path} dibuat versi aplikasi yang lebih baru "
+                    f"(skema {versi})."
+                )
+            self._conn.executescript(_SKEMA)
+            self._conn.execute(f"PRAGMA user_version={SKEMA_VERSION}")
+
+    def tutup(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> Arsip:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.tutup()
+
+    # ---------- tulis ----------
+    def catat(self, jenis: str, u: UjianData, output: Path | str) -> int:
+        """
+        Catat satu dokumen yang berhasil dibuat. Return id rekaman.
+        """
+        return self.catat_banyak([(jenis, u, output)])[0]
+
+    def catat_banyak(
+        self, items: Iterable[tuple[str, UjianData, Path | str]]
+    ) -> list[int]:
+        """
+        Semua dalam satu transaksi (roster ribuan baris = satu commit).
+        """
+        dibuat = datetime.now().isoformat(timespec="seconds")
+        ids: list[int] = []
+        with span("arsip"), self._lock, self._conn:
+            for jenis, u, output in items:
+                cur = self._conn.execute(_INSERT, _nilai(jenis, u, output, dibuat))
+                ujian_id = cur.lastrowid
+                ids.append(ujian_id)
+                dosen = [
+                    (ujian_id, d.id, peran)
+                    for peran, d in zip(
+                        PERAN_DOSEN,
+                        (u.pembimbing_1, u.pembimbing_2, u.penguji_1, u.penguji_2),
+                    )
+                    if d
+                ]
+                self._conn.executemany(
+                    "INSERT INTO ujian_dosen (ujian_id, dosen_id, peran) "
+                    "VALUES (?, ?, ?)",
+                    dosen,
+                )
+        return ids
+
+    def catat_hasil(self, hasil: Iterable[HasilBaris], jenis: Iterable[str]) -> int:
+        """
+        Catat baris batch yang sukses. outputs tiap baris urut sesuai jenis.
+        Return jumlah dokumen yang dicatat.
+        """
+        jenis = tuple(jenis)
+        items = [
+            (j, h.ujian, out)
+            for h in hasil
+            if h.ok and h.ujian is not None
+            for j, out in zip(jenis, h.outputs)
+        ]
+        return len(self.catat_banyak(items)) if items else 0
+
+    def hapus(self, rekaman_id: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM ujian WHERE id = ?", (rekaman_id,))
+
+    # ---------- baca ----------
+    def _query(self, sql: str, params: tuple = ()) -> list[Rekaman]:
+        with span("arsip"), self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [Rekaman.dari_row(r) for r in rows]
+
+    def ambil(self, rekaman_id: int) -> Rekaman | None:
+        hasil = self._query("SELECT * FROM ujian WHERE id = ?", (rekaman_id,))
+        return hasil[0] if hasil else None
+
+    def terakhir(self, npm: str) -> Rekaman | None:
+        """
+        Rekaman terbaru (tanggal ujian, lalu urutan catat) untuk satu NPM.
+        """
+        hasil = self._query(
+            "SELECT * FROM ujian WHERE npm = ? ORDER BY tanggal DESC, id DESC LIMIT 1",
+            (npm.strip(),),
+        )
+        return hasil[0] if hasil else None
+
+    def urutan_berikut(self, npm: str, sebelum: date | None = None) -> int:
+        """
+        "Ujian ke-" untuk ujian baru NPM ini: urutan tertinggi yang tercatat
+        (sebelum tanggal `sebelum`, kalau diisi) + 1; 1 kalau belum pernah.
+        Ujian yang sama di-generate ulang tidak menaikkan urutan.
+        """
+        sql = "SELECT MAX(urutan) FROM ujian WHERE npm = ?"
+        params: tuple = (npm.strip(),)
+        if sebelum is not None:
+            sql += " AND tanggal < ?"
+            params += (sebelum.isoformat(),)
+        with self._lock:
+            maks = self._conn.execute(sql, params).fetchone()[0]
+        return (maks or 0) + 1
+
+    def cari(
+        self,
+        npm: str | None = None,
+        dosen_id: str | None = None,
+        id_nd: str | None = None,
+        dari: date | None = None,
+        sampai: date | None = None,
+        jenis: str | None = None,
+        limit: int = 200,
+    ) -> list[Rekaman]:
+        """
+        Filter yang diisi digabung AND; terbaru dulu. Semua filter memakai index.
+        """
+        where: list[str] = []
+        params: list = []
+        sql = "SELECT * FROM ujian"
+        if dosen_id:
+            # IN, bukan JOIN: dosen dengan dua peran di satu ujian tetap satu baris
+            where.append("id IN (SELECT ujian_id FROM ujian_dosen WHERE dosen_id = ?)")
+            params.append(dosen_id.strip())
+        if npm:
+            where.append("npm = ?")
+            params.append(npm.strip())
+        if id_nd:
+            where.append("id_nd = ?")
+            params.append(id_nd.strip())
+        if dari:
+            where.append("tanggal >= ?")
+            params.append(dari.isoformat())
+        if sampai:
+            where.append("tanggal <= ?")
+            params.append(sampai.isoformat())
+        if jenis:
+            where.append("jenis = ?")
+            params.append(jenis)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY tanggal DESC, id DESC LIMIT ?"
+        params.append(limit)
+        return self._query(sql, tuple(params))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM ujian").fetchone()[0]
@@ -0,0 +1,529 @@
+# core/batch.py
+from __future__ import annotations
+
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Mapping
+
+from core.date_formatter import format_tanggal_iso
+from core.dokumen import (
+    JENIS_BERITA_ACARA,
+    JENIS_NOTA_DINAS,
+    SIAPKAN,
+    Dokumen,
+    TemplateSchemaError,
+    UjianData,
+    nama_file_gabungan,
+    siapkan_semua,
+)
+from core.excel_loader import Dosen
+from core.gabung import render_gabungan
+from core.konflik import Konflik, cari_konflik, jadwal_dari_ujian
+from core.nomor_nd import Nomor, PenomoranND
+from core.output_writer import OutputWriter, tulis_atomik
+from core.profiling import span
+from core.render_pool import HasilRender, RenderJob, RenderPool
+from core.roster import (
+    RosterFile,
+    load_roster,
+    parse_tanggal,
+    row_ke_ujian,
+    validasi_roster,
+)
+from core.word_generator import catat_manifest, cek_manifest
+from core.zip_export import DocxZipWriter
+
+SEMUA_JENIS = (JENIS_NOTA_DINAS, JENIS_BERITA_ACARA)
+
+
+@dataclass
+class HasilBaris:
+    baris: int
+    nama_mahasiswa: str
+    npm: str
+    ok: bool
+    pesan: str = ""
+    outputs: list[Path] = field(default_factory=list)
+    ujian: UjianData | None = None  # terisi kalau baris bisa dibaca
+
+
+def proses_ujian(
+    rows: Iterable[tuple[int, dict[str, str]]],
+    dosen_by_id: Mapping[str, Dosen],
+    output_root: Path,
+    jenis: Iterable[str] = SEMUA_JENIS,
+    batal: threading.Event | None = None,
+    zip_writer: DocxZipWriter | None = None,
+    pool: RenderPool | None = None,
+    writer: OutputWriter | None = None,
+) -> Iterator[HasilBaris]:
+    """
+    Dua tahap:
+      1. pre-flight seluruh roster: parse -> validasi -> context -> cek schema
+         template. Belum ada yang di-render.
+      2. render + simpan baris yang lolos.
+
+    Error data di satu baris dicatat di HasilBaris, baris lain tetap diproses.
+    Context yang tidak cocok dengan template (TemplateSchemaError) menghentikan
+    seluruh batch di tahap 1, sebelum satu dokumen pun dibuat.
+    Kalau event batal di-set, berhenti sebelum baris berikutnya.
+
+    Dengan zip_writer, dokumen masuk ke zip (outputs = nama entry) dan
+    output_root tidak dipakai.
+
+    Dengan pool, tahap 2 berjalan paralel di RenderPool dan HasilBaris keluar
+    sesuai urutan selesai (bukan urutan baris).
+
+    Dengan writer (OutputWriter), file ditulis di belakang: HasilBaris keluar
+    begitu dokumen selesai di-render; gagal tulis ada di writer.gagal.
+    """
+    jenis = _cek_jenis(jenis)
+
+    siap: list[tuple[HasilBaris, list[Dokumen]]] = []
+    for baris, row in rows:
+        if batal is not None and batal.is_set():
+            return
+        siap.append(_siapkan_baris(baris, row, dosen_by_id, jenis))
+
+    if pool is not None:
+        yield from _render_paralel(siap, output_root, pool, batal, zip_writer)
+        return
+
+    for hasil, dokumen in siap:
+        if batal is not None and batal.is_set():
+            return
+        if hasil.pesan:
+            yield hasil
+            continue
+        try:
+            for dok in dokumen:
+                if zip_writer is not None:
+                    entry = zip_writer.add(dok.relpath, dok.template_path, dok.context)
+                    hasil.outputs.append(Path(entry))
+                else:
+                    hasil.outputs.append(dok.simpan(output_root, writer=writer))
+            hasil.ok = True
+        except Exception as e:
+            hasil.pesan = str(e)
+        yield hasil
+
+
+def _cek_jenis(jenis: Iterable[str]) -> tuple[str, ...]:
+    jenis = tuple(jenis)
+    for j in jenis:
+        if j not in SIAPKAN:
+            raise ValueError(f"Jenis dokumen tidak dikenal: {j}")
+    return jenis
+
+
+def _siapkan_baris(
+    baris: int,
+    row: dict[str, str],
+    dosen_by_id: Mapping[str, Dosen],
+    jenis: tuple[str, ...],
+) -> tuple[HasilBaris, list[Dokumen]]:
+    """
+    Pre-flight satu baris. Error data masuk HasilBaris.pesan (dokumen kosong);
+    TemplateSchemaError diteruskan.
+    """
+    hasil = HasilBaris(
+        baris=baris,
+        nama_mahasiswa=row.get("nama_mahasiswa", ""),
+        npm=row.get("npm", ""),
+        ok=False,
+    )
+    try:
+        hasil.ujian = row_ke_ujian(row, dosen_by_id)
+        dokumen = siapkan_semua(hasil.ujian, jenis)
+    except TemplateSchemaError:
+        raise
+    except Exception as e:
+        hasil.pesan = str(e)
+        dokumen = []
+    return hasil, dokumen
+
+
+def _render_paralel(
+    siap: list[tuple[HasilBaris, list[Dokumen]]],
+    output_root: Path,
+    pool: RenderPool,
+    batal: threading.Event | None,
+    zip_writer: DocxZipWriter | None,
+) -> Iterator[HasilBaris]:
+    jobs: list[RenderJob] = []
+    # per job: (hasil baris, posisi di outputs, path / nama entry, hash manifest)
+    meta: list[tuple[HasilBaris, int, Path, str | None]] = []
+    sisa: dict[int, int] = {}  # id(hasil) -> jumlah job belum selesai
+
+    for hasil, dokumen in siap:
+        if hasil.pesan:
+            yield hasil
+            continue
+        hasil.outputs = [Path()] * len(dokumen)
+        n = 0
+        for k, dok in enumerate(dokumen):
+            if zip_writer is not None:
+                jobs.append(RenderJob(dok.template_path, dok.context))
+                meta.append((hasil, k, dok.relpath, None))
+            else:
+                out = Path(output_root) / dok.relpath
+                digest, sama = cek_manifest(dok.template_path, out, dok.context)
+                if sama:
+                    hasil.outputs[k] = out
+                    continue
+                jobs.append(RenderJob(dok.template_path, dok.context, out))
+                meta.append((hasil, k, out, digest))
+            n += 1
+        if n == 0:
+            hasil.ok = True
+            yield hasil
+        else:
+            sisa[id(hasil)] = n
+
+    def terima(i: int, r: HasilRender) -> HasilBaris | None:
+        hasil, k, out, digest = meta[i]
+        if not r.ok:
+            hasil.pesan = hasil.pesan or r.pesan
+        elif zip_writer is not None:
+            hasil.outputs[k] = Path(zip_writer.add_bytes(out, r.data or b""))
+        else:
+            catat_manifest(out, digest or "", r.size, r.mtime_ns)
+            hasil.outputs[k] = out
+        sisa[id(hasil)] -= 1
+        if sisa[id(hasil)]:
+            return None
+        hasil.ok = not hasil.pesan
+        if not hasil.ok:
+            _hanya_tertulis(hasil)
+        return hasil
+
+    # zip: entry ditulis urut job supaya isi zip tetap deterministik
+    tunda: dict[int, HasilRender] = {}
+    berikut = 0
+    for i, r in pool.jalankan(jobs, batal):
+        if zip_writer is None:
+            selesai = terima(i, r)
+            if selesai is not None:
+                yield selesai
+            continue
+        tunda[i] = r
+        while berikut in tunda:
+            selesai = terima(berikut, tunda.pop(berikut))
+            berikut += 1
+            if selesai is not None:
+                yield selesai
+
+    # dibatalkan: baris yang sebagian dokumennya sudah tertulis tetap dilaporkan
+    terlapor: set[int] = set()
+    for hasil, _, _, _ in meta:
+        if sisa[id(hasil)] and id(hasil) not in terlapor:
+            terlapor.add(id(hasil))
+            _hanya_tertulis(hasil)
+            if hasil.outputs:
+                hasil.pesan = hasil.pesan or "Dibatalkan sebelum semua dokumen dibuat."
+                yield hasil
+
+
+def _hanya_tertulis(hasil: HasilBaris) -> None:
+    # outputs baris gagal = dokumen yang memang sudah tertulis
+    hasil.outputs = [out for out in hasil.outputs if out != Path()]
+
+
+def simpan_paralel(
+    dokumen: list[Dokumen],
+    output_root: Path,
+    pool: RenderPool,
+    batal: threading.Event | None = None,
+) -> list[Path]:
+    """
+    Simpan beberapa dokumen sekaligus di pool (mis. ND + BA satu mahasiswa).
+    Urutan hasil = urutan dokumen; gagal satu -> ValueError.
+    """
+    hasil = HasilBaris(0, "", "", ok=False)
+    for h in _render_paralel([(hasil, dokumen)], output_root, pool, batal, None):
+        if h.ok:
+            return h.outputs
+        if batal is not None and batal.is_set():
+            break
+        raise ValueError(h.pesan)
+    return []  # dibatalkan
+
+
+def jalankan_roster(
+    roster_path: Path,
+    dosen_by_id: Mapping[str, Dosen],
+    output_root: Path,
+    jenis: Iterable[str] = SEMUA_JENIS,
+    progress: Callable[[int, int, HasilBaris], None] | None = None,
+    batal: threading.Event | None = None,
+    zip_path: Path | None = None,
+    sheet: str | None = None,
+    pool: RenderPool | None = None,
+    writer: OutputWriter | None = None,
+    penomoran: PenomoranND | None = None,
+) -> list[HasilBaris]:
+    """
+    Generate semua dokumen dari file roster (.xlsx / .csv, sheet default pertama).
+
+    progress(selesai, total, hasil) dipanggil setelah setiap baris.
+    Kalau zip_path diisi, semua dokumen ditulis ke satu file zip itu.
+
+    Tanpa zip / pool, file ditulis write-behind lewat OutputWriter (render baris
+    berikutnya sambil menulis yang sebelumnya). Berikan writer sendiri untuk
+    membaca statistik throughput-nya; fungsi ini menunggu sampai semua file
+    selesai ditulis sebelum kembali.
+
+    Dengan penomoran, id_nd yang kosong diisi nomor berikutnya (lihat
+    isi_id_nd); nomor baris yang tidak menghasilkan dokumen dikembalikan di
+    akhir (kembalikan_id_nd).
+    """
+    roster = load_roster(roster_path, sheet)
+    total = len(roster)
+    jenis = tuple(jenis)
+    dipesan = _pesan_id_nd(roster, penomoran, jenis)
+    laporan = _laporan_roster(roster, dosen_by_id, jenis)
+
+    hasil_semua: list[HasilBaris] = []
+    zip_writer = DocxZipWriter(zip_path) if zip_path else None
+    writer_sendiri = writer is None and zip_writer is None and pool is None
+    if writer_sendiri:
+        writer = OutputWriter()
+    try:
+        try:
+            for hasil in proses_ujian(
+                roster, dosen_by_id, output_root, jenis, batal, zip_writer, pool, writer
+            ):
+                if not hasil.ok and hasil.baris in laporan:
+                    hasil.pesan = " ".join(laporan[hasil.baris])
+                hasil_semua.append(hasil)
+                if progress:
+                    progress(len(hasil_semua), total, hasil)
+        except BaseException:
+            if zip_writer is not None:
+                zip_writer.abort()
+                hasil_semua.clear()  # tidak ada yang tersimpan
+            raise
+        finally:
+            # file yang sudah di-render tetap ditulis, juga saat batal / error
+            if writer is not None:
+                writer.tunggu()
+                if writer_sendiri:
+                    writer.tutup()
+        if zip_writer is not None:
+            zip_writer.close()
+        if writer is not None:
+            _tandai_gagal_tulis(hasil_semua, writer)
+    finally:
+        if penomoran is not None:
+            kembalikan_id_nd(penomoran, dipesan, hasil_semua)
+    hasil_semua.sort(key=lambda h: h.baris)  # dengan pool: urutan selesai
+    return hasil_semua
+
+
+def isi_id_nd(roster: RosterFile, penomoran: PenomoranND) -> dict[int, Nomor]:
+    """
+    Isi kolom id_nd yang kosong dengan nomor berikutnya per prodi + tahun
+    tanggal_nd (kosong = hari ini), satu transaksi untuk seluruh roster.
+    Baris tanpa prodi / dengan tanggal_nd yang tidak terbaca dilewati (validasi
+    yang melaporkan). Return nomor_baris -> Nomor.
+    """
+    id_nd = roster.kolom("id_nd")
+    prodi = roster.kolom("prodi")
+    tanggal_nd = roster.kolom("tanggal_nd")
+    tahun_ini = date.today().year
+
+    posisi: list[int] = []
+    kunci: list[tuple[str, int]] = []
+    for i in range(len(roster)):
+        if id_nd[i] or not prodi[i]:
+            continue
+        try:
+            tahun = parse_tanggal(tanggal_nd[i]).year if tanggal_nd[i] else tahun_ini
+        except ValueError:
+            continue
+        posisi.append(i)
+        kunci.append((prodi[i], tahun))
+
+    nomor = penomoran.ambil_banyak(kunci)
+    for i, n in zip(posisi, nomor):
+        id_nd[i] = n.teks()
+    return {roster.nomor[i]: n for i, n in zip(posisi, nomor)}
+
+
+def kembalikan_id_nd(
+    penomoran: PenomoranND, dipesan: Mapping[int, Nomor], hasil: list[HasilBaris]
+) -> int:
+    """
+    Kembalikan nomor baris yang tidak menghasilkan dokumen apa pun (gagal
+    validasi / render, atau tidak sempat diproses). Baris gagal yang sebagian
+    dokumennya sudah tertulis tetap memakai nomornya. Gagal mengembalikan hanya
+    membuat urutan bolong, jadi tidak di-raise.
+    """
+    dipakai = {h.baris for h in hasil if h.ok or h.outputs}
+    sisa = [n for baris, n in dipesan.items() if baris not in dipakai]
+    if not sisa:
+        return 0
+    try:
+        return penomoran.kembalikan(sisa)
+    except (sqlite3.Error, OSError):
+        return 0
+
+
+def _pesan_id_nd(
+    roster: RosterFile, penomoran: PenomoranND | None, jenis: tuple[str, ...]
+) -> dict[int, Nomor]:
+    if penomoran is None or JENIS_NOTA_DINAS not in jenis:
+        return {}
+    return isi_id_nd(roster, penomoran)
+
+
+def _laporan_roster(
+    roster: RosterFile, dosen_by_id: Mapping[str, Dosen], jenis: tuple[str, ...]
+) -> dict[int, list[str]]:
+    """
+    Laporan lengkap per baris (bukan hanya error pertama), sekali jalan.
+    """
+    laporan: dict[int, list[str]] = {}
+    for p in validasi_roster(roster, dosen_by_id, JENIS_NOTA_DINAS in jenis):
+        laporan.setdefault(p.baris, []).append(p.pesan)
+    return laporan
+
+
+def jalankan_gabungan(
+    roster_path: Path,
+    dosen_by_id: Mapping[str, Dosen],
+    output_root: Path,
+    jenis: Iterable[str] = SEMUA_JENIS,
+    progress: Callable[[int, int, HasilBaris], None] | None = None,
+    batal: threading.Event | None = None,
+    sheet: str | None = None,
+    penomoran: PenomoranND | None = None,
+) -> list[HasilBaris]:
+    """
+    Mode mail merge: per hari ujian, satu .docx per jenis berisi dokumen semua
+    ujian hari itu (urut jam mulai), satu section per ujian.
+
+    outputs tiap baris = file gabungan hari ujiannya. Gagal render satu hari
+    menandai semua baris hari itu gagal; hari lain tetap dibuat.
+    Kalau event batal di-set, berhenti sebelum hari berikutnya.
+    penomoran: seperti di jalankan_roster.
+    """
+    roster = load_roster(roster_path, sheet)
+    jenis = _cek_jenis(jenis)
+    dipesan = _pesan_id_nd(roster, penomoran, jenis)
+
+    hasil_semua: list[HasilBaris] = []
+    try:
+        _gabung_per_hari(
+            roster, dosen_by_id, output_root, jenis, hasil_semua, progress, batal
+        )
+    finally:
+        if penomoran is not None:
+            kembalikan_id_nd(penomoran, dipesan, hasil_semua)
+    hasil_semua.sort(key=lambda h: h.baris)
+    return hasil_semua
+
+
+def _gabung_per_hari(
+    roster: RosterFile,
+    dosen_by_id: Mapping[str, Dosen],
+    output_root: Path,
+    jenis: tuple[str, ...],
+    hasil_semua: list[HasilBaris],
+    progress: Callable[[int, int, HasilBaris], None] | None,
+    batal: threading.Event | None,
+) -> None:
+    total = len(roster)
+    laporan = _laporan_roster(roster, dosen_by_id, jenis)
+
+    def selesai(hasil: HasilBaris) -> None:
+        if not hasil.ok and hasil.baris in laporan:
+            hasil.pesan = " ".join(laporan[hasil.baris])
+        hasil_semua.append(hasil)
+        if progress:
+            progress(len(hasil_semua), total, hasil)
+
+    per_hari: dict[date, list[tuple[HasilBaris, list[Dokumen]]]] = {}
+    for baris, row in roster:
+        if batal is not None and batal.is_set():
+            return
+        hasil, dokumen = _siapkan_baris(baris, row, dosen_by_id, jenis)
+        if hasil.pesan or hasil.ujian is None:
+            selesai(hasil)
+        else:
+            per_hari.setdefault(hasil.ujian.tanggal, []).append((hasil, dokumen))
+
+    for tanggal in sorted(per_hari):
+        if batal is not None and batal.is_set():
+            break
+        grup = sorted(
+            per_hari[tanggal], key=lambda x: (x[0].ujian.jam_mulai, x[0].baris)
+        )
+        outputs: list[Path] = []
+        pesan = ""
+        try:
+            # siapkan_semua: dokumen[k] berjenis jenis[k]
+            for k, j in enumerate(jenis):
+                data = render_gabungan(
+                    [(dok[k].template_path, dok[k].context) for _, dok in grup]
+                )
+                out = Path(output_root) / f"{nama_file_gabungan(j, tanggal)}.docx"
+                with span("write"):
+                    tulis_atomik(out, data)
+                outputs.append(out)
+        except TemplateSchemaError:
+            raise
+        except Exception as e:
+            pesan = f"Gagal menggabung dokumen {format_tanggal_iso(tanggal)}: {e}"
+        for hasil, _ in grup:
+            hasil.ok = not pesan
+            hasil.pesan = pesan
+            hasil.outputs = list(outputs)  # gagal: yang sempat tertulis saja
+            selesai(hasil)
+
+
+def _tandai_gagal_tulis(hasil: list[HasilBaris], writer: OutputWriter) -> None:
+    if not writer.gagal:
+        return
+    gagal = {path: e for path, e in writer.gagal}
+    for h in hasil:
+        for out in h.outputs:
+            e = gagal.get(Path(out))
+            if e is not None:
+                h.ok = False
+                h.pesan = f"Gagal menulis {Path(out).name}: {e}"
+                break
+        if not h.ok:
+            h.outputs = [out for out in h.outputs if Path(out) not in gagal]
+
+
+def konflik_batch(hasil: list[HasilBaris]) -> list[Konflik]:
+    """
+    Dosen / ruang yang bentrok antar baris yang berhasil dibuat.
+    """
+    jadwal = [
+        jadwal_dari_ujian(h.ujian) for h in hasil if h.ok and h.ujian is not None
+    ]
+    return cari_konflik(j for j in jadwal if j is not None)
+
+
+def ringkasan(hasil: list[HasilBaris], maks_error: int = 20) -> str:
+    ok = sum(1 for h in hasil if h.ok)
+    gagal = [h for h in hasil if not h.ok]
+    lines = [f"{ok} baris sukses, {len(gagal)} baris gagal."]
+    for h in gagal[:maks_error]:
+        lines.append(f"- Baris {h.baris} ({h.nama_mahasiswa} {h.npm}): {h.pesan}")
+    if len(gagal) > maks_error:
+        lines.append(f"… dan {len(gagal) - maks_error} baris gagal lainnya.")
+
+    konflik = konflik_batch(hasil)
+    if konflik:
+        lines.append("")
+        lines.append(f"⚠ {len(konflik)} jadwal bentrok:")
+        lines.extend(f"- {k.pesan()}" for k in konflik[:maks_error])
+        if len(konflik) > maks_error:
+            lines.append(f"… dan {len(konflik) - maks_error} bentrok lainnya.")
+    return "\n".join(lines)
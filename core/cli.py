@@ -0,0 +1,601 @@
+# core/cli.py
+"""
+CLI tanpa Qt untuk render Berita Acara / Nota Dinas.
+
+Contoh:
+  python -m core ba --nama "Andi" --npm 2112 --judul "..." --tanggal 2025-12-23 \\
+      --mulai 09:00 --selesai 11:00 --pb1 123 --pj1 456 --pj2 789
+  python -m core semua --json ujian.json
+  python -m core roster roster.xlsx [--zip hasil.zip | --gabung]
+  python -m core --proses 0 roster roster.xlsx      # render di semua core
+  python -m core cek roster.xlsx
+  python -m core jadwal mahasiswa.xlsx --tanggal 2025-12-22 2025-12-23 \\
+      --ruang "Ruang Sidang 1" "Ruang Sidang 2" [--generate]
+  python -m core riwayat --npm 2112 [--ulang 41]     # arsip ujian yang sudah dibuat
+  python -m core --nomor-nd roster roster.xlsx       # id_nd kosong diberi nomor
+  python -m core nomor-nd --prodi Matematika --mulai 120
+  python -m core serve --port 8765 --workers 4
+
+Import openpyxl / docxtpl baru terjadi saat dibutuhkan, jadi `--help` tetap cepat.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from core.paths import app_root, resource_path
+
+_T0 = time.perf_counter()
+
+# opsi CLI -> nama kolom roster
+_OPSI_KE_KOLOM = {
+    "nama": "nama_mahasiswa",
+    "npm": "npm",
+    "judul": "judul_skripsi",
+    "urutan": "urutan",
+    "tanggal": "tanggal",
+    "mulai": "jam_mulai",
+    "selesai": "jam_selesai",
+    "pb1": "pembimbing_1",
+    "pb2": "pembimbing_2",
+    "pj1": "penguji_1",
+    "pj2": "penguji_2",
+    "id_nd": "id_nd",
+    "tanggal_nd": "tanggal_nd",
+    "lokasi": "lokasi_ujian",
+    "prodi": "prodi",
+}
+
+_JENIS_PERINTAH = {
+    "ba": ("berita_acara",),
+    "nd": ("nota_dinas",),
+    "semua": ("nota_dinas", "berita_acara"),
+}
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m core",
+        description="Generate Berita Acara & Nota Dinas Ujian Skripsi tanpa GUI.",
+    )
+    parser.add_argument(
+        "--dosen",
+        type=Path,
+        default=None,
+        help="Excel / CSV dosen (default: resources/dosen.xlsx)",
+    )
+    parser.add_argument(
+        "--dosen-sheet", default=None, help="Sheet Excel dosen (default: pertama)"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Folder output (default: output/)",
+    )
+    parser.add_argument(
+        "--timing", action="store_true", help="Tampilkan waktu tiap tahap (stderr)"
+    )
+    parser.add_argument(
+        "--profil",
+        type=Path,
+        default=None,
+        help="Dump cProfile (.prof) ke folder ini",
+    )
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="Dump alokasi memori teratas (butuh --profil atau ditulis ke cwd)",
+    )
+    parser.add_argument(
+        "--proses",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Render paralel di N proses (0 = jumlah core); default satu per satu",
+    )
+    parser.add_argument(
+        "--chunk", type=int, default=4, help="Dokumen per kiriman ke proses render"
+    )
+    parser.add_argument(
+        "--arsip",
+        type=Path,
+        default=None,
+        help="File arsip ujian (SQLite, default di folder data user)",
+    )
+    parser.add_argument(
+        "--tanpa-arsip",
+        action="store_true",
+        help="Jangan catat dokumen yang dibuat ke arsip",
+    )
+    parser.add_argument(
+        "--nomor-nd",
+        action="store_true",
+        help="Isi id_nd yang kosong dengan nomor berikutnya (per prodi + tahun, "
+        "counter di folder output)",
+    )
+    sub = parser.add_subparsers(dest="perintah", required=True)
+
+    for nama, bantuan in (
+        ("ba", "Berita Acara"),
+        ("nd", "Undangan Nota Dinas"),
+        ("semua", "Nota Dinas + Berita Acara"),
+    ):
+        p = sub.add_parser(nama, help=f"Generate {bantuan}")
+        p.add_argument(
+            "--json",
+            type=Path,
+            help="File JSON: satu objek atau list objek (kunci = kolom roster)",
+        )
+        for opsi, kolom in _OPSI_KE_KOLOM.items():
+            p.add_argument(f"--{opsi.replace('_', '-')}", dest=opsi, help=kolom)
+
+    p = sub.add_parser("roster", help="Generate semua dokumen dari roster")
+    p.add_argument("roster", type=Path, help="File roster .xlsx / .csv")
+    p.add_argument("--sheet", default=None, help="Sheet roster (default: pertama)")
+    simpan = p.add_mutually_exclusive_group()
+    simpan.add_argument(
+        "--zip",
+        type=Path,
+        default=None,
+        help="Tulis semua dokumen ke satu file .zip (bukan folder per mahasiswa)",
+    )
+    simpan.add_argument(
+        "--gabung",
+        action="store_true",
+        help="Satu .docx per hari ujian per jenis (semua ujian hari itu digabung)",
+    )
+
+    p = sub.add_parser("cek", help="Validasi seluruh roster tanpa generate")
+    p.add_argument("roster", type=Path, help="File roster .xlsx / .csv")
+    p.add_argument("--sheet", default=None, help="Sheet roster (default: pertama)")
+    p.add_argument(
+        "--tanpa-nd",
+        action="store_true",
+        help="Jangan cek kolom khusus Nota Dinas (id_nd, lokasi_ujian, prodi)",
+    )
+
+    p = sub.add_parser("jadwal", help="Susun jadwal ujian otomatis -> roster")
+    p.add_argument(
+        "mahasiswa",
+        type=Path,
+        help="File .xlsx / .csv: nama_mahasiswa, npm, judul_skripsi, pembimbing_1, …",
+    )
+    p.add_argument("--tanggal", nargs="+", required=True, help="YYYY-MM-DD …")
+    p.add_argument("--ruang", nargs="+", required=True)
+    p.add_argument("--durasi", type=int, default=120, help="Menit per ujian")
+    p.add_argument("--jam", default="08:00-16:00", help="Jam ujian per hari")
+    p.add_argument("--jeda", type=int, default=0, help="Menit antar sesi")
+    p.add_argument("--maks-per-hari", type=int, default=None)
+    p.add_argument(
+        "--ketersediaan",
+        type=Path,
+        help="File: id, tanggal, mulai, selesai (dosen yang tidak ada = selalu bisa)",
+    )
+    p.add_argument(
+        "--penguji",
+        type=Path,
+        help="File dengan kolom id: hanya dosen ini yang boleh jadi penguji",
+    )
+    p.add_argument("--hasil", type=Path, default=Path("roster_jadwal.csv"))
+    p.add_argument(
+        "--generate",
+        action="store_true",
+        help="Langsung generate Nota Dinas + Berita Acara dari jadwal",
+    )
+
+    p = sub.add_parser("riwayat", help="Cari / generate ulang ujian dari arsip")
+    p.add_argument("--npm", default=None)
+    p.add_argument("--dosen", dest="dosen_id", default=None, help="id dosen")
+    p.add_argument("--id-nd", dest="id_nd", default=None)
+    p.add_argument("--dari", default=None, help="Tanggal ujian >= YYYY-MM-DD")
+    p.add_argument("--sampai", default=None, help="Tanggal ujian <= YYYY-MM-DD")
+    p.add_argument("--limit", type=int, default=200)
+    p.add_argument(
+        "--ulang",
+        type=int,
+        nargs="+",
+        metavar="ID",
+        help="Generate ulang rekaman ini (id dari daftar) ke --output",
+    )
+
+    p = sub.add_parser("nomor-nd", help="Lihat / atur penomoran ID ND")
+    p.add_argument("--prodi", default=None)
+    p.add_argument(
+        "--tahun", type=int, default=None, help="Default: tahun ini (dengan --prodi)"
+    )
+    aksi = p.add_mutually_exclusive_group()
+    aksi.add_argument("--mulai", type=int, default=None, help="Nomor berikutnya")
+    aksi.add_argument("--ambil", type=int, default=None, metavar="N")
+    aksi.add_argument("--kembalikan", type=int, nargs="+", metavar="NOMOR")
+
+    p = sub.add_parser("serve", help="Jalankan service HTTP lokal")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--workers", type=int, default=None, help="Jumlah proses render")
+    p.add_argument(
+        "--antrian",
+        type=int,
+        default=None,
+        help="Maks. request menunggu sebelum dijawab 503 (default: 16 x workers)",
+    )
+    return parser
+
+
+def _rows_dari_args(args: argparse.Namespace) -> list[tuple[int, dict[str, str]]]:
+    if args.json:
+        data = json.loads(args.json.read_text(encoding="utf-8"))
+        if isinstance(data, dict):
+            data = [data]
+        if not isinstance(data, list):
+            raise ValueError("Isi JSON harus objek atau list objek.")
+        return [
+            (i + 1, {str(k): "" if v is None else str(v) for k, v in obj.items()})
+            for i, obj in enumerate(data)
+        ]
+
+    row = {
+        kolom: getattr(args, opsi) or "" for opsi, kolom in _OPSI_KE_KOLOM.items()
+    }
+    return [(1, row)]
+
+
+def _log_timing(args: argparse.Namespace, tahap: str) -> None:
+    if args.timing:
+        ms = (time.perf_counter() - _T0) * 1000
+        print(f"[timing] {tahap}: {ms:.1f} ms", file=sys.stderr)
+
+
+def _susun_jadwal(args: argparse.Namespace, dosen_by_id: dict):
+    from core.penjadwal import (
+        AturanJadwal,
+        ketersediaan_dari_rows,
+        mahasiswa_dari_rows,
+        susun_jadwal,
+    )
+    from core.roster import baca_tabel, parse_tanggal, tulis_roster_csv
+    from core.tabel import baca_baris
+    from core.validator import jam_ke_menit
+
+    mulai, _, selesai = args.jam.partition("-")
+    jam_mulai, jam_selesai = jam_ke_menit(mulai), jam_ke_menit(selesai)
+    if jam_mulai is None or jam_selesai is None:
+        raise ValueError("--jam harus HH:mm-HH:mm, contoh 08:00-16:00")
+
+    mahasiswa = mahasiswa_dari_rows(
+        baca_baris(
+            args.mahasiswa, wajib=("nama_mahasiswa", "npm", "pembimbing_1")
+        ),
+        dosen_by_id,
+    )
+    penguji = list(dosen_by_id.values())
+    if args.penguji:
+        ids = {r["id"] for r in baca_tabel(args.penguji, ("id",))}
+        penguji = [d for d in penguji if d.id in ids]
+    ketersediaan = None
+    if args.ketersediaan:
+        ketersediaan = ketersediaan_dari_rows(
+            baca_baris(args.ketersediaan, wajib=("id", "tanggal", "mulai", "selesai"))
+        )
+
+    aturan = AturanJadwal(
+        tanggal=[parse_tanggal(t) for t in args.tanggal],
+        ruang=args.ruang,
+        durasi=args.durasi,
+        jam_mulai=jam_mulai,
+        jam_selesai=jam_selesai,
+        jeda=args.jeda,
+        maks_per_hari=args.maks_per_hari,
+    )
+    hasil = susun_jadwal(mahasiswa, penguji, aturan, ketersediaan)
+    tulis_roster_csv(args.hasil, hasil.ujian)
+
+    for m, alasan in hasil.gagal:
+        print(f"Tidak terjadwal: {m.nama_mahasiswa} {m.npm}: {alasan}", file=sys.stderr)
+    print(
+        f"{len(hasil.ujian)}/{len(mahasiswa)} ujian terjadwal -> {args.hasil}",
+        file=sys.stderr,
+    )
+    return hasil
+
+
+def _riwayat(args: argparse.Namespace, output_root: Path) -> int:
+    from core.arsip import Arsip
+    from core.roster import parse_tanggal
+
+    with Arsip(args.arsip) as arsip:
+        if args.ulang:
+            gagal = 0
+            for rekaman_id in args.ulang:
+                rek = arsip.ambil(rekaman_id)
+                if rek is None:
+                    print(f"Rekaman {rekaman_id} tidak ada di arsip.", file=sys.stderr)
+                    gagal += 1
+                    continue
+                try:
+                    print(rek.dokumen().simpan(output_root, force=True))
+                except Exception as e:
+                    print(f"Rekaman {rekaman_id}: {e}", file=sys.stderr)
+                    gagal += 1
+            return 1 if gagal else 0
+
+        hasil = arsip.cari(
+            npm=args.npm,
+            dosen_id=args.dosen_id,
+            id_nd=args.id_nd,
+            dari=parse_tanggal(args.dari) if args.dari else None,
+            sampai=parse_tanggal(args.sampai) if args.sampai else None,
+            limit=args.limit,
+        )
+    for r in hasil:
+        nd = f" ND {r.id_nd}" if r.id_nd else ""
+        print(
+            f"{r.id}\t{r.tanggal.isoformat()}\t{r.jenis}\t{r.npm}\t"
+            f"{r.nama_mahasiswa} (ujian ke-{r.urutan}){nd}\t{r.output}"
+        )
+    print(f"{len(hasil)} dokumen.", file=sys.stderr)
+    return 0
+
+
+def _nomor_nd(args: argparse.Namespace, output_root: Path) -> int:
+    from datetime import date
+
+    from core.nomor_nd import Nomor, PenomoranND
+
+    penomoran = PenomoranND(output_root)
+    if args.mulai is None and args.ambil is None and not args.kembalikan:
+        for s in penomoran.status():
+            if args.prodi and s.prodi != args.prodi:
+                continue
+            kembali = f"\tdikembalikan: {', '.join(map(str, s.kembali))}"
+            print(
+                f"{s.tahun}\t{s.prodi}\tberikut {s.berikut}"
+                f"{kembali if s.kembali else ''}"
+            )
+        return 0
+
+    if not args.prodi:
+        print("--prodi wajib diisi.", file=sys.stderr)
+        return 2
+    tahun = args.tahun or date.today().year
+    if args.mulai is not None:
+        penomoran.atur_berikut(args.prodi, tahun, args.mulai)
+    elif args.ambil is not None:
+        for n in penomoran.ambil(args.prodi, tahun, args.ambil):
+            print(n.teks())
+    else:
+        n = penomoran.kembalikan(Nomor(args.prodi, tahun, k) for k in args.kembalikan)
+        print(f"{n} nomor dikembalikan.", file=sys.stderr)
+    return 0
+
+
+def _catat_arsip(args: argparse.Namespace, hasil: list, jenis: tuple) -> None:
+    if args.tanpa_arsip:
+        return
+    from core.arsip import Arsip
+
+    try:
+        with Arsip(args.arsip) as arsip:
+            n = arsip.catat_hasil(hasil, jenis)
+    except Exception as e:
+        # dokumen sudah jadi: gagal catat hanya peringatan
+        print(f"Peringatan: gagal mencatat ke arsip: {e}", file=sys.stderr)
+        return
+    if args.timing:
+        print(f"[timing]   arsip: {n} dokumen dicatat", file=sys.stderr)
+
+
+def _proses_rows(rows, dosen_by_id, output_root, jenis, pool, penomoran) -> list:
+    from core.batch import isi_id_nd, kembalikan_id_nd, proses_ujian
+    from core.roster import RosterFile
+
+    dipesan = {}
+    if penomoran is not None and "nota_dinas" in jenis:
+        roster = RosterFile.dari_rows(rows)
+        dipesan = isi_id_nd(roster, penomoran)
+        rows = roster
+    hasil: list = []
+    try:
+        hasil = list(proses_ujian(rows, dosen_by_id, output_root, jenis, pool=pool))
+    finally:
+        if dipesan:
+            kembalikan_id_nd(penomoran, dipesan, hasil)
+    hasil.sort(key=lambda h: h.baris)
+    return hasil
+
+
+def _log_rekaman(rek) -> None:
+    if rek:
+        print(f"[timing]   {rek.ringkas(maks=10)}", file=sys.stderr)
+    for f in rek.files:
+        print(f"[profil] {f}", file=sys.stderr)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+
+    # import di sini, bukan di atas: --help tidak perlu memuat modul lain
+    from core import profiling
+    from core.batch import (
+        SEMUA_JENIS,
+        jalankan_gabungan,
+        jalankan_roster,
+        konflik_batch,
+    )
+    from core.excel_loader import load_dosen_excel
+
+    profiling.konfigurasi(
+        aktif=args.timing or None,
+        profil_dir=args.profil,
+        tracemalloc=args.tracemalloc or None,
+    )
+
+    dosen_path = args.dosen or resource_path("resources/dosen.xlsx")
+    output_root = args.output or (app_root() / "output")
+    _log_timing(args, "start")
+
+    if args.perintah == "riwayat":
+        # context tersimpan sudah lengkap: Excel dosen tidak perlu diload
+        try:
+            return _riwayat(args, output_root)
+        except Exception as e:
+            print(f"Gagal: {e}", file=sys.stderr)
+            return 2
+    if args.perintah == "nomor-nd":
+        try:
+            return _nomor_nd(args, output_root)
+        except Exception as e:
+            print(f"Gagal: {e}", file=sys.stderr)
+            return 2
+
+    with profiling.rekam("load") as rek:
+        try:
+            dosen_by_id = load_dosen_excel(dosen_path, sheet=args.dosen_sheet)
+        except Exception as e:
+            print(f"Gagal load Excel dosen: {e}", file=sys.stderr)
+            return 2
+    _log_timing(args, "load dosen")
+    _log_rekaman(rek)
+    if dosen_by_id.duplikat:
+        print(f"Peringatan: {dosen_by_id.pesan_duplikat()}", file=sys.stderr)
+    rows_jadwal: list[tuple[int, dict[str, str]]] = []
+    gagal = 0
+
+    if args.perintah == "cek":
+        from core.konflik import cari_konflik, jadwal_dari_ujian
+        from core.roster import load_roster, row_ke_ujian, validasi_roster
+
+        try:
+            roster = load_roster(args.roster, args.sheet)
+        except Exception as e:
+            print(f"Gagal: {e}", file=sys.stderr)
+            return 2
+        temuan = validasi_roster(roster, dosen_by_id, nota_dinas=not args.tanpa_nd)
+        for p in temuan:
+            print(f"Baris {p.baris} [{p.kolom}]: {p.pesan}")
+        jadwal = []
+        for _, row in roster:
+            try:
+                j = jadwal_dari_ujian(row_ke_ujian(row, dosen_by_id))
+            except ValueError:
+                continue  # sudah masuk daftar pelanggaran
+            if j is not None:
+                jadwal.append(j)
+        konflik = cari_konflik(jadwal)
+        for k in konflik:
+            print(f"Bentrok: {k.pesan()}")
+
+        baris_gagal = len({p.baris for p in temuan})
+        print(
+            f"{len(roster) - baris_gagal}/{len(roster)} baris valid, "
+            f"{len(temuan)} pelanggaran, {len(konflik)} jadwal bentrok.",
+            file=sys.stderr,
+        )
+        return 1 if temuan or konflik else 0
+
+    if args.perintah == "jadwal":
+        from core.roster import ujian_ke_row
+
+        try:
+            jadwal = _susun_jadwal(args, dosen_by_id)
+        except Exception as e:
+            print(f"Gagal: {e}", file=sys.stderr)
+            return 2
+        if not args.generate or not jadwal.ujian:
+            return 1 if jadwal.gagal else 0
+        # jadwal langsung diteruskan ke pipeline roster yang sama
+        args.perintah = "semua"
+        rows_jadwal = [(i + 2, ujian_ke_row(u)) for i, u in enumerate(jadwal.ujian)]
+        gagal = len(jadwal.gagal)
+
+    if args.perintah == "serve":
+        from core.server import jalankan_server
+
+        print(f"Melayani di http://{args.host}:{args.port}", file=sys.stderr)
+        jalankan_server(
+            dosen_by_id,
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            max_antrian=args.antrian,
+        )
+        return 0
+
+    gabung = args.perintah == "roster" and args.gabung
+    pool = None
+    if args.proses is not None and not gabung:
+        from core.paths import semua_template
+        from core.render_pool import RenderPool
+
+        pool = RenderPool(args.proses or None, args.chunk, semua_template())
+    writer = None
+    if args.perintah == "roster" and pool is None and args.zip is None and not gabung:
+        from core.output_writer import OutputWriter
+
+        writer = OutputWriter()  # write-behind; dibuat di sini untuk statistik
+    penomoran = None
+    if args.nomor_nd:
+        from core.nomor_nd import PenomoranND
+
+        penomoran = PenomoranND(output_root)
+
+    with profiling.rekam(args.perintah) as rek:
+        try:
+            if gabung:
+                hasil = jalankan_gabungan(
+                    args.roster,
+                    dosen_by_id,
+                    output_root,
+                    sheet=args.sheet,
+                    penomoran=penomoran,
+                )
+            elif args.perintah == "roster":
+                hasil = jalankan_roster(
+                    args.roster,
+                    dosen_by_id,
+                    output_root,
+                    zip_path=args.zip,
+                    sheet=args.sheet,
+                    pool=pool,
+                    writer=writer,
+                    penomoran=penomoran,
+                )
+            else:
+                rows = rows_jadwal if rows_jadwal else _rows_dari_args(args)
+                jenis = _JENIS_PERINTAH[args.perintah]
+                hasil = _proses_rows(
+                    rows, dosen_by_id, output_root, jenis, pool, penomoran
+                )
+        except Exception as e:
+            print(f"Gagal: {e}", file=sys.stderr)
+            return 2
+        finally:
+            if pool is not None:
+                pool.shutdown()
+            if writer is not None:
+                writer.tutup()
+    _log_timing(args, "render")
+    _log_rekaman(rek)
+    if args.timing and writer is not None and writer.files:
+        print(f"[timing]   tulis output: {writer.ringkas()}", file=sys.stderr)
+    _catat_arsip(args, hasil, _JENIS_PERINTAH.get(args.perintah, SEMUA_JENIS))
+
+    dicetak: set[Path] = set()  # --gabung: satu file untuk banyak baris
+    for h in hasil:
+        if h.ok:
+            for out in h.outputs:
+                if out not in dicetak:
+                    dicetak.add(out)
+                    print(out)
+        else:
+            gagal += 1
+            print(
+                f"Baris {h.baris} ({h.nama_mahasiswa} {h.npm}): {h.pesan}",
+                file=sys.stderr,
+            )
+    for k in konflik_batch(hasil):
+        print(f"Peringatan, jadwal bentrok: {k.pesan()}", file=sys.stderr)
+    return 1 if gagal else 0
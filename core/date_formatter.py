@@ -1,4 +1,3 @@
-from PySide6.QtCore import QDate
 from datetime import date
 
 _BULAN_ID = {
@@ -17,16 +16,16 @@ _BULAN_ID = {
 }
 
 
-def format_tanggal_indonesia(qdate: QDate) -> str:
-    return f"{qdate.day()} {_BULAN_ID[qdate.month()]} {qdate.year()}"
+def format_tanggal_indonesia(d: date) -> str:
+    return f"{d.day} {_BULAN_ID[d.month]} {d.year}"
 
 
-def format_tanggal_iso(qdate: QDate) -> str:
+def format_tanggal_iso(d: date) -> str:
     # contoh: 2025-12-23
-    return qdate.toString("yyyy-MM-dd")
+    return d.isoformat()
 
 
-def nama_hari_indonesia(qdate: QDate) -> str:
+def nama_hari_indonesia(d: date) -> str:
     hari = {
         1: "Senin",
         2: "Selasa",
@@ -36,7 +35,7 @@ def nama_hari_indonesia(qdate: QDate) -> str:
         6: "Sabtu",
         7: "Minggu",
     }
-    return hari.get(qdate.dayOfWeek(), "")
+    return hari.get(d.isoweekday(), "")
 
 
 def urutan_ke_kata(n: int) -> str:
@@ -58,5 +57,4 @@ def urutan_ke_kata(n: int) -> str:
 
 
 def format_tanggal_hari_ini_indonesia() -> str:
-    d = date.today()
-    return f"{d.day} {_BULAN_ID[d.month]} {d.year}"
+    return format_tanggal_indonesia(date.today())
@@ -0,0 +1,309 @@
+# core/dokumen.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+from core.date_formatter import (
+    format_tanggal_indonesia,
+    format_tanggal_iso,
+    nama_hari_indonesia,
+    urutan_ke_kata,
+)
+from core.excel_loader import Dosen
+from core.output_writer import OutputWriter
+from core.paths import (
+    pilih_template_berdasarkan_pembimbing,
+    pilih_template_nota_dinas_berdasarkan_pembimbing,
+)
+from core.template_cache import template_cache
+from core.validator import FormData, validate_form, validate_nota_dinas_inputs
+from core.word_generator import generate_docx, output_relpath, render_docx
+
+JENIS_NOTA_DINAS = "nota_dinas"
+JENIS_BERITA_ACARA = "berita_acara"
+
+
+@dataclass
+class UjianData:
+    """
+    Semua data satu ujian, sumbernya bisa form GUI atau satu baris roster.
+    """
+
+    nama_mahasiswa: str
+    npm: str
+    judul_skripsi: str
+    urutan: int
+    tanggal: date
+    jam_mulai: str  # "HH:mm"
+    jam_selesai: str  # "HH:mm"
+    pembimbing_1: Dosen | None
+    pembimbing_2: Dosen | None = None
+    penguji_1: Dosen | None = None
+    penguji_2: Dosen | None = None
+
+    # khusus Nota Dinas
+    id_nd: str = ""
+    tanggal_nd: date | None = None
+    lokasi_ujian: str = ""
+    prodi: str = ""
+
+    @property
+    def jumlah_pembimbing(self) -> int:
+        return 2 if self.pembimbing_2 else 1
+
+    @property
+    def hari(self) -> str:
+        return nama_hari_indonesia(self.tanggal)
+
+    def to_form_data(self) -> FormData:
+        return FormData(
+            nama_mahasiswa=self.nama_mahasiswa,
+            npm=self.npm,
+            judul_skripsi=self.judul_skripsi,
+            urutan=self.urutan,
+            hari=self.hari,
+            jam_mulai=self.jam_mulai,
+            jam_selesai=self.jam_selesai,
+            # id, sama dengan validasi_roster: engine validasi yang sama harus
+            # memberi jawaban yang sama untuk ujian yang sama
+            pembimbing_1=_id(self.pembimbing_1),
+            pembimbing_2=_id(self.pembimbing_2),
+            penguji_1=_id(self.penguji_1),
+            penguji_2=_id(self.penguji_2),
+        )
+
+
+def _nama(d: Dosen | None) -> str:
+    return d.nama if d else ""
+
+
+def _id(d: Dosen | None) -> str:
+    return d.id if d else ""
+
+
+# ---------- Context ----------
+def context_berita_acara(u: UjianData) -> dict:
+    pj1, pj2 = u.penguji_1, u.penguji_2
+    return {
+        "hari": u.hari,
+        "tanggal_bulan_tahun": format_tanggal_indonesia(u.tanggal),
+        "jam_mulai": u.jam_mulai,
+        "jam_selesai": u.jam_selesai,
+        "urutan": urutan_ke_kata(u.urutan),
+        "nama_mahasiswa": u.nama_mahasiswa,
+        "npm": u.npm,
+        "judul_skripsi": u.judul_skripsi,
+        "pembimbing_1": _nama(u.pembimbing_1),
+        "pembimbing_2": _nama(u.pembimbing_2),
+        "penguji_1": _nama(pj1),
+        "penguji_2": _nama(pj2),
+        "nipnup_penguji1": pj1.jenis_id if pj1 else "",
+        "nomor_nipnup_penguji1": pj1.id if pj1 else "",
+        "nipnup_penguji2": pj2.jenis_id if pj2 else "",
+        "nomor_nipnup_penguji2": pj2.id if pj2 else "",
+    }
+
+
+def context_nota_dinas(u: UjianData) -> dict:
+    tanggal_nd = u.tanggal_nd or date.today()
+    return {
+        "id_nd": u.id_nd,
+        "prodi": u.prodi,
+        "lokasi_ujian": u.lokasi_ujian,
+        "tanggal_hari_ini": format_tanggal_indonesia(tanggal_nd),
+        "nama_mahasiswa": u.nama_mahasiswa,
+        "npm": u.npm,
+        "judul_skripsi": u.judul_skripsi,
+        "hari": u.hari,
+        "tanggal_bulan_tahun": format_tanggal_indonesia(u.tanggal),
+        "jam_mulai": u.jam_mulai,
+        "jam_selesai": u.jam_selesai,
+        "penguji_1": _nama(u.penguji_1),
+        "penguji_2": _nama(u.penguji_2),
+        "pembimbing_1": _nama(u.pembimbing_1),
+        "pembimbing_2": _nama(u.pembimbing_2),
+    }
+
+
+# ---------- Nama file ----------
+def nama_file_berita_acara(u: UjianData) -> str:
+    return f"Berita Acara dan Nilai Ujian Skripsi_{u.nama_mahasiswa}_{u.npm}"
+
+
+def nama_file_nota_dinas(u: UjianData) -> str:
+    # contoh: 2025-12-23_123ND_Undangan_Ujian_Skripsi_S1_Matematika_Andi_21120123
+    tanggal_nd = u.tanggal_nd or date.today()
+    return (
+        f"{format_tanggal_iso(tanggal_nd)}_{u.id_nd}_Undangan_Ujian_Skripsi_S1_"
+        f"{u.prodi}_{u.nama_mahasiswa}_{u.npm}"
+    )
+
+
+# mode gabung: satu file per jenis per hari ujian
+JUDUL_GABUNGAN = {
+    JENIS_BERITA_ACARA: "Berita Acara dan Nilai Ujian Skripsi",
+    JENIS_NOTA_DINAS: "Undangan Ujian Skripsi",
+}
+
+
+def nama_file_gabungan(jenis: str, tanggal: date) -> str:
+    # contoh: 2025-12-23_Berita Acara dan Nilai Ujian Skripsi
+    return f"{format_tanggal_iso(tanggal)}_{JUDUL_GABUNGAN[jenis]}"
+
+
+# ---------- Template ----------
+def template_berita_acara(u: UjianData) -> Path:
+    template_path = pilih_template_berdasarkan_pembimbing(u.jumlah_pembimbing)
+    if not template_path.exists():
+        raise FileNotFoundError(
+            f"Template berita acara tidak ditemukan: {template_path}"
+        )
+    return template_path
+
+
+def template_nota_dinas(u: UjianData) -> Path:
+    template_path = pilih_template_nota_dinas_berdasarkan_pembimbing(
+        u.jumlah_pembimbing
+    )
+    if not template_path.exists():
+        raise FileNotFoundError(
+            f"Template nota dinas tidak ditemukan: {template_path}"
+        )
+    return template_path
+
+
+# ---------- Validasi + render ----------
+class TemplateSchemaError(ValueError):
+    """
+    Template memakai variabel yang tidak ada di context. Masalahnya di
+    template / kode, bukan di data satu ujian, jadi batch langsung dihentikan.
+    """
+
+
+@dataclass
+class Dokumen:
+    """
+    Satu dokumen siap render: sudah divalidasi, template & context sudah ada.
+    """
+
+    jenis: str  # JENIS_BERITA_ACARA / JENIS_NOTA_DINAS
+    template_path: Path
+    nama_mahasiswa: str
+    npm: str
+    context: dict
+    output_filename: str
+
+    @property
+    def relpath(self) -> Path:
+        return output_relpath(self.nama_mahasiswa, self.npm, self.output_filename)
+
+    def render(self) -> bytes:
+        return render_docx(self.template_path, self.context)
+
+    def simpan(
+        self,
+        output_root: Path,
+        force: bool = False,
+        writer: OutputWriter | None = None,
+    ) -> Path:
+        return generate_docx(
+            template_path=self.template_path,
+            output_root=output_root,
+            nama_mahasiswa=self.nama_mahasiswa,
+            npm=self.npm,
+            context=self.context,
+            output_filename=self.output_filename,
+            force=force,
+            writer=writer,
+        )
+
+
+def cek_schema(dok: Dokumen) -> None:
+    """
+    Pastikan semua variabel template ada di context, sebelum render.
+    Tanpa ini, placeholder yang salah ketik hanya jadi kolom kosong di dokumen.
+    """
+    kurang = template_cache.get_variabel(dok.template_path) - dok.context.keys()
+    if kurang:
+        raise TemplateSchemaError(
+            f"Template {dok.template_path.name} memakai variabel yang tidak "
+            f"diisi: {', '.join(sorted(kurang))}"
+        )
+
+
+def validasi_berita_acara(u: UjianData) -> tuple[bool, str]:
+    if not u.pembimbing_1:
+        return False, "Pembimbing 1 wajib dipilih."
+    return validate_form(u.to_form_data())
+
+
+def validasi_nota_dinas(u: UjianData) -> tuple[bool, str]:
+    if not u.pembimbing_1:
+        return False, "Pembimbing 1 wajib dipilih."
+    return validate_nota_dinas_inputs(u.id_nd, u.lokasi_ujian, u.prodi)
+
+
+def siapkan_berita_acara(u: UjianData) -> Dokumen:
+    """
+    Validasi + context Berita Acara. Raise ValueError kalau tidak valid.
+    """
+    template_path = template_berita_acara(u)
+    ok, msg = validasi_berita_acara(u)
+    if not ok:
+        raise ValueError(msg)
+
+    dok = Dokumen(
+        jenis=JENIS_BERITA_ACARA,
+        template_path=template_path,
+        nama_mahasiswa=u.nama_mahasiswa,
+        npm=u.npm,
+        context=context_berita_acara(u),
+        output_filename=nama_file_berita_acara(u),
+    )
+    cek_schema(dok)
+    return dok
+
+
+def siapkan_nota_dinas(u: UjianData) -> Dokumen:
+    """
+    Validasi + context Undangan Nota Dinas.
+    """
+    ok, msg = validasi_nota_dinas(u)
+    if not ok:
+        raise ValueError(msg)
+    template_path = template_nota_dinas(u)
+
+    dok = Dokumen(
+        jenis=JENIS_NOTA_DINAS,
+        template_path=template_path,
+        nama_mahasiswa=u.nama_mahasiswa,
+        npm=u.npm,
+        context=context_nota_dinas(u),
+        output_filename=nama_file_nota_dinas(u),
+    )
+    cek_schema(dok)
+    return dok
+
+
+SIAPKAN = {
+    JENIS_NOTA_DINAS: siapkan_nota_dinas,
+    JENIS_BERITA_ACARA: siapkan_berita_acara,
+}
+
+
+def siapkan_semua(u: UjianData, jenis: tuple[str, ...]) -> list[Dokumen]:
+    """
+    Pre-flight beberapa dokumen sekaligus: kalau satu gagal, tidak ada yang
+    di-render.
+    """
+    return [SIAPKAN[j](u) for j in jenis]
+
+
+def buat_berita_acara(u: UjianData, output_root: Path) -> Path:
+    return siapkan_berita_acara(u).simpan(output_root)
+
+
+def buat_nota_dinas(u: UjianData, output_root: Path) -> Path:
+    return siapkan_nota_dinas(u).simpan(output_root)
@@ -0,0 +1,298 @@
+# core/dosen_search.py
+from __future__ import annotations
+
+import bisect
+import heapq
+import re
+import unicodedata
+from collections import defaultdict
+from itertools import accumulate
+from typing import Callable, Iterable, Iterator
+
+from core.excel_loader import Dosen
+
+# gelar akademik: diabaikan di query kalau ada kata lain, dan bobotnya kecil
+GELAR = frozenset(
+    {
+        "prof", "dr", "drs", "dra", "ir", "h", "hj",
+        "s", "m", "si", "sc", "msc", "phd", "ph", "d", "pd", "kom", "t", "e",
+        "mm", "mt", "st", "ssi", "msi", "stat", "mstat", "act", "asai", "fsai",
+        "mba", "ma", "ba", "bsc", "se", "ak", "mkom", "skom", "spd", "mpd",
+    }
+)  # fmt: skip
+
+_RE_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+# bobot token per sumber
+_W_NAMA = 3
+_W_ID = 2
+_W_GELAR = 1
+
+# token per blok yang postings-nya sudah digabung (lihat _urut)
+_BLOK = 64
+# sampai sekian postings, gabung langsung jadi set (C) lebih murah dari
+# heapq.merge / cek per dokumen
+_KECIL = 4096
+_MIN_SKOR_NGRAM = 0.34
+
+# token query yang cocok: rentang index di _tokens (prefix) atau daftar index
+# (potongan angka / trigram), urut naik
+_Cocok = range | list[int]
+
+
+def normalisasi(text: str) -> str:
+    """
+    'Dr. Ãndi  Wijaya, M.Sc.' -> 'dr andi wijaya m sc'
+    Huruf kecil, tanpa diakritik, tanda baca jadi spasi.
+    """
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return _RE_NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+def _token_nama(nama: str) -> tuple[list[str], list[str]]:
+    """
+    Pisahkan token nama inti dan token gelar. Konvensi penulisan:
+    gelar depan sebelum nama, gelar belakang setelah koma pertama.
+    """
+    depan, _, belakang = nama.partition(",")
+    inti: list[str] = []
+    gelar: list[str] = normalisasi(belakang).split()
+    for tok in normalisasi(depan).split():
+        (gelar if tok in GELAR else inti).append(tok)
+    return inti, gelar
+
+
+def _trigram(text: str) -> set[str]:
+    text = f"  {text} "
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class DosenIndex:
+    """
+    Index pencarian dosen: prefix per token (nama, gelar, jenis_id, id).
+    Kata query yang tidak cocok sebagai prefix dicari lewat trigram atas
+    kosakata token (salah ketik / potongan di tengah kata); kata angka (NIP /
+    NUP) dicari sebagai potongan di tengah id.
+
+    Urutan dokumen = urutan `dosen` saat index dibuat (dipakai sebagai
+    tie-breaker), jadi berikan list yang sudah terurut seperti di combo.
+
+    Kandidat dibaca urut dokumen sambil jalan dan berhenti begitu `limit` hasil
+    pasti: prefix yang cocok dengan ribuan token (mis. "196" di NIP) tidak
+    perlu menggabung semua postings-nya.
+    """
+
+    def __init__(self, dosen: Iterable[Dosen]):
+        self.dosen: list[Dosen] = list(dosen)
+        self._by_id: dict[str, int] = {}
+        self._bobot: list[dict[str, int]] = []
+        postings: dict[str, list[int]] = defaultdict(list)
+        maks: dict[str, int] = {}  # bobot tertinggi tiap token
+
+        for i, d in enumerate(self.dosen):
+            self._by_id.setdefault(d.id, i)
+            inti, gelar = _token_nama(d.nama)
+            bobot: dict[str, int] = {}
+            for tok in gelar + normalisasi(d.jenis_id).split():
+                bobot[tok] = max(bobot.get(tok, 0), _W_GELAR)
+            for tok in normalisasi(d.id).split():
+                bobot[tok] = max(bobot.get(tok, 0), _W_ID)
+            for tok in inti:
+                bobot[tok] = _W_NAMA
+            self._bobot.append(bobot)
+            for tok, w in bobot.items():
+                postings[tok].append(i)
+                if w > maks.get(tok, 0):
+                    maks[tok] = w
+
+        self._postings = dict(postings)
+        self._maks = maks
+        self._tokens = sorted(self._postings)
+        self._no = {tok: t for t, tok in enumerate(self._tokens)}
+        # jumlah postings kumulatif: perkiraan jumlah dokumen satu rentang O(1)
+        self._kum = list(
+            accumulate((len(self._postings[tok]) for tok in self._tokens), initial=0)
+        )
+        # postings tiap _BLOK token berurutan, sudah digabung
+        self._blok: list[list[int]] = []
+        for b in range(0, len(self._tokens), _BLOK):
+            gabung: set[int] = set()
+            for tok in self._tokens[b : b + _BLOK]:
+                gabung.update(self._postings[tok])
+            self._blok.append(sorted(gabung))
+
+        # trigram token huruf (salah ketik, kosakata kecil) dan trigram token
+        # angka (potongan id, dicocokkan persis: trigram angka terlalu umum
+        # untuk dihitung kemiripannya)
+        ngram: dict[str, list[int]] = defaultdict(list)
+        ngram_angka: dict[str, list[int]] = defaultdict(list)
+        for t, tok in enumerate(self._tokens):
+            if tok.isdigit():
+                for g in {tok[k : k + 3] for k in range(len(tok) - 2)}:
+                    ngram_angka[g].append(t)
+                continue
+            for g in _trigram(tok):
+                ngram[g].append(t)
+        self._ngram = dict(ngram)
+        self._ngram_angka = dict(ngram_angka)
+
+    def __len__(self) -> int:
+        return len(self.dosen)
+
+    def cari(self, query: str, limit: int = 50) -> list[Dosen]:
+        return [self.dosen[i] for i in self.cari_index(query, limit)]
+
+    def cari_index(self, query: str, limit: int = 50) -> list[int]:
+        q = normalisasi(query)
+        if not q:
+            return list(range(min(limit, len(self.dosen))))
+
+        exact = self._by_id.get(q.replace(" ", ""))
+        tokens = q.split()
+        inti = [t for t in tokens if t not in GELAR]
+        if inti:
+            tokens = inti
+
+        if len(tokens) == 1:
+            hasil = self._satu_kata(tokens[0], limit)
+        else:
+            # dokumen yang cocok dengan semua kata query: kata dengan dokumen
+            # paling sedikit yang dibaca, kata lain dicek per dokumen
+            cocok = sorted((self._cocok(t) for t in tokens), key=self._perkiraan)
+            kandidat: Iterable[int] = self._urut(cocok[0])
+            for c in cocok[1:]:
+                kandidat = filter(self._punya(c), kandidat)
+            hasil = self._ranking(kandidat, tokens, limit)
+
+        if exact is not None:
+            hasil = [exact] + [i for i in hasil if i != exact][: limit - 1]
+        return hasil
+
+    # ---------- internal ----------
+    def _satu_kata(self, q: str, limit: int) -> list[int]:
+        # kata utuh dulu (urutan combo), lalu sisanya yang hanya cocok prefix
+        hasil = list(self._postings.get(q, ())[:limit])
+        if len(hasil) < limit:
+            sudah = set(hasil)
+            for i in self._urut(self._cocok(q)):
+                if i not in sudah:
+                    hasil.append(i)
+                    if len(hasil) >= limit:
+                        break
+        return hasil
+
+    def _cocok(self, kata: str) -> _Cocok:
+        """
+        Token yang berawalan `kata`; kalau tidak ada, token angka yang memuat
+        `kata` (kata angka) atau token yang mirip menurut trigram.
+        """
+        lo = bisect.bisect_left(self._tokens, kata)
+        hi = bisect.bisect_left(self._tokens, kata + "\uffff", lo)
+        if lo < hi:
+            return range(lo, hi)
+        if kata.isdigit():
+            return self._potongan_angka(kata)
+        return self._token_mirip(kata)
+
+    def _perkiraan(self, cocok: _Cocok) -> int:
+        # batas atas jumlah dokumen (dokumen dengan dua token cocok terhitung 2x)
+        if isinstance(cocok, range):
+            return self._kum[cocok.stop] - self._kum[cocok.start]
+        return sum(self._kum[t + 1] - self._kum[t] for t in cocok)
+
+    def _daftar(self, cocok: _Cocok) -> list[list[int]]:
+        """
+        Postings (terurut) yang gabungannya = dokumen untuk `cocok`. Rentang
+        lebar memakai postings per blok yang sudah digabung.
+        """
+        tokens, postings = self._tokens, self._postings
+        if isinstance(cocok, range):
+            lo, hi = cocok.start, cocok.stop
+            b_lo, b_hi = -(-lo // _BLOK), hi // _BLOK
+            if b_lo < b_hi:
+                daftar = [postings[tokens[t]] for t in range(lo, b_lo * _BLOK)]
+                daftar += self._blok[b_lo:b_hi]
+                daftar += [postings[tokens[t]] for t in range(b_hi * _BLOK, hi)]
+                return daftar
+        return [postings[tokens[t]] for t in cocok]
+
+    def _urut(self, cocok: _Cocok) -> Iterator[int]:
+        """
+        Id dokumen (urut naik, tanpa duplikat) yang punya salah satu token
+        `cocok`. Yang besar digabung sambil jalan (heapq.merge), jadi pemanggil
+        yang berhenti setelah `limit` hasil hanya membayar sebanyak itu.
+        """
+        daftar = self._daftar(cocok)
+        if len(daftar) == 1:
+            yield from daftar[0]
+            return
+        if sum(map(len, daftar)) <= _KECIL:
+            yield from sorted(set().union(*daftar))
+            return
+        terakhir = -1
+        for i in heapq.merge(*daftar):
+            if i != terakhir:
+                terakhir = i
+                yield i
+
+    def _punya(self, cocok: _Cocok) -> Callable[[int], bool]:
+        """
+        Cek satu dokumen: punya salah satu token `cocok`?
+        """
+        if self._perkiraan(cocok) <= _KECIL:
+            return set().union(*self._daftar(cocok)).__contains__
+        bobot = self._bobot
+        if isinstance(cocok, range):
+            no, lo, hi = self._no, cocok.start, cocok.stop
+            return lambda i: any(lo <= no[tok] < hi for tok in bobot[i])
+        nama = {self._tokens[t] for t in cocok}
+        return lambda i: not nama.isdisjoint(bobot[i])
+
+    def _potongan_angka(self, q: str) -> list[int]:
+        # 1-2 angka ada di hampir semua id, tidak berguna sebagai potongan
+        grams = {q[k : k + 3] for k in range(len(q) - 2)}
+        if not grams:
+            return []
+        # dua trigram paling jarang sudah menyaring hampir semua token
+        daftar = sorted((self._ngram_angka.get(g, []) for g in grams), key=len)
+        kandidat = set(daftar[0]).intersection(*daftar[1:2])
+        tokens = self._tokens
+        return sorted(t for t in kandidat if q in tokens[t])
+
+    def _token_mirip(self, q: str) -> list[int]:
+        grams = _trigram(q)
+        hitung: dict[int, int] = defaultdict(int)
+        for g in grams:
+            for t in self._ngram.get(g, ()):
+                hitung[t] += 1
+        minimum = _MIN_SKOR_NGRAM * len(grams)
+        return sorted(t for t, n in hitung.items() if n >= minimum)
+
+    def _ranking(
+        self, kandidat: Iterable[int], tokens: list[str], limit: int
+    ) -> list[int]:
+        # semua kandidat sudah cocok (prefix/mirip) dengan tiap kata; yang
+        # cocok kata utuh di nama inti naik ke atas. Kandidat datang urut id,
+        # jadi begitu `limit` kandidat mencapai skor tertinggi yang mungkin,
+        # kandidat berikutnya tidak bisa masuk lagi.
+        if limit < 1:
+            return []
+        bobot = self._bobot
+        tertinggi = sum(self._maks.get(q, 0) for q in tokens)
+        heap: list[tuple[int, int]] = []  # (skor, -id): paling atas = terburuk
+        penuh = 0
+        for i in kandidat:
+            b = bobot[i]
+            skor = sum(b.get(q, 0) for q in tokens)
+            if len(heap) < limit:
+                heapq.heappush(heap, (skor, -i))
+            elif skor > heap[0][0]:
+                heapq.heapreplace(heap, (skor, -i))
+            else:
+                continue
+            if skor == tertinggi:
+                penuh += 1
+                if penuh >= limit:
+                    break
+        return [-i for _, i in sorted(heap, key=lambda e: (-e[0], -e[1]))]
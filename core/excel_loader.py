@@ -1,43 +1,249 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+from collections.abc import Mapping
 from dataclasses import dataclass
 from pathlib import Path
-import pandas as pd
+from typing import Iterable, Iterator, Sequence
+
+from core.paths import cache_dir
+from core.profiling import span
+
+# naikkan kalau format snapshot / cara parsing berubah -> snapshot lama diabaikan
+SNAPSHOT_VERSION = 2
+
+_Row = Sequence[str]  # (nama, jenis_id, id)
 
 
 @dataclass(frozen=True)
 class Dosen:
+    # __slots__ manual (tanpa __dict__): satu dosen ±72 byte, bukan ±200
+    __slots__ = ("nama", "jenis_id", "id")
     nama: str
     jenis_id: str  # NIP / NUP
     id: str        # nomor
 
+    def __reduce__(self):
+        # pickle bawaan untuk slots memakai setattr, yang ditolak frozen
+        return Dosen, (self.nama, self.jenis_id, self.id)
+
+
+def display_dosen(d: Dosen) -> str:
+    # teks yang tampil di combo: "Nama — NIP: 123"
+    return f"{d.nama} — {d.jenis_id}: {d.id}"
 
-def load_dosen_excel(path: Path) -> tuple[dict[str, Dosen], dict[str, str]]:
+
+class DosenRegistry(Mapping):
     """
-    Return:
-      - dosen_by_id: {id: Dosen}
-      - display_to_id: {"Nama — NIP: 123": "123"}
+    Semua dosen dari satu Excel: mapping id -> Dosen (dipakai di mana pun
+    dosen_by_id dipakai), urutan tampilan yang sudah di-sort, dan cari balik
+    dari teks combo. Teks tampilan tidak disimpan; dihitung saat diminta.
+
+    ID yang muncul lebih dari sekali: baris terakhir yang dipakai, dan
+    pasangan (lama, baru) dicatat di `duplikat`.
     """
-    df = pd.read_excel(path, dtype=str).fillna("")
-    df.columns = [c.strip().lower() for c in df.columns]
 
-    required = {"nama", "jenis_id", "id"}
-    if not required.issubset(set(df.columns)):
-        raise ValueError("Kolom Excel harus ada: nama, jenis_id, id")
+    __slots__ = ("_by_id", "_urut", "duplikat")
+
+    def __init__(self, dosen: Iterable[Dosen] = ()):
+        self._by_id: dict[str, Dosen] = {}
+        self._urut: tuple[Dosen, ...] | None = None
+        self.duplikat: list[tuple[Dosen, Dosen]] = []
+        for d in dosen:
+            lama = self._by_id.get(d.id)
+            if lama is not None:
+                self.duplikat.append((lama, d))
+            self._by_id[d.id] = d
+
+    @classmethod
+    def dari_rows(cls, rows: Iterable[_Row]) -> DosenRegistry:
+        # jenis_id hanya beberapa nilai (NIP / NUP / ...): satu objek str saja
+        return cls(Dosen(nama, sys.intern(jenis), idnum) for nama, jenis, idnum in rows)
+
+    def __getitem__(self, dosen_id: str) -> Dosen:
+        return self._by_id[dosen_id]
+
+    def __contains__(self, dosen_id: object) -> bool:
+        return dosen_id in self._by_id
 
-    dosen_by_id: dict[str, Dosen] = {}
-    display_to_id: dict[str, str] = {}
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._by_id)
 
-    for _, row in df.iterrows():
-        nama = str(row["nama"]).strip()
-        jenis = str(row["jenis_id"]).strip()
-        idnum = str(row["id"]).strip()
+    def __len__(self) -> int:
+        return len(self._by_id)
 
-        if not nama or not idnum:
-            continue
+    def get(self, dosen_id: str, default=None):
+        return self._by_id.get(dosen_id, default)
 
-        d = Dosen(nama=nama, jenis_id=jenis, id=idnum)
-        dosen_by_id[idnum] = d
+    def values(self):
+        return self._by_id.values()
 
-        display = f"{nama} — {jenis}: {idnum}"
-        display_to_id[display] = idnum
+    def items(self):
+        return self._by_id.items()
+
+    @property
+    def urut(self) -> tuple[Dosen, ...]:
+        """
+        Dosen urut teks tampilan (urutan combo). Di-sort sekali, lalu di-cache.
+        """
+        if self._urut is None:
+            self._urut = tuple(sorted(self._by_id.values(), key=display_dosen))
+        return self._urut
+
+    def dari_display(self, teks: str) -> Dosen | None:
+        """
+        "Nama — NIP: 123" -> Dosen 123, O(1): id diambil dari ujung teks lalu
+        dicocokkan ulang, jadi teks yang sudah diedit user tidak dianggap cocok.
+        """
+        idnum = teks.rpartition(": ")[2]
+        d = self._by_id.get(idnum)
+        if d is None or display_dosen(d) != teks:
+            return None
+        return d
+
+    def pesan_duplikat(self) -> str:
+        ids = ", ".join(dict.fromkeys(baru.id for _, baru in self.duplikat))
+        return f"ID dosen ganda (baris terakhir yang dipakai): {ids}"
+
+
+@dataclass(frozen=True)
+class DiffDosen:
+    tambah: tuple[Dosen, ...] = ()
+    hapus: tuple[Dosen, ...] = ()
+    ubah: tuple[tuple[Dosen, Dosen], ...] = ()  # (lama, baru), id sama
+
+    def __bool__(self) -> bool:
+        return bool(self.tambah or self.hapus or self.ubah)
+
+    def ringkas(self) -> str:
+        return (
+            f"{len(self.tambah)} ditambah, {len(self.hapus)} dihapus, "
+            f"{len(self.ubah)} diubah"
+        )
+
+
+def diff_dosen(lama: Mapping[str, Dosen], baru: Mapping[str, Dosen]) -> DiffDosen:
+    """
+    Perbedaan dua hasil load_dosen_excel (dosen_by_id), dengan id sebagai
+    identitas: nama / jenis_id yang berubah = diubah, bukan hapus + tambah.
+    """
+    return DiffDosen(
+        tambah=tuple(d for i, d in baru.items() if i not in lama),
+        hapus=tuple(d for i, d in lama.items() if i not in baru),
+        ubah=tuple(
+            (d, baru[i]) for i, d in lama.items() if i in baru and baru[i] != d
+        ),
+    )
 
-    return dosen_by_id, display_to_id
+
+def tanda_file(path: Path) -> tuple[int, int] | None:
+    """
+    (size, mtime_ns) untuk cek cepat apakah file berubah; None kalau hilang.
+    """
+    try:
+        st = Path(path).stat()
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def load_dosen_excel(
+    path: Path, use_snapshot: bool = True, sheet: str | None = None
+) -> DosenRegistry:
+    """
+    Return DosenRegistry: mapping {id: Dosen} + urutan combo + cari balik
+    dari teks tampilan. ID ganda dilaporkan di registry.duplikat.
+
+    path boleh .xlsx atau .csv; sheet = nama sheet (default sheet pertama).
+
+    Hasil parse disimpan sebagai snapshot di cache_dir(). Selama workbook tidak
+    berubah (path, size, mtime, hash isi sama), snapshot dipakai dan openpyxl
+    tidak dimuat sama sekali.
+    """
+    path = Path(path)
+    if not use_snapshot:
+        with span("load_excel"):
+            return DosenRegistry.dari_rows(_baca_excel(path, sheet))
+
+    with span("load_snapshot"):
+        kunci = _kunci_snapshot(path, sheet)
+        rows = _baca_snapshot(path, kunci)
+    if rows is None:
+        with span("load_excel"):
+            rows = _baca_excel(path, sheet)
+        _tulis_snapshot(path, kunci, rows)
+    return DosenRegistry.dari_rows(rows)
+
+
+def _baca_excel(path: Path, sheet: str | None = None) -> list[_Row]:
+    from core.tabel import KolomKurang, baca_baris
+
+    rows: list[_Row] = []
+    try:
+        for _, row in baca_baris(path, sheet, ("nama", "jenis_id", "id")):
+            nama = row["nama"]
+            idnum = row["id"]
+            if not nama or not idnum:
+                continue
+            rows.append((nama, row["jenis_id"], idnum))
+    except KolomKurang:
+        raise ValueError("Kolom Excel harus ada: nama, jenis_id, id") from None
+    return rows
+
+
+# ---------- Snapshot ----------
+def _snapshot_path(path: Path) -> Path:
+    h = hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()[:16]
+    return cache_dir() / "dosen" / f"{path.stem}_{h}.json"
+
+
+def _kunci_snapshot(path: Path, sheet: str | None = None) -> dict:
+    st = path.stat()
+    return {
+        "version": SNAPSHOT_VERSION,
+        "path": str(path.resolve()),
+        "sheet": sheet,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": hashlib.sha256(path.read_bytes()).hexdigest(),
+    }
+
+
+def _baca_snapshot(path: Path, kunci: dict) -> list[_Row] | None:
+    try:
+        data = json.loads(_snapshot_path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    # file rusak / ditulis versi lain: anggap tidak ada, Excel dibaca ulang
+    if not isinstance(data, dict) or data.get("kunci") != kunci:
+        return None
+    rows = data.get("rows")
+    if not isinstance(rows, list) or not all(
+        isinstance(r, list) and len(r) == 3 for r in rows
+    ):
+        return None
+    return rows
+
+
+def _tulis_snapshot(path: Path, kunci: dict, rows: list[_Row]):
+    """
+    Best effort: gagal menulis snapshot tidak boleh menggagalkan load Excel.
+    """
+    target = _snapshot_path(path)
+    tmp = target.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(
+            json.dumps(
+                {"kunci": kunci, "rows": rows},
+                ensure_ascii=False,
+                separators=(",", ":"),
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp, target)
+    except OSError:
+        tmp.unlink(missing_ok=True)
@@ -0,0 +1,147 @@
+# core/gabung.py
+"""
+Mail merge: banyak dokumen (mis. semua Berita Acara satu hari) jadi satu .docx.
+
+  data = render_gabungan([(template_1pb, ctx_a), (template_2pb, ctx_b), ...])
+
+Body tiap template di-patch dan di-compile Jinja sekali (lewat TemplateCache),
+lalu di-render untuk setiap context; paket .docx (style, header, gambar) hanya
+dibuka dan disimpan sekali. Tiap ujian jadi satu section, diakhiri section
+break halaman baru.
+
+Template yang digabung harus berbagi paket yang sama (style, header, gambar
+dengan rId yang sama), seperti varian 1 / 2 pembimbing. Paket diambil dari
+template pertama; template lain yang relasinya berbeda ditolak (ValueError).
+Header / footer dipakai bersama semua section, jadi di-render dengan context
+pertama.
+"""
+from __future__ import annotations
+
+import io
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Sequence
+
+from core.profiling import span
+from core.template_cache import TemplateCache, template_cache
+from core.word_generator import normalisasi_zip
+
+if TYPE_CHECKING:
+    from docxtpl import DocxTemplate
+
+_RID = re.compile(r'\br:(?:id|embed|link|pict)="([^"]+)"')
+
+
+def _target_relasi(tpl: DocxTemplate) -> dict[str, str]:
+    return {rid: rel.target_ref for rid, rel in tpl.docx.part.rels.items()}
+
+
+def _sumber_body(
+    base: DocxTemplate,
+    base_path: Path,
+    template_path: Path,
+    cache: TemplateCache,
+) -> str:
+    """
+    Body template_path siap Jinja (sudah patch_xml), dicek cocok dengan paket
+    template pertama.
+    """
+    tpl = base if template_path == base_path else cache.get(template_path)
+    src = tpl.patch_xml(tpl.get_xml())
+    if tpl is not base:
+        punya = _target_relasi(tpl)
+        dasar = _target_relasi(base)
+        for rid in sorted(set(_RID.findall(src))):
+            if punya.get(rid) != dasar.get(rid):
+                raise ValueError(
+                    f"Template {template_path.name} tidak bisa digabung dengan "
+                    f"{base_path.name}: relasi {rid} berbeda."
+                )
+    return src
+
+
+def _akhiri_section(body) -> None:
+    """
+    Pindahkan sectPr body ke paragraf terakhir: isi body ini jadi satu section
+    yang diakhiri section break halaman baru.
+    """
+    from docx.oxml.ns import qn
+    from lxml import etree
+
+    sect = body.find(qn("w:sectPr"))
+    if sect is None:
+        return
+    body.remove(sect)
+    tipe = sect.find(qn("w:type"))
+    if tipe is not None:  # tanpa w:type, defaultnya sudah nextPage
+        tipe.set(qn("w:val"), "nextPage")
+
+    akhir = body[-1] if len(body) else None
+    if akhir is None or akhir.tag != qn("w:p"):
+        akhir = etree.SubElement(body, qn("w:p"))
+    ppr = akhir.find(qn("w:pPr"))
+    if ppr is None:
+        ppr = etree.Element(qn("w:pPr"))
+        akhir.insert(0, ppr)
+    ubah = ppr.find(qn("w:pPrChange"))  # sectPr harus sebelum pPrChange
+    if ubah is not None:
+        ubah.addprevious(sect)
+    else:
+        ppr.append(sect)
+
+
+def render_gabungan(
+    items: Sequence[tuple[Path, dict]],
+    cache: TemplateCache | None = None,
+) -> bytes:
+    """
+    Render (template, context) berurutan ke satu .docx. Return isi .docx.
+    """
+    if not items:
+        raise ValueError("Tidak ada dokumen untuk digabung.")
+    for template_path, _ in items:
+        if not template_path.exists():
+            raise FileNotFoundError(f"Template tidak ditemukan: {template_path}")
+
+    cache = cache or template_cache
+    base_path = items[0][0]
+    with span("template"):
+        base = cache.get(base_path)
+        base.render_init()
+    sumber: dict[Path, tuple[str, Any]] = {}
+
+    body = None
+    with span("render"):
+        for template_path, context in items:
+            src_env = sumber.get(template_path)
+            if src_env is None:
+                src_env = (
+                    _sumber_body(base, base_path, template_path, cache),
+                    cache.get_env(template_path),
+                )
+                sumber[template_path] = src_env
+            src, env = src_env
+            xml = base.render_xml_part(src, base.docx._part, context, env)
+            bagian = base.fix_tables(xml)
+            if body is None:
+                body = bagian
+                continue
+            # section sebelumnya ditutup dulu, sectPr bagian ini jadi penutup body
+            _akhiri_section(body)
+            body.extend(list(bagian))
+        base.fix_docpr_ids(body)
+        base.map_tree(body)
+
+        context = items[0][1]
+        env = cache.get_env(base_path)
+        for uri in (base.HEADER_URI, base.FOOTER_URI):
+            for rel, xml in list(base.build_headers_footers_xml(context, uri, env)):
+                base.map_headers_footers_xml(rel, xml)
+        base.render_properties(context, env)
+        base.render_footnotes(context, env)
+        base.is_rendered = True
+
+    with span("save"):
+        buf = io.BytesIO()
+        base.save(buf)
+        return normalisasi_zip(buf.getvalue())
@@ -0,0 +1,184 @@
+# core/konflik.py
+"""
+Deteksi jadwal bentrok: dosen yang sama di dua ujian yang waktunya tumpang
+tindih, atau dua ujian di ruang yang sama pada waktu yang sama.
+
+Interval disimpan per kunci (tanggal, dosen id) dan (tanggal, ruang). Semua
+bentrok dalam satu kumpulan dicari dengan sweep line: sort per kunci lalu
+satu kali jalan, O(n log n + jumlah bentrok).
+"""
+from __future__ import annotations
+
+import heapq
+import re
+from bisect import insort
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable
+
+from core.dokumen import UjianData
+from core.excel_loader import Dosen
+from core.validator import jam_ke_menit
+
+JENIS_DOSEN = "dosen"
+JENIS_RUANG = "ruang"
+
+
+@dataclass(frozen=True)
+class Jadwal:
+    """
+    Satu ujian di kalender. npm dipakai sebagai identitas: generate ulang
+    ujian yang sama tidak dianggap bentrok dengan dirinya sendiri.
+    """
+
+    npm: str
+    nama_mahasiswa: str
+    tanggal: date
+    mulai: int  # menit sejak 00:00
+    selesai: int
+    dosen: tuple[Dosen, ...]
+    lokasi: str = ""
+
+    @property
+    def jam(self) -> str:
+        return f"{_hhmm(self.mulai)}–{_hhmm(self.selesai)}"
+
+
+@dataclass(frozen=True)
+class Konflik:
+    jenis: str  # JENIS_DOSEN / JENIS_RUANG
+    nama: str  # nama dosen / ruang
+    a: Jadwal
+    b: Jadwal
+
+    def pesan(self) -> str:
+        if self.jenis == JENIS_DOSEN:
+            subjek = f"Dosen {self.nama}"
+        else:
+            subjek = f"Lokasi '{self.nama}'"
+        return (
+            f"{subjek} bentrok pada {self.a.tanggal.isoformat()}: "
+            f"{self.a.nama_mahasiswa} ({self.a.jam}) dan "
+            f"{self.b.nama_mahasiswa} ({self.b.jam})"
+        )
+
+
+def _hhmm(menit: int) -> str:
+    return f"{menit // 60:02d}:{menit % 60:02d}"
+
+
+def _ruang(lokasi: str) -> str:
+    return re.sub(r"\s+", " ", lokasi).strip().casefold()
+
+
+def jadwal_dari_ujian(u: UjianData) -> Jadwal | None:
+    """
+    None kalau jam tidak bisa dibaca (itu urusan validator, bukan di sini).
+    """
+    mulai = jam_ke_menit(u.jam_mulai)
+    selesai = jam_ke_menit(u.jam_selesai)
+    if mulai is None or selesai is None or selesai <= mulai:
+        return None
+    dosen = tuple(
+        d for d in (u.pembimbing_1, u.pembimbing_2, u.penguji_1, u.penguji_2) if d
+    )
+    return Jadwal(
+        npm=u.npm,
+        nama_mahasiswa=u.nama_mahasiswa,
+        tanggal=u.tanggal,
+        mulai=mulai,
+        selesai=selesai,
+        dosen=tuple(dict.fromkeys(dosen)),  # dosen yang sama cukup sekali
+        lokasi=u.lokasi_ujian,
+    )
+
+
+def _kunci(j: Jadwal) -> Iterable[tuple[tuple, str]]:
+    """
+    (kunci interval, nama untuk pesan)
+    """
+    for d in j.dosen:
+        yield (j.tanggal, JENIS_DOSEN, d.id), d.nama
+    ruang = _ruang(j.lokasi)
+    if ruang:
+        yield (j.tanggal, JENIS_RUANG, ruang), j.lokasi.strip()
+
+
+def cari_konflik(jadwal: Iterable[Jadwal]) -> list[Konflik]:
+    """
+    Semua pasangan bentrok dalam satu kumpulan jadwal (mis. satu roster).
+    """
+    # kunci -> [(mulai, selesai, urutan, jadwal, nama)]
+    per_kunci: dict[tuple, list[tuple]] = defaultdict(list)
+    for i, j in enumerate(jadwal):
+        for kunci, nama in _kunci(j):
+            per_kunci[kunci].append((j.mulai, j.selesai, i, j, nama))
+
+    hasil: list[Konflik] = []
+    for kunci, items in per_kunci.items():
+        if len(items) < 2:
+            continue
+        items.sort(key=lambda it: (it[0], it[1], it[2]))
+        aktif: list[tuple[int, int, Jadwal]] = []  # heap (selesai, urutan, jadwal)
+        for mulai, selesai, i, j, nama in items:
+            # yang sudah selesai sebelum ujian ini mulai tidak mungkin bentrok
+            while aktif and aktif[0][0] <= mulai:
+                heapq.heappop(aktif)
+            for _, _, lain in sorted(aktif, key=lambda a: a[1]):
+                if lain.npm != j.npm:
+                    hasil.append(Konflik(kunci[1], nama, lain, j))
+            heapq.heappush(aktif, (selesai, i, j))
+    hasil.sort(key=lambda k: (k.a.tanggal, k.a.mulai, k.jenis, k.nama))
+    return hasil
+
+
+class JadwalIndex:
+    """
+    Jadwal ujian yang sudah dibuat (form + roster), untuk cek bentrok sebelum
+    generate berikutnya. Per kunci, interval disimpan urut jam mulai.
+    """
+
+    def __init__(self, jadwal: Iterable[Jadwal] = ()):
+        self._per_kunci: dict[tuple, list[tuple[int, int, str]]] = defaultdict(list)
+        self._by_npm: dict[str, Jadwal] = {}
+        for j in jadwal:
+            self.tambah(j)
+
+    def __len__(self) -> int:
+        return len(self._by_npm)
+
+    def tambah(self, j: Jadwal) -> None:
+        """
+        Ujian dengan npm yang sama menggantikan jadwal lamanya.
+        """
+        self.hapus(j.npm)
+        self._by_npm[j.npm] = j
+        for kunci, _ in _kunci(j):
+            insort(self._per_kunci[kunci], (j.mulai, j.selesai, j.npm))
+
+    def hapus(self, npm: str) -> None:
+        lama = self._by_npm.pop(npm, None)
+        if lama is None:
+            return
+        for kunci, _ in _kunci(lama):
+            items = self._per_kunci[kunci]
+            items.remove((lama.mulai, lama.selesai, lama.npm))
+            if not items:
+                del self._per_kunci[kunci]
+
+    def cek(self, j: Jadwal) -> list[Konflik]:
+        """
+        Bentrok antara j dan jadwal yang sudah ada di index.
+        """
+        hasil = []
+        for kunci, nama in _kunci(j):
+            for mulai, selesai, npm in self._per_kunci.get(kunci, ()):
+                if mulai >= j.selesai:
+                    break  # urut jam mulai: sisanya pasti sesudah j
+                if selesai > j.mulai and npm != j.npm:
+                    hasil.append(Konflik(kunci[1], nama, self._by_npm[npm], j))
+        return hasil
+
+    def semua_konflik(self) -> list[Konflik]:
+        return cari_konflik(self._by_npm.values())
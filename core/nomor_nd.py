@@ -0,0 +1,263 @@
+# core/nomor_nd.py
+"""
+Penomoran ID Nota Dinas per prodi + tahun, aman dipakai beberapa komputer yang
+berbagi folder output.
+
+  penomoran = PenomoranND(output_root)
+  [n] = penomoran.ambil("Matematika", 2025)        # satu nomor
+  blok = penomoran.ambil("Matematika", 2025, 30)   # blok untuk roster
+  penomoran.kembalikan(blok[25:])                  # yang tidak terpakai
+  n.teks()                                         # "123ND"
+
+Counter disimpan di SQLite (.nomor_nd.sqlite3) di folder output itu sendiri,
+jadi semua yang menulis ke share yang sama memakai urutan yang sama. Setiap
+operasi membuka koneksi baru, BEGIN IMMEDIATE (kunci tulis langsung diambil:
+tidak ada dua pengambil yang membaca nomor yang sama), lalu commit dan tutup;
+transaksinya hanya beberapa query, jadi antrian antar komputer singkat.
+Journal memakai mode DELETE, bukan WAL: WAL butuh shared memory yang tidak
+jalan di share jaringan.
+
+Nomor yang dikembalikan dipakai lagi lebih dulu (terkecil dulu) sebelum nomor
+baru, supaya urutan tidak bolong. Format teks ID ND diatur dengan pola
+(default "{nomor}ND", atau env BERITA_ACARA_POLA_ND), boleh memakai {nomor},
+{tahun}, dan {prodi}, mis. "{nomor:03d}/ND/{tahun}".
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+from core.profiling import span
+
+NAMA_FILE = ".nomor_nd.sqlite3"
+POLA_DEFAULT = "{nomor}ND"
+# detik menunggu kunci dari komputer lain sebelum menyerah
+TIMEOUT = 30.0
+
+# satu statement per item: executescript akan commit transaksi yang berjalan
+_SKEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS urutan (
+        prodi TEXT NOT NULL,
+        tahun INTEGER NOT NULL,
+        berikut INTEGER NOT NULL,
+        PRIMARY KEY (prodi, tahun)
+    )
+    """,
+    # nomor yang sudah diambil lalu dikembalikan (belum dipakai)
+    """
+    CREATE TABLE IF NOT EXISTS kembali (
+        prodi TEXT NOT NULL,
+        tahun INTEGER NOT NULL,
+        nomor INTEGER NOT NULL,
+        PRIMARY KEY (prodi, tahun, nomor)
+    )
+    """,
+)
+
+
+def pola_default() -> str:
+    return os.environ.get("BERITA_ACARA_POLA_ND", "").strip() or POLA_DEFAULT
+
+
+@dataclass(frozen=True)
+class Nomor:
+    prodi: str
+    tahun: int
+    nomor: int
+
+    def teks(self, pola: str | None = None) -> str:
+        """
+        ID ND sesuai pola (default pola_default()).
+        """
+        return (pola or pola_default()).format(
+            nomor=self.nomor, tahun=self.tahun, prodi=self.prodi
+        )
+
+
+@dataclass(frozen=True)
+class StatusUrutan:
+    prodi: str
+    tahun: int
+    berikut: int
+    kembali: tuple[int, ...]
+
+
+def _kunci(prodi: str, tahun: int) -> tuple[str, int]:
+    prodi = prodi.strip()
+    if not prodi:
+        raise ValueError("Prodi wajib diisi untuk mengambil nomor ND.")
+    return prodi, int(tahun)
+
+
+class PenomoranND:
+    """
+    Tidak menyimpan koneksi: aman dipakai dari thread mana saja, dan tidak ada
+    file yang tetap terkunci di share selama aplikasi terbuka.
+    """
+
+    def __init__(self, folder: Path):
+        self.path = Path(folder) / NAMA_FILE
+
+    @contextmanager
+    def _transaksi(self) -> Iterator[sqlite3.Connection]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=TIMEOUT, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=DELETE")
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for sql in _SKEMA:
+                    conn.execute(sql)
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def ambil(self, prodi: str, tahun: int, jumlah: int = 1) -> list[Nomor]:
+        """
+        jumlah nomor untuk satu prodi + tahun, urut naik, dalam satu transaksi.
+        """
+        return self.ambil_banyak([(prodi, tahun)] * jumlah)
+
+    def ambil_banyak(self, kunci: Sequence[tuple[str, int]]) -> list[Nomor]:
+        """
+        Satu nomor per (prodi, tahun) di kunci, urutan hasil = urutan kunci
+        (kunci yang sama dapat nomor naik). Semua dalam satu transaksi.
+        """
+        kunci = [_kunci(p, t) for p, t in kunci]
+        if not kunci:
+            return []
+        blok: dict[tuple[str, int], Iterator[int]] = {}
+        with span("nomor_nd"), self._transaksi() as conn:
+            for (prodi, tahun), n in Counter(kunci).items():
+                blok[prodi, tahun] = iter(_ambil_blok(conn, prodi, tahun, n))
+        return [Nomor(p, t, next(blok[p, t])) for p, t in kunci]
+
+    def kembalikan(self, nomor: Iterable[Nomor]) -> int:
+        """
+        Kembalikan nomor yang tidak jadi dipakai. Nomor yang belum pernah
+        diambil diabaikan. Return jumlah nomor yang diterima.
+        """
+        per_kunci: dict[tuple[str, int], set[int]] = {}
+        for n in nomor:
+            per_kunci.setdefault(_kunci(n.prodi, n.tahun), set()).add(n.nomor)
+        if not per_kunci:
+            return 0
+        diterima = 0
+        with span("nomor_nd"), self._transaksi() as conn:
+            for (prodi, tahun), angka in per_kunci.items():
+                diterima += _kembalikan(conn, prodi, tahun, angka)
+        return diterima
+
+    def atur_berikut(self, prodi: str, tahun: int, berikut: int) -> None:
+        """
+        Nomor berikutnya untuk prodi + tahun (mis. saat mulai memakai penomoran
+        ini di tengah tahun). Tidak boleh mundur: nomor lama bisa terpakai dua
+        kali.
+        """
+        prodi, tahun = _kunci(prodi, tahun)
+        if berikut < 1:
+            raise ValueError("Nomor berikut minimal 1.")
+        with self._transaksi() as conn:
+            sekarang = _berikut(conn, prodi, tahun)
+            if berikut < sekarang:
+                raise ValueError(
+                    f"Nomor ND {prodi} {tahun} sudah sampai {sekarang - 1}; "
+                    f"tidak bisa mundur ke {berikut}."
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO urutan (prodi, tahun, berikut) "
+                "VALUES (?, ?, ?)",
+                (prodi, tahun, berikut),
+            )
+
+    def status(self) -> list[StatusUrutan]:
+        if not self.path.exists():
+            return []
+        with self._transaksi() as conn:
+            urutan = conn.execute(
+                "SELECT prodi, tahun, berikut FROM urutan ORDER BY tahun, prodi"
+            ).fetchall()
+            hasil = []
+            for prodi, tahun, berikut in urutan:
+                kembali = conn.execute(
+                    "SELECT nomor FROM kembali WHERE prodi = ? AND tahun = ? "
+                    "ORDER BY nomor",
+                    (prodi, tahun),
+                ).fetchall()
+                hasil.append(
+                    StatusUrutan(prodi, tahun, berikut, tuple(r[0] for r in kembali))
+                )
+        return hasil
+
+
+def _berikut(conn: sqlite3.Connection, prodi: str, tahun: int) -> int:
+    row = conn.execute(
+        "SELECT berikut FROM urutan WHERE prodi = ? AND tahun = ?", (prodi, tahun)
+    ).fetchone()
+    return row[0] if row else 1
+
+
+def _ambil_blok(conn: sqlite3.Connection, prodi: str, tahun: int, n: int) -> list[int]:
+    bekas = [
+        r[0]
+        for r in conn.execute(
+            "SELECT nomor FROM kembali WHERE prodi = ? AND tahun = ? "
+            "ORDER BY nomor LIMIT ?",
+            (prodi, tahun, n),
+        )
+    ]
+    if bekas:
+        conn.execute(
+            "DELETE FROM kembali WHERE prodi = ? AND tahun = ? AND nomor <= ?",
+            (prodi, tahun, bekas[-1]),
+        )
+    sisa = n - len(bekas)
+    if not sisa:
+        return bekas
+    mulai = _berikut(conn, prodi, tahun)
+    conn.execute(
+        "INSERT OR REPLACE INTO urutan (prodi, tahun, berikut) VALUES (?, ?, ?)",
+        (prodi, tahun, mulai + sisa),
+    )
+    return bekas + list(range(mulai, mulai + sisa))
+
+
+def _kembalikan(
+    conn: sqlite3.Connection, prodi: str, tahun: int, angka: set[int]
+) -> int:
+    berikut = _berikut(conn, prodi, tahun)
+    valid = sorted(a for a in angka if 1 <= a < berikut)
+    conn.executemany(
+        "INSERT OR IGNORE INTO kembali (prodi, tahun, nomor) VALUES (?, ?, ?)",
+        [(prodi, tahun, a) for a in valid],
+    )
+    # nomor paling ujung tidak perlu disimpan: cukup mundurkan counter
+    ujung = berikut
+    for (a,) in conn.execute(
+        "SELECT nomor FROM kembali WHERE prodi = ? AND tahun = ? "
+        "ORDER BY nomor DESC",
+        (prodi, tahun),
+    ):
+        if a != ujung - 1:
+            break
+        ujung = a
+    if ujung != berikut:
+        conn.execute(
+            "DELETE FROM kembali WHERE prodi = ? AND tahun = ? AND nomor >= ?",
+            (prodi, tahun, ujung),
+        )
+        conn.execute(
+            "UPDATE urutan SET berikut = ? WHERE prodi = ? AND tahun = ?",
+            (ujung, prodi, tahun),
+        )
+    return len(valid)
@@ -0,0 +1,154 @@
+# core/output_writer.py
+"""
+Tahap tulis output: render menyerahkan bytes, penulisan ke disk / share SMB
+terjadi di sini.
+
+- tulis_atomik(): tulis ke file sementara di folder yang sama lalu rename.
+  Aplikasi crash di tengah tulis -> yang tertinggal hanya .tmp, bukan .docx
+  terpotong yang tidak bisa dibuka Word.
+- Folder yang sudah pernah dibuat di-cache, jadi tidak ada stat/mkdir per
+  dokumen (di share jaringan tiap stat = satu round trip).
+- OutputWriter: write-behind. Satu thread I/O menulis antrian, sementara
+  thread pemanggil sudah me-render dokumen berikutnya.
+"""
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+from core.profiling import span
+
+# folder yang diketahui sudah ada (str path)
+_folder_ada: set[str] = set()
+
+
+def _pastikan_folder(folder: Path) -> None:
+    kunci = str(folder)
+    if kunci in _folder_ada:
+        return
+    with span("mkdir"):
+        folder.mkdir(parents=True, exist_ok=True)
+    _folder_ada.add(kunci)
+
+
+def tulis_atomik(path: Path, data: bytes) -> os.stat_result:
+    """
+    Tulis data ke path lewat <folder>/.<nama>.<pid>.<thread>.tmp + os.replace.
+    Return stat file akhir (untuk manifest).
+    """
+    path = Path(path)
+    _pastikan_folder(path.parent)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        try:
+            f = open(tmp, "wb")
+        except FileNotFoundError:
+            # folder dihapus sejak masuk cache: buat ulang sekali
+            _folder_ada.discard(str(path.parent))
+            _pastikan_folder(path.parent)
+            f = open(tmp, "wb")
+        with f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return path.stat()
+
+
+class OutputWriter:
+    """
+    Write-behind: tulis() hanya memasukkan (path, bytes) ke antrian dan
+    langsung kembali; thread I/O menulis satu per satu dengan tulis_atomik.
+
+    Antrian dibatasi (maks_antrian): kalau disk / jaringan lebih lambat dari
+    render, pemanggil ikut menunggu, bukan menumpuk bytes di memori.
+    Gagal tulis tidak dilempar ke pemanggil; dicatat di `gagal`.
+
+      with OutputWriter() as w:
+          generate_docx(..., writer=w)
+      print(w.ringkas())     # "120 file, 5.1 MB, 3.4 MB/s"
+    """
+
+    def __init__(self, maks_antrian: int = 16):
+        self._antrian: queue.Queue = queue.Queue(maxsize=maks_antrian)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.gagal: list[tuple[Path, Exception]] = []
+        self.files = 0
+        self.bytes = 0
+        self.detik = 0.0  # waktu thread I/O benar-benar menulis
+
+    def tulis(
+        self,
+        path: Path,
+        data: bytes,
+        setelah: Callable[[os.stat_result], None] | None = None,
+    ) -> None:
+        """
+        setelah(stat) dipanggil di thread I/O begitu file selesai ditulis.
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._loop, name="output-writer", daemon=True
+                )
+                self._thread.start()
+        self._antrian.put((Path(path), data, setelah))
+
+    def tunggu(self) -> None:
+        """
+        Blok sampai semua yang sudah diantrikan selesai ditulis.
+        """
+        self._antrian.join()
+
+    def tutup(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._antrian.put(None)
+            thread.join()
+
+    def throughput(self) -> float:
+        """
+        Byte per detik waktu tulis (bukan waktu total batch).
+        """
+        return self.bytes / self.detik if self.detik > 0 else 0.0
+
+    def ringkas(self) -> str:
+        mb = self.bytes / 1e6
+        teks = f"{self.files} file, {mb:.1f} MB, {self.throughput() / 1e6:.1f} MB/s"
+        if self.gagal:
+            teks += f", {len(self.gagal)} gagal"
+        return teks
+
+    def __enter__(self) -> OutputWriter:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.tutup()
+
+    def _loop(self) -> None:
+        while True:
+            item = self._antrian.get()
+            try:
+                if item is None:
+                    return
+                path, data, setelah = item
+                t0 = time.perf_counter()
+                try:
+                    st = tulis_atomik(path, data)
+                    if setelah is not None:
+                        setelah(st)
+                except Exception as e:
+                    self.gagal.append((path, e))
+                else:
+                    self.files += 1
+                    self.bytes += len(data)
+                self.detik += time.perf_counter() - t0
+            finally:
+                self._antrian.task_done()
@@ -1,9 +1,12 @@
 # core/paths.py
 from __future__ import annotations
 
+import os
 import sys
 from pathlib import Path
 
+APP_NAME = "BeritaAcaraSkripsi"
+
 
 def app_root() -> Path:
     # .../project_root/core/paths.py -> project_root
@@ -19,6 +22,36 @@ def resource_path(relative: str) -> Path:
     return app_root() / relative
 
 
+def cache_dir() -> Path:
+    """
+    Folder cache per user (bukan di dalam app_root, karena di mode onefile
+    folder itu sementara). Bisa dioverride lewat env BERITA_ACARA_CACHE_DIR.
+    """
+    override = os.environ.get("BERITA_ACARA_CACHE_DIR")
+    if override:
+        return Path(override)
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+        return Path(base) / APP_NAME / "cache"
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / APP_NAME
+
+
+def data_dir() -> Path:
+    """
+    Folder data per user yang harus awet (arsip ujian), beda dengan cache_dir
+    yang boleh dihapus. Bisa dioverride lewat env BERITA_ACARA_DATA_DIR.
+    """
+    override = os.environ.get("BERITA_ACARA_DATA_DIR")
+    if override:
+        return Path(override)
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+        return Path(base) / APP_NAME / "data"
+    base = os.environ.get("XDG_DATA_HOME") or Path.home() / ".local" / "share"
+    return Path(base) / APP_NAME
+
+
 def _pilih_template(jumlah_pembimbing: int, file_1: str, file_2: str) -> Path:
     if jumlah_pembimbing == 1:
         return resource_path(f"resources/{file_1}")
@@ -47,3 +80,17 @@ def pilih_template_nota_dinas_berdasarkan_pembimbing(jumlah_pembimbing: int) ->
         "template_undangan_nota_dinas_1pembimbing.docx",
         "template_undangan_nota_dinas_2pembimbing.docx",
     )
+
+
+def semua_template() -> list[Path]:
+    """
+    Keempat template (BA / ND × 1 / 2 pembimbing), untuk pemanasan cache.
+    """
+    return [
+        pilih(n)
+        for n in (1, 2)
+        for pilih in (
+            pilih_template_berdasarkan_pembimbing,
+            pilih_template_nota_dinas_berdasarkan_pembimbing,
+        )
+    ]
@@ -0,0 +1,295 @@
+# core/penjadwal.py
+"""
+Penyusun jadwal ujian otomatis.
+
+Input: daftar mahasiswa (dengan pembimbing), pool dosen penguji, tanggal,
+ruang, panjang sesi, dan (opsional) jendela ketersediaan dosen.
+Output: UjianData lengkap (tanggal, jam, ruang, dua penguji) yang langsung
+bisa dipakai siapkan_berita_acara / siapkan_nota_dinas atau ditulis sebagai
+roster.
+
+Aturan yang dijaga sama dengan validate_form: penguji 1 != penguji 2,
+pembimbing bukan penguji, jam selesai > jam mulai. Ditambah: dosen dan ruang
+tidak dipakai dua ujian di sesi yang sama, dan beban menguji dibagi rata
+(penguji dengan beban paling sedikit dipilih lebih dulu).
+
+Greedy, mahasiswa yang paling sulit dijadwalkan (pembimbing paling jarang
+tersedia) diproses duluan. Beberapa ratus ujian selesai dalam hitungan detik.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Iterable, Mapping
+
+from core.dokumen import UjianData
+from core.excel_loader import Dosen
+
+
+@dataclass(frozen=True)
+class Mahasiswa:
+    nama_mahasiswa: str
+    npm: str
+    judul_skripsi: str
+    pembimbing_1: Dosen
+    pembimbing_2: Dosen | None = None
+    urutan: int = 1
+    prodi: str = ""
+    id_nd: str = ""
+
+    @property
+    def pembimbing(self) -> tuple[Dosen, ...]:
+        return tuple(d for d in (self.pembimbing_1, self.pembimbing_2) if d)
+
+
+@dataclass(frozen=True)
+class Jendela:
+    """
+    Dosen bisa hadir pada tanggal ini, dari mulai s/d selesai (menit).
+    """
+
+    tanggal: date
+    mulai: int
+    selesai: int
+
+
+@dataclass
+class AturanJadwal:
+    tanggal: list[date]
+    ruang: list[str]
+    durasi: int = 120  # menit per ujian
+    jam_mulai: int = 8 * 60
+    jam_selesai: int = 16 * 60
+    jeda: int = 0  # menit antar sesi
+    maks_per_hari: int | None = None  # maks. ujian per dosen per hari
+
+    def sesi(self) -> list[tuple[int, int]]:
+        hasil = []
+        mulai = self.jam_mulai
+        while mulai + self.durasi <= self.jam_selesai:
+            hasil.append((mulai, mulai + self.durasi))
+            mulai += self.durasi + self.jeda
+        return hasil
+
+
+@dataclass
+class HasilJadwal:
+    ujian: list[UjianData] = field(default_factory=list)
+    gagal: list[tuple[Mahasiswa, str]] = field(default_factory=list)
+    beban: dict[str, int] = field(default_factory=dict)  # dosen id -> jml menguji
+
+
+def _jam(menit: int) -> str:
+    return f"{menit // 60:02d}:{menit % 60:02d}"
+
+
+class _Kalender:
+    def __init__(
+        self,
+        aturan: AturanJadwal,
+        ketersediaan: dict[str, list[Jendela]] | None,
+    ):
+        self.aturan = aturan
+        self.ketersediaan = ketersediaan or {}
+        sesi = aturan.sesi()
+        # slot = (tanggal, index sesi, mulai, selesai)
+        self.slot = [
+            (t, i, m, s)
+            for t in sorted(aturan.tanggal)
+            for i, (m, s) in enumerate(sesi)
+        ]
+        self.sibuk: dict[tuple[date, int], set[str]] = defaultdict(set)
+        self.ruang_terpakai: dict[tuple[date, int], int] = defaultdict(int)
+        self.per_hari: dict[tuple[str, date], int] = defaultdict(int)
+        self._bisa: dict[tuple[str, date, int], bool] = {}
+
+    def tersedia(self, dosen_id: str, slot) -> bool:
+        tanggal, i, mulai, selesai = slot
+        kunci = (dosen_id, tanggal, i)
+        hasil = self._bisa.get(kunci)
+        if hasil is None:
+            jendela = self.ketersediaan.get(dosen_id)
+            # dosen tanpa data ketersediaan dianggap selalu bisa
+            hasil = jendela is None or any(
+                j.tanggal == tanggal and j.mulai <= mulai and selesai <= j.selesai
+                for j in jendela
+            )
+            self._bisa[kunci] = hasil
+        return hasil
+
+    def bebas(self, dosen_id: str, slot) -> bool:
+        tanggal, i, _, _ = slot
+        if dosen_id in self.sibuk[(tanggal, i)]:
+            return False
+        maks = self.aturan.maks_per_hari
+        if maks is not None and self.per_hari[(dosen_id, tanggal)] >= maks:
+            return False
+        return self.tersedia(dosen_id, slot)
+
+    def ada_ruang(self, slot) -> bool:
+        tanggal, i, _, _ = slot
+        return self.ruang_terpakai[(tanggal, i)] < len(self.aturan.ruang)
+
+    def pakai(self, slot, dosen_ids: Iterable[str]) -> str:
+        tanggal, i, _, _ = slot
+        ruang = self.aturan.ruang[self.ruang_terpakai[(tanggal, i)]]
+        self.ruang_terpakai[(tanggal, i)] += 1
+        for d in dosen_ids:
+            self.sibuk[(tanggal, i)].add(d)
+            self.per_hari[(d, tanggal)] += 1
+        return ruang
+
+
+def susun_jadwal(
+    mahasiswa: Iterable[Mahasiswa],
+    penguji: Iterable[Dosen],
+    aturan: AturanJadwal,
+    ketersediaan: dict[str, list[Jendela]] | None = None,
+) -> HasilJadwal:
+    """
+    Tetapkan tanggal, jam, ruang dan dua penguji untuk setiap mahasiswa.
+    Mahasiswa yang tidak bisa dijadwalkan masuk HasilJadwal.gagal beserta
+    alasannya; sisanya tetap dijadwalkan.
+    """
+    if not aturan.tanggal:
+        raise ValueError("Tanggal ujian belum diisi.")
+    if not aturan.ruang:
+        raise ValueError("Ruang ujian belum diisi.")
+    if not aturan.sesi():
+        raise ValueError("Durasi ujian lebih panjang dari jam ujian per hari.")
+
+    kal = _Kalender(aturan, ketersediaan)
+    pool = list({d.id: d for d in penguji}.values())
+    beban: dict[str, int] = {d.id: 0 for d in pool}
+    hasil = HasilJadwal(beban=beban)
+
+    # paling sulit dulu: pembimbing dengan slot tersedia paling sedikit
+    def kelonggaran(m: Mahasiswa) -> tuple[int, str]:
+        n = sum(1 for s in kal.slot if all(kal.tersedia(p.id, s) for p in m.pembimbing))
+        return n, m.npm
+
+    urut = sorted(mahasiswa, key=kelonggaran)
+    # jumlah ujian per slot: slot yang masih sepi dicoba lebih dulu
+    isi_slot: dict[tuple[date, int], int] = defaultdict(int)
+
+    for m in urut:
+        pb_ids = {p.id for p in m.pembimbing}
+        if m.pembimbing_2 is not None and m.pembimbing_2.id == m.pembimbing_1.id:
+            hasil.gagal.append((m, "Pembimbing 2 sama dengan Pembimbing 1."))
+            continue
+
+        terpilih = None
+        for s in sorted(kal.slot, key=lambda s: (isi_slot[(s[0], s[1])], s[0], s[1])):
+            if not kal.ada_ruang(s):
+                continue
+            if not all(kal.bebas(p, s) for p in pb_ids):
+                continue
+            calon = sorted(
+                (d for d in pool if d.id not in pb_ids and kal.bebas(d.id, s)),
+                key=lambda d: (beban[d.id], kal.per_hari[(d.id, s[0])], d.id),
+            )
+            if len(calon) >= 2:
+                terpilih = s, calon[0], calon[1]
+                break
+
+        if terpilih is None:
+            hasil.gagal.append(
+                (m, "Tidak ada sesi dengan ruang, pembimbing dan 2 penguji yang bebas.")
+            )
+            continue
+
+        s, pj1, pj2 = terpilih
+        tanggal, i, mulai, selesai = s
+        ruang = kal.pakai(s, [*pb_ids, pj1.id, pj2.id])
+        isi_slot[(tanggal, i)] += 1
+        beban[pj1.id] += 1
+        beban[pj2.id] += 1
+        hasil.ujian.append(
+            UjianData(
+                nama_mahasiswa=m.nama_mahasiswa,
+                npm=m.npm,
+                judul_skripsi=m.judul_skripsi,
+                urutan=m.urutan,
+                tanggal=tanggal,
+                jam_mulai=_jam(mulai),
+                jam_selesai=_jam(selesai),
+                pembimbing_1=m.pembimbing_1,
+                pembimbing_2=m.pembimbing_2,
+                penguji_1=pj1,
+                penguji_2=pj2,
+                id_nd=m.id_nd,
+                lokasi_ujian=ruang,
+                prodi=m.prodi,
+            )
+        )
+
+    hasil.ujian.sort(key=lambda u: (u.tanggal, u.jam_mulai, u.lokasi_ujian))
+    return hasil
+
+
+# ---------- Input dari tabel ----------
+def _dosen(dosen_by_id: Mapping[str, Dosen], idnum: str, kolom: str, baris: int):
+    d = dosen_by_id.get(idnum)
+    if d is None:
+        raise ValueError(
+            f"Baris {baris}: ID dosen '{idnum}' ({kolom}) tidak ada di Excel dosen."
+        )
+    return d
+
+
+def mahasiswa_dari_rows(
+    rows: Iterable[tuple[int, dict[str, str]]], dosen_by_id: Mapping[str, Dosen]
+) -> list[Mahasiswa]:
+    """
+    rows: (nomor_baris, dict) seperti dari tabel.baca_baris. Kolom:
+    nama_mahasiswa, npm, judul_skripsi, pembimbing_1 (id), opsional
+    pembimbing_2, urutan, prodi, id_nd. Nomor baris = baris di file.
+    """
+    hasil = []
+    for baris, row in rows:
+        pb2 = row.get("pembimbing_2", "")
+        urutan = row.get("urutan", "")
+        try:
+            urutan_int = int(float(urutan)) if urutan else 1
+        except ValueError:
+            raise ValueError(f"Baris {baris}: urutan harus angka: '{urutan}'") from None
+        hasil.append(
+            Mahasiswa(
+                nama_mahasiswa=row.get("nama_mahasiswa", ""),
+                npm=row.get("npm", ""),
+                judul_skripsi=row.get("judul_skripsi", ""),
+                pembimbing_1=_dosen(
+                    dosen_by_id, row.get("pembimbing_1", ""), "pembimbing_1", baris
+                ),
+                pembimbing_2=(
+                    _dosen(dosen_by_id, pb2, "pembimbing_2", baris) if pb2 else None
+                ),
+                urutan=urutan_int,
+                prodi=row.get("prodi", ""),
+                id_nd=row.get("id_nd", ""),
+            )
+        )
+    return hasil
+
+
+def ketersediaan_dari_rows(
+    rows: Iterable[tuple[int, dict[str, str]]],
+) -> dict[str, list[Jendela]]:
+    """
+    rows: (nomor_baris, dict) seperti dari tabel.baca_baris. Kolom: id (dosen),
+    tanggal, mulai, selesai. Satu baris = satu jendela.
+    """
+    from core.roster import normalisasi_jam, parse_tanggal
+    from core.validator import jam_ke_menit
+
+    hasil: dict[str, list[Jendela]] = defaultdict(list)
+    for baris, row in rows:
+        mulai = jam_ke_menit(normalisasi_jam(row.get("mulai", "")))
+        selesai = jam_ke_menit(normalisasi_jam(row.get("selesai", "")))
+        if mulai is None or selesai is None:
+            raise ValueError(f"Baris {baris}: format jam harus HH:mm.")
+        hasil[row.get("id", "")].append(
+            Jendela(parse_tanggal(row.get("tanggal", "")), mulai, selesai)
+        )
+    return dict(hasil)
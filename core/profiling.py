@@ -0,0 +1,201 @@
+# core/profiling.py
+"""
+Instrumentasi ringan: berapa lama tiap tahap generate (load Excel, template,
+render, save, mkdir, ...).
+
+  with rekam() as rek:          # satu "sesi", per thread
+      ...                       # kode yang memanggil span("render") dst.
+  print(rek.ringkas())          # "render 85 ms · save 20 ms · ..."
+
+Saat nonaktif, span() mengembalikan context manager kosong yang sama, jadi
+biayanya hanya satu cek boolean. Bisa dinyalakan saat runtime (set_aktif) atau
+lewat env:
+  BERITA_ACARA_TIMING=1           -> catat span
+  BERITA_ACARA_PROFIL_DIR=<folder> -> dump cProfile (.prof) tiap sesi
+  BERITA_ACARA_TRACEMALLOC=1      -> dump alokasi memori teratas tiap sesi
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Iterator
+
+_NOOP = nullcontext()
+_local = threading.local()
+
+
+def _env_on(nama: str) -> bool:
+    return os.environ.get(nama, "").strip() not in ("", "0")
+
+
+_aktif = _env_on("BERITA_ACARA_TIMING")
+_profil_dir: Path | None = (
+    Path(os.environ["BERITA_ACARA_PROFIL_DIR"])
+    if os.environ.get("BERITA_ACARA_PROFIL_DIR")
+    else None
+)
+_tracemalloc = _env_on("BERITA_ACARA_TRACEMALLOC")
+
+
+def aktif() -> bool:
+    return _aktif
+
+
+def set_aktif(on: bool) -> None:
+    global _aktif
+    _aktif = on
+
+
+def konfigurasi(
+    aktif: bool | None = None,
+    profil_dir: Path | None = None,
+    tracemalloc: bool | None = None,
+) -> None:
+    """
+    Ubah pengaturan global. Argumen None = tidak diubah.
+    profil_dir juga menyalakan span (dump tanpa rincian tidak berguna).
+    """
+    global _aktif, _profil_dir, _tracemalloc
+    if aktif is not None:
+        _aktif = aktif
+    if profil_dir is not None:
+        _profil_dir = Path(profil_dir)
+        _aktif = True
+    if tracemalloc is not None:
+        _tracemalloc = tracemalloc
+
+
+class Rekaman:
+    """
+    Akumulasi durasi per nama span dalam satu sesi.
+    """
+
+    def __init__(self):
+        self.spans: dict[str, list[float]] = {}  # nama -> [total_ms, jumlah]
+        self.total_ms = 0.0
+        self.files: list[Path] = []  # dump cProfile / tracemalloc
+
+    def tambah(self, nama: str, ms: float) -> None:
+        s = self.spans.get(nama)
+        if s is None:
+            self.spans[nama] = [ms, 1]
+        else:
+            s[0] += ms
+            s[1] += 1
+
+    def __bool__(self) -> bool:
+        return bool(self.spans)
+
+    def ringkas(self, maks: int = 6) -> str:
+        urut = sorted(self.spans.items(), key=lambda kv: -kv[1][0])
+        bagian = []
+        for nama, (ms, n) in urut[:maks]:
+            kali = f" ×{n}" if n > 1 else ""
+            bagian.append(f"{nama} {ms:.0f} ms{kali}")
+        teks = " · ".join(bagian)
+        return f"{teks} (total {self.total_ms:.0f} ms)"
+
+    def as_dict(self) -> dict:
+        return {
+            "total_ms": self.total_ms,
+            "spans": {k: {"ms": v[0], "n": v[1]} for k, v in self.spans.items()},
+            "files": [str(p) for p in self.files],
+        }
+
+
+class _Span:
+    __slots__ = ("rek", "nama", "t0")
+
+    def __init__(self, rek: Rekaman, nama: str):
+        self.rek = rek
+        self.nama = nama
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.rek.tambah(self.nama, (time.perf_counter() - self.t0) * 1000)
+        return False
+
+
+def span(nama: str):
+    """
+    Ukur satu tahap. Tidak mencatat apa pun kalau nonaktif / di luar rekam().
+    """
+    if not _aktif:
+        return _NOOP
+    rek = getattr(_local, "rekaman", None)
+    if rek is None:
+        return _NOOP
+    return _Span(rek, nama)
+
+
+@contextmanager
+def rekam(label: str = "generate") -> Iterator[Rekaman]:
+    """
+    Satu sesi pengukuran di thread ini. Sesi bersarang ikut ke sesi terluar.
+    """
+    rek = Rekaman()
+    if not _aktif or getattr(_local, "rekaman", None) is not None:
+        yield rek
+        return
+
+    profiler = None
+    if _profil_dir is not None:
+        import cProfile
+
+        profiler = cProfile.Profile()
+
+    mulai_tm = False
+    if _tracemalloc:
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            mulai_tm = True
+
+    _local.rekaman = rek
+    t0 = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield rek
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        rek.total_ms = (time.perf_counter() - t0) * 1000
+        _local.rekaman = None
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        if profiler is not None:
+            rek.files.append(_dump_profil(profiler, label, stamp))
+        if _tracemalloc:
+            rek.files.append(_dump_tracemalloc(label, stamp, mulai_tm))
+
+
+def _dump_profil(profiler, label: str, stamp: str) -> Path:
+    folder = _profil_dir or Path.cwd()
+    folder.mkdir(parents=True, exist_ok=True)
+    path = folder / f"{label}_{stamp}_{threading.get_ident()}.prof"
+    profiler.dump_stats(str(path))
+    return path
+
+
+def _dump_tracemalloc(label: str, stamp: str, stop: bool) -> Path:
+    import tracemalloc
+
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    if stop:
+        tracemalloc.stop()
+
+    folder = _profil_dir or Path.cwd()
+    folder.mkdir(parents=True, exist_ok=True)
+    path = folder / f"{label}_{stamp}_{threading.get_ident()}_memori.txt"
+    lines = [f"peak: {peak / 1024:.0f} KB", ""]
+    lines += [str(s) for s in snapshot.statistics("lineno")[:30]]
+    path.write_text("\n".join(lines), encoding="utf-8")
+    return path
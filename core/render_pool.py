@@ -0,0 +1,187 @@
+# core/render_pool.py
+"""
+Render banyak dokumen paralel di beberapa proses.
+
+Render docxtpl (Jinja + tulis zip) murni CPU dan memegang GIL, jadi thread
+tidak membantu. RenderPool memakai ProcessPoolExecutor; tiap worker memuat
+docxtpl dan mem-parse template sekali saat start, lalu hanya menerima job
+(template, context, tujuan).
+
+  with RenderPool(templates=semua_template()) as pool:
+      for i, hasil in pool.jalankan(jobs):
+          ...   # urutan selesai, bukan urutan jobs
+
+Job dikirim per chunk (default 4) supaya overhead pickle/IPC per dokumen
+kecil. File ditulis oleh worker (tmp + rename); manifest output dicatat di
+proses utama, jadi tidak ada dua proses yang menulis manifest yang sama.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import time
+from concurrent import futures
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+DEFAULT_CHUNK = 4
+
+
+@dataclass(frozen=True)
+class RenderJob:
+    template_path: Path
+    context: dict
+    tujuan: Path | None = None  # None -> isi .docx dikembalikan (mis. untuk zip)
+
+
+@dataclass
+class HasilRender:
+    ok: bool
+    pesan: str = ""
+    data: bytes | None = None  # hanya kalau job.tujuan None
+    size: int = 0
+    mtime_ns: int = 0
+    ms: float = 0.0  # waktu render + tulis di worker
+
+
+# ---------- sisi worker ----------
+def _init_worker(templates: tuple[str, ...]) -> None:
+    from core.template_cache import template_cache
+
+    import docxtpl  # noqa: F401  (import berat, sekali per worker)
+
+    for t in templates:
+        try:
+            template_cache.get(Path(t))
+        except Exception:
+            pass  # template rusak / hilang: dilaporkan per job nanti
+
+
+def _render_satu(job: RenderJob) -> HasilRender:
+    from core.output_writer import tulis_atomik
+    from core.word_generator import render_docx
+
+    t0 = time.perf_counter()
+    try:
+        data = render_docx(job.template_path, job.context)
+        if job.tujuan is None:
+            hasil = HasilRender(True, data=data)
+        else:
+            st = tulis_atomik(job.tujuan, data)
+            hasil = HasilRender(True, size=st.st_size, mtime_ns=st.st_mtime_ns)
+    except Exception as e:
+        hasil = HasilRender(False, pesan=str(e))
+    hasil.ms = (time.perf_counter() - t0) * 1000
+    return hasil
+
+
+def _render_chunk(
+    chunk: list[tuple[int, RenderJob]],
+) -> list[tuple[int, HasilRender]]:
+    return [(i, _render_satu(job)) for i, job in chunk]
+
+
+def _siap() -> int:
+    return os.getpid()
+
+
+# ---------- sisi pemanggil ----------
+class RenderPool:
+    """
+    workers=None -> jumlah core. Pool dibuat sekali dan dipakai ulang; worker
+    tetap hidup (template sudah ter-parse) sampai shutdown().
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        chunk: int = DEFAULT_CHUNK,
+        templates: Iterable[Path] = (),
+    ):
+        if chunk < 1:
+            raise ValueError("chunk minimal 1")
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk = chunk
+        # spawn di semua OS: fork dari proses yang sudah punya thread (Qt,
+        # ThreadPool) tidak aman, dan Windows memang hanya punya spawn
+        self._pool = futures.ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(tuple(str(t) for t in templates),),
+        )
+        # worker dibuat saat ada job; satu job kosong per worker supaya semua
+        # sudah start + memuat template sebelum batch pertama datang
+        for _ in range(self.workers):
+            self._pool.submit(_siap)
+
+    def jalankan(
+        self,
+        jobs: Sequence[RenderJob],
+        batal=None,
+    ) -> Iterator[tuple[int, HasilRender]]:
+        """
+        (index di jobs, hasil) begitu selesai. Kalau event batal di-set, chunk
+        yang belum mulai dibatalkan; chunk yang sedang jalan ditunggu dan
+        hasilnya tetap dikeluarkan (file-nya sudah ditulis worker), baru
+        iterasi berhenti.
+        """
+        indexed = list(enumerate(jobs))
+        # chunk tidak lebih besar dari bagian rata per worker: batch kecil tetap
+        # tersebar ke semua core
+        ukuran = max(1, min(self.chunk, -(-len(indexed) // self.workers)))
+        pending: set[futures.Future] = {
+            self._pool.submit(_render_chunk, indexed[i : i + ukuran])
+            for i in range(0, len(indexed), ukuran)
+        }
+        try:
+            while pending:
+                selesai, pending = futures.wait(
+                    pending, timeout=0.2, return_when=futures.FIRST_COMPLETED
+                )
+                if batal is not None and batal.is_set():
+                    for f in pending:
+                        f.cancel()  # False kalau sudah jalan di worker
+                    jalan = {f for f in pending if not f.cancelled()}
+                    selesai |= futures.wait(jalan).done
+                    pending = set()
+                for f in selesai:
+                    yield from f.result()
+        finally:
+            for f in pending:
+                f.cancel()
+
+    def kirim(self, job: RenderJob) -> futures.Future:
+        """
+        Satu job langsung, tanpa chunk (mis. per request server). Future berisi
+        HasilRender; BrokenProcessPool kalau ada worker yang mati.
+        """
+        return self._pool.submit(_render_satu, job)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+    def __enter__(self) -> RenderPool:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+
+
+def dari_env(templates: Iterable[Path] = ()) -> RenderPool | None:
+    """
+    Pool sesuai env (untuk GUI):
+      BERITA_ACARA_PROSES  jumlah proses render; 0 / kosong = jumlah core,
+                           1 = tanpa pool (render di thread seperti biasa)
+      BERITA_ACARA_CHUNK   dokumen per kiriman (default 4)
+    """
+    try:
+        workers = int(os.environ.get("BERITA_ACARA_PROSES") or 0)
+        chunk = int(os.environ.get("BERITA_ACARA_CHUNK") or DEFAULT_CHUNK)
+    except ValueError:
+        return None
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        return None
+    return RenderPool(workers, max(1, chunk), templates)
@@ -0,0 +1,283 @@
+# core/roster.py
+from __future__ import annotations
+
+import csv
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping
+
+from core.date_formatter import nama_hari_indonesia
+from core.dokumen import UjianData
+from core.excel_loader import Dosen
+from core.tabel import KolomKurang, baca_baris, baca_kolom
+from core.validator import Pelanggaran, validasi_kolom
+
+# kolom roster (header tidak case-sensitive)
+KOLOM_WAJIB = (
+    "nama_mahasiswa",
+    "npm",
+    "judul_skripsi",
+    "tanggal",
+    "jam_mulai",
+    "jam_selesai",
+    "pembimbing_1",
+    "penguji_1",
+    "penguji_2",
+)
+KOLOM_OPSIONAL = (
+    "urutan",
+    "pembimbing_2",
+    "id_nd",
+    "tanggal_nd",
+    "lokasi_ujian",
+    "prodi",
+)
+
+_FORMAT_TANGGAL = (
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%d/%m/%Y",
+    "%d-%m-%Y",
+)
+_RE_JAM = re.compile(r"^(\d{1,2})[:.](\d{2})(?::\d{2})?$")
+
+
+@dataclass
+class RosterFile:
+    """
+    Roster ujian dari .xlsx / .csv. Iterasi menghasilkan (nomor_baris, dict).
+    nomor_baris mengikuti baris di file (header = baris 1); baris kosong
+    dilewati. Disimpan per kolom (list str), bukan per baris.
+    """
+
+    path: Path
+    nomor: list[int]
+    data: dict[str, list[str]]
+
+    def __len__(self) -> int:
+        return len(self.nomor)
+
+    def __iter__(self) -> Iterator[tuple[int, dict[str, str]]]:
+        cols = list(self.data)
+        for i, baris in enumerate(self.nomor):
+            yield baris, {c: self.data[c][i] for c in cols}
+
+    def kolom(self, nama: str) -> list[str]:
+        """
+        Satu kolom utuh (sudah di-strip), urut sesuai baris.
+        """
+        return self.data[nama]
+
+    @classmethod
+    def dari_rows(cls, rows: Iterable[tuple[int, dict[str, str]]]) -> RosterFile:
+        """
+        Roster dari baris yang sudah ada di memori (CLI --json, hasil jadwal).
+        """
+        rows = list(rows)
+        kolom = dict.fromkeys((*KOLOM_WAJIB, *KOLOM_OPSIONAL))
+        for _, row in rows:
+            kolom.update(dict.fromkeys(row))
+        data = {k: [row.get(k, "").strip() for _, row in rows] for k in kolom}
+        return cls(path=Path(), nomor=[b for b, _ in rows], data=data)
+
+
+def baca_tabel(
+    path: Path, wajib: tuple[str, ...] = (), sheet: str | None = None
+) -> list[dict[str, str]]:
+    """
+    Tabel .xlsx / .csv apa saja -> list dict (header lowercase, nilai di-strip).
+    """
+    return [row for _, row in baca_baris(path, sheet, wajib)]
+
+
+def load_roster(path: Path, sheet: str | None = None) -> RosterFile:
+    path = Path(path)
+    try:
+        nomor, data = baca_kolom(path, sheet, KOLOM_WAJIB)
+    except KolomKurang as e:
+        raise ValueError(f"Kolom roster belum ada: {', '.join(e.kolom)}") from None
+    for k in KOLOM_OPSIONAL:
+        if k not in data:
+            data[k] = [""] * len(nomor)
+    return RosterFile(path=path, nomor=nomor, data=data)
+
+
+def parse_tanggal(text: str) -> date:
+    text = text.strip()
+    for fmt in _FORMAT_TANGGAL:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Format tanggal tidak dikenali: '{text}' (pakai YYYY-MM-DD)")
+
+
+def normalisasi_jam(text: str) -> str:
+    """
+    '9:30', '09.30', '09:30:00' -> '09:30'. Kalau tidak cocok, dikembalikan apa
+    adanya supaya validate_form yang memberi pesan error.
+    """
+    m = _RE_JAM.match(text.strip())
+    if not m:
+        return text.strip()
+    return f"{int(m.group(1)):02d}:{m.group(2)}"
+
+
+def ujian_ke_row(u: UjianData) -> dict[str, str]:
+    """
+    Kebalikan row_ke_ujian: UjianData -> satu baris roster (dosen = id).
+    """
+    return {
+        "nama_mahasiswa": u.nama_mahasiswa,
+        "npm": u.npm,
+        "judul_skripsi": u.judul_skripsi,
+        "urutan": str(u.urutan),
+        "tanggal": u.tanggal.isoformat(),
+        "jam_mulai": u.jam_mulai,
+        "jam_selesai": u.jam_selesai,
+        "pembimbing_1": u.pembimbing_1.id if u.pembimbing_1 else "",
+        "pembimbing_2": u.pembimbing_2.id if u.pembimbing_2 else "",
+        "penguji_1": u.penguji_1.id if u.penguji_1 else "",
+        "penguji_2": u.penguji_2.id if u.penguji_2 else "",
+        "id_nd": u.id_nd,
+        "tanggal_nd": u.tanggal_nd.isoformat() if u.tanggal_nd else "",
+        "lokasi_ujian": u.lokasi_ujian,
+        "prodi": u.prodi,
+    }
+
+
+def tulis_roster_csv(path: Path, ujian: list[UjianData]) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=[*KOLOM_WAJIB, *KOLOM_OPSIONAL])
+        w.writeheader()
+        for u in ujian:
+            w.writerow(ujian_ke_row(u))
+
+
+def _cari_dosen(
+    dosen_by_id: Mapping[str, Dosen], row: dict[str, str], kolom: str
+) -> Dosen | None:
+    idnum = row.get(kolom, "").strip()
+    if not idnum:
+        return None
+    d = dosen_by_id.get(idnum)
+    if d is None:
+        raise ValueError(f"ID dosen '{idnum}' ({kolom}) tidak ada di Excel dosen.")
+    return d
+
+
+def row_ke_ujian(row: dict[str, str], dosen_by_id: Mapping[str, Dosen]) -> UjianData:
+    """
+    Satu baris roster -> UjianData. Raise ValueError kalau data tidak bisa dibaca.
+    Aturan bisnis (penguji beda, jam, dst.) tetap dicek oleh validator.
+    """
+    urutan_text = row.get("urutan", "").strip()
+    try:
+        urutan = int(float(urutan_text)) if urutan_text else 1
+    except ValueError:
+        raise ValueError(f"Urutan ujian harus angka: '{urutan_text}'") from None
+
+    tanggal_nd_text = row.get("tanggal_nd", "").strip()
+
+    return UjianData(
+        nama_mahasiswa=row.get("nama_mahasiswa", "").strip(),
+        npm=row.get("npm", "").strip(),
+        judul_skripsi=row.get("judul_skripsi", "").strip(),
+        urutan=urutan,
+        tanggal=parse_tanggal(row.get("tanggal", "")),
+        jam_mulai=normalisasi_jam(row.get("jam_mulai", "")),
+        jam_selesai=normalisasi_jam(row.get("jam_selesai", "")),
+        pembimbing_1=_cari_dosen(dosen_by_id, row, "pembimbing_1"),
+        pembimbing_2=_cari_dosen(dosen_by_id, row, "pembimbing_2"),
+        penguji_1=_cari_dosen(dosen_by_id, row, "penguji_1"),
+        penguji_2=_cari_dosen(dosen_by_id, row, "penguji_2"),
+        id_nd=row.get("id_nd", "").strip(),
+        tanggal_nd=parse_tanggal(tanggal_nd_text) if tanggal_nd_text else None,
+        lokasi_ujian=row.get("lokasi_ujian", "").strip(),
+        prodi=row.get("prodi", "").strip(),
+    )
+
+
+# ---------- Validasi seluruh roster ----------
+_KOLOM_DOSEN = ("pembimbing_1", "pembimbing_2", "penguji_1", "penguji_2")
+_KOLOM_ND = (
+    ("id_nd", "ID ND wajib diisi."),
+    ("lokasi_ujian", "Lokasi ujian wajib diisi."),
+    ("prodi", "Prodi wajib diisi."),
+)
+
+
+def _hari_atau_none(text: str) -> str | None:
+    try:
+        return nama_hari_indonesia(parse_tanggal(text))
+    except ValueError:
+        return None
+
+
+def validasi_roster(
+    roster: RosterFile,
+    dosen_by_id: Mapping[str, Dosen],
+    nota_dinas: bool = True,
+) -> list[Pelanggaran]:
+    """
+    Semua pelanggaran di seluruh roster dalam satu jalan, urut per baris:
+    format urutan/tanggal, id dosen yang tidak dikenal, aturan validate_form
+    (lewat validasi_kolom), dan kolom wajib Nota Dinas kalau nota_dinas=True.
+    """
+    nomor = roster.nomor
+    temuan: list[Pelanggaran] = []
+
+    for b, v in zip(nomor, roster.kolom("urutan")):
+        if v:
+            try:
+                int(float(v))
+            except ValueError:
+                temuan.append(
+                    Pelanggaran(b, "urutan", f"Urutan ujian harus angka: '{v}'")
+                )
+
+    tanggal = roster.kolom("tanggal")
+    hari_unik = {t: _hari_atau_none(t) for t in set(tanggal)}
+    hari = []
+    for b, t in zip(nomor, tanggal):
+        h = hari_unik[t]
+        if h is None:
+            temuan.append(
+                Pelanggaran(
+                    b,
+                    "tanggal",
+                    f"Format tanggal tidak dikenali: '{t}' (pakai YYYY-MM-DD)",
+                )
+            )
+            h = "?"  # sudah dilaporkan di atas, jangan ditambah "hari wajib"
+        hari.append(h)
+
+    data = {k: roster.kolom(k) for k in _KOLOM_DOSEN}
+    for k, ids in data.items():
+        for b, idnum in zip(nomor, ids):
+            if idnum and idnum not in dosen_by_id:
+                temuan.append(
+                    Pelanggaran(
+                        b, k, f"ID dosen '{idnum}' ({k}) tidak ada di Excel dosen."
+                    )
+                )
+
+    for k in ("nama_mahasiswa", "npm", "judul_skripsi"):
+        data[k] = roster.kolom(k)
+    data["hari"] = hari
+    data["jam_mulai"] = [normalisasi_jam(v) for v in roster.kolom("jam_mulai")]
+    data["jam_selesai"] = [normalisasi_jam(v) for v in roster.kolom("jam_selesai")]
+    temuan.extend(validasi_kolom(data, nomor))
+
+    if nota_dinas:
+        for k, pesan in _KOLOM_ND:
+            temuan.extend(
+                Pelanggaran(b, k, pesan)
+                for b, v in zip(nomor, roster.kolom(k))
+                if not v
+            )
+
+    temuan.sort(key=lambda p: p.baris)  # stabil: urutan jenis cek tetap
+    return temuan
@@ -0,0 +1,270 @@
+# core/server.py
+"""
+Mode service HTTP lokal (stdlib asyncio, tanpa Qt).
+
+Roster dosen dan template tetap di memori. Validasi + context dikerjakan di
+event loop, render di RenderPool (proses, bukan thread: render docxtpl memegang
+GIL). Kalau pool + antrian penuh, request langsung dijawab 503 (dengan
+Retry-After) supaya klien tidak menunggu tanpa batas; begitu juga kalau worker
+mati, sambil pool dibuat ulang.
+
+Endpoint:
+  GET  /health          -> status JSON
+  POST /berita-acara    -> body JSON (kunci = kolom roster), balasan .docx
+  POST /nota-dinas      -> idem
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from concurrent import futures
+from dataclasses import dataclass
+from typing import Mapping
+from urllib.parse import quote
+
+from core.dokumen import (
+    JENIS_BERITA_ACARA,
+    JENIS_NOTA_DINAS,
+    SIAPKAN,
+    Dokumen,
+    TemplateSchemaError,
+)
+from core.excel_loader import Dosen
+from core.paths import semua_template
+from core.render_pool import RenderJob, RenderPool
+from core.roster import row_ke_ujian
+from core.template_cache import template_cache
+
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+MAX_BODY = 1024 * 1024
+
+_ROUTE_JENIS = {
+    "/berita-acara": JENIS_BERITA_ACARA,
+    "/nota-dinas": JENIS_NOTA_DINAS,
+}
+
+_STATUS_TEXT = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, pesan: str):
+        super().__init__(pesan)
+        self.status = status
+        self.pesan = pesan
+
+
+@dataclass
+class _Respon:
+    status: int
+    body: bytes
+    content_type: str = "application/json; charset=utf-8"
+    headers: dict[str, str] | None = None
+
+
+def _json(status: int, data: dict) -> _Respon:
+    return _Respon(status, json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+
+class GenerateServer:
+    def __init__(
+        self,
+        dosen_by_id: Mapping[str, Dosen],
+        workers: int | None = None,
+        max_antrian: int | None = None,
+    ):
+        self.dosen_by_id = dosen_by_id
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        # render di proses ±100 ms/dokumen per worker: 16 per worker = tunggu
+        # ±1-2 detik, masih wajar untuk puluhan request bersamaan
+        self.max_antrian = self.workers * 16 if max_antrian is None else max_antrian
+        self._pool = self._buat_pool()
+        self._pending = 0  # sedang render + menunggu worker
+        self.total_ok = 0
+        self.total_ditolak = 0
+
+    def _buat_pool(self) -> RenderPool:
+        # worker memuat docxtpl + template sekali saat start
+        return RenderPool(self.workers, templates=semua_template())
+
+    def _ganti_pool(self, rusak: RenderPool) -> None:
+        """
+        Worker mati (crash, kehabisan memori): pool itu tidak bisa dipakai lagi.
+        Dibuat ulang sekali saja walau banyak request gagal bersamaan.
+        """
+        if self._pool is rusak:
+            rusak.shutdown(wait=False)
+            self._pool = self._buat_pool()
+
+    def warmup(self) -> None:
+        """
+        Parse keempat template (untuk cek schema di proses ini) sekarang, bukan
+        saat request pertama. Worker pool sudah memuat sendiri saat start.
+        """
+        for t in semua_template():
+            template_cache.get_variabel(t)
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765) -> None:
+        server = await asyncio.start_server(self._handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self) -> None:
+        self._pool.shutdown()
+
+    # ---------- HTTP ----------
+    async def _handle(self, reader: asyncio.StreamReader, writer):
+        try:
+            try:
+                method, path, body = await self._baca_request(reader)
+                respon = await self._route(method, path, body)
+            except HttpError as e:
+                respon = _json(e.status, {"error": e.pesan})
+                if e.status == 503:
+                    respon.headers = {"Retry-After": "1"}
+            except Exception as e:  # jangan sampai satu request mematikan server
+                respon = _json(500, {"error": str(e)})
+            await self._tulis_respon(writer, respon)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _baca_request(self, reader) -> tuple[str, str, bytes]:
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "Request line tidak valid") from None
+
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                k, v = line.split(":", 1)
+                headers[k.strip().lower()] = v.strip()
+
+        try:
+            length = int(headers.get("content-length", "0") or 0)
+        except ValueError:
+            raise HttpError(400, "Content-Length tidak valid") from None
+        if length < 0:
+            raise HttpError(400, "Content-Length tidak valid")
+        if length > MAX_BODY:
+            raise HttpError(413, "Body terlalu besar")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target.split("?", 1)[0], body
+
+    async def _tulis_respon(self, writer, respon: _Respon) -> None:
+        headers = {
+            "Content-Type": respon.content_type,
+            "Content-Length": str(len(respon.body)),
+            "Connection": "close",
+            **(respon.headers or {}),
+        }
+        status_text = _STATUS_TEXT.get(respon.status, "")
+        head = f"HTTP/1.1 {respon.status} {status_text}\r\n" + "".join(
+            f"{k}: {v}\r\n" for k, v in headers.items()
+        )
+        writer.write(head.encode("latin-1") + b"\r\n" + respon.body)
+        await writer.drain()
+
+    async def _route(self, method: str, path: str, body: bytes) -> _Respon:
+        if path == "/health":
+            return _json(
+                200,
+                {
+                    "status": "ok",
+                    "dosen": len(self.dosen_by_id),
+                    "workers": self.workers,
+                    "pending": self._pending,
+                    "max_antrian": self.max_antrian,
+                    "total_ok": self.total_ok,
+                    "total_ditolak": self.total_ditolak,
+                },
+            )
+
+        jenis = _ROUTE_JENIS.get(path)
+        if jenis is None:
+            raise HttpError(404, f"Endpoint tidak ada: {path}")
+        if method != "POST":
+            raise HttpError(405, "Gunakan POST")
+
+        try:
+            data = json.loads(body.decode("utf-8") or "{}")
+        except ValueError:
+            raise HttpError(400, "Body harus JSON") from None
+        if not isinstance(data, dict):
+            raise HttpError(400, "Body JSON harus objek")
+        row = {str(k): "" if v is None else str(v) for k, v in data.items()}
+
+        # back-pressure: tolak di depan, jangan menumpuk antrian tanpa batas
+        if self._pending >= self.workers + self.max_antrian:
+            self.total_ditolak += 1
+            raise HttpError(503, "Server sibuk, coba lagi")
+
+        dok = self._siapkan(jenis, row)
+        pool = self._pool
+        self._pending += 1
+        try:
+            hasil = await asyncio.wrap_future(
+                pool.kirim(RenderJob(dok.template_path, dok.context))
+            )
+        except futures.BrokenExecutor:
+            self._ganti_pool(pool)
+            raise HttpError(503, "Worker render dimulai ulang, coba lagi") from None
+        finally:
+            self._pending -= 1
+        if not hasil.ok:
+            raise HttpError(500, hasil.pesan)
+
+        self.total_ok += 1
+        filename = dok.relpath.name
+        return _Respon(
+            200,
+            hasil.data or b"",
+            content_type=DOCX_MIME,
+            headers={
+                "Content-Disposition": (
+                    f"attachment; filename*=UTF-8''{quote(filename)}"
+                )
+            },
+        )
+
+    def _siapkan(self, jenis: str, row: dict[str, str]) -> Dokumen:
+        """
+        ValueError (data tidak valid) -> 400, template yang tidak cocok dengan
+        context -> 500.
+        """
+        try:
+            u = row_ke_ujian(row, self.dosen_by_id)
+            return SIAPKAN[jenis](u)
+        except TemplateSchemaError as e:
+            raise HttpError(500, str(e)) from None
+        except ValueError as e:
+            raise HttpError(400, str(e)) from None
+
+
+def jalankan_server(
+    dosen_by_id: Mapping[str, Dosen],
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    workers: int | None = None,
+    max_antrian: int | None = None,
+) -> None:
+    server = GenerateServer(dosen_by_id, workers=workers, max_antrian=max_antrian)
+    server.warmup()
+    try:
+        asyncio.run(server.serve(host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
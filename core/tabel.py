@@ -0,0 +1,142 @@
+# core/tabel.py
+"""
+Baca tabel .xlsx / .csv baris per baris, tanpa pandas.
+
+  for baris, row in baca_baris(path, sheet="Dosen"):
+      row["nama"]      # header di-strip + lowercase, nilai selalu str
+
+.xlsx dibaca dengan openpyxl mode read_only (stream XML sheet), jadi memori
+tetap kecil berapa pun jumlah barisnya; yang menumpuk hanya yang disimpan
+pemanggil. Nilai sel dikonversi sama seperti pandas dtype=str dulu: kosong ->
+"", 2112.0 -> "2112", tanggal -> "2025-12-23 00:00:00".
+"""
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+from typing import Any, Iterator
+
+EKSTENSI = (".xlsx", ".xlsm", ".csv")
+
+
+class KolomKurang(ValueError):
+    def __init__(self, nama_file: str, kolom: list[str]):
+        super().__init__(f"Kolom {nama_file} belum ada: {', '.join(kolom)}")
+        self.kolom = kolom
+
+
+def _teks(v: Any) -> str:
+    if v is None:
+        return ""
+    if isinstance(v, float) and v.is_integer():
+        return str(int(v))
+    return str(v).strip()
+
+
+def _baris_csv(path: Path) -> Iterator[tuple]:
+    # utf-8-sig: CSV dari Excel biasanya diawali BOM
+    with path.open(encoding="utf-8-sig", newline="") as f:
+        yield from csv.reader(f)
+
+
+def _baris_xlsx(path: Path, sheet: str | None) -> Iterator[tuple]:
+    from openpyxl import load_workbook  # import berat, baru saat dibutuhkan
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        if sheet is None:
+            ws = wb.worksheets[0]  # sama dengan pandas: sheet pertama
+        elif sheet in wb.sheetnames:
+            ws = wb[sheet]
+        else:
+            raise ValueError(
+                f"Sheet '{sheet}' tidak ada di {path.name} "
+                f"(ada: {', '.join(wb.sheetnames)})"
+            )
+        yield from ws.iter_rows(values_only=True)
+    finally:
+        wb.close()  # read_only membuka file sampai ditutup
+
+
+def daftar_sheet(path: Path) -> list[str]:
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        return []
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True)
+    try:
+        return list(wb.sheetnames)
+    finally:
+        wb.close()
+
+
+def baca_baris(
+    path: Path,
+    sheet: str | None = None,
+    wajib: tuple[str, ...] = (),
+) -> Iterator[tuple[int, dict[str, str]]]:
+    """
+    (nomor_baris, dict) per baris data; nomor_baris = baris di file (header =
+    baris 1). Baris yang seluruhnya kosong dilewati, nomornya tetap dihitung.
+    Kolom tanpa header diabaikan; header kembar -> yang pertama dipakai.
+
+    Kolom `wajib` dicek begitu header terbaca, sebelum baris data pertama.
+    """
+    it = _tabel(Path(path), sheet, wajib)
+    next(it)  # header
+    yield from it
+
+
+def _tabel(path: Path, sheet: str | None, wajib: tuple[str, ...]) -> Iterator:
+    """
+    Elemen pertama: list nama kolom; sesudahnya (nomor_baris, dict).
+    """
+    if path.suffix.lower() == ".csv":
+        rows = _baris_csv(path)
+    else:
+        rows = _baris_xlsx(path, sheet)
+
+    try:
+        header = next(rows, None)
+        if header is None:
+            raise ValueError(f"{path.name} kosong (tidak ada header).")
+        posisi: dict[str, int] = {}
+        for i, h in enumerate(header):
+            nama = _teks(h).lower()
+            if nama and nama not in posisi:
+                posisi[nama] = i
+        kurang = [k for k in wajib if k not in posisi]
+        if kurang:
+            raise KolomKurang(path.name, kurang)
+
+        yield list(posisi)
+
+        kolom = list(posisi.items())
+        for baris, values in enumerate(rows, start=2):
+            n = len(values)
+            row = {k: _teks(values[i]) if i < n else "" for k, i in kolom}
+            if any(row.values()):
+                yield baris, row
+    finally:
+        rows.close()
+
+
+def baca_kolom(
+    path: Path,
+    sheet: str | None = None,
+    wajib: tuple[str, ...] = (),
+) -> tuple[list[int], dict[str, list[str]]]:
+    """
+    Seluruh tabel dalam bentuk kolom: (nomor_baris, {kolom: [nilai, ...]}).
+    Satu list str per kolom jauh lebih hemat daripada satu dict per baris.
+    """
+    it = _tabel(Path(path), sheet, wajib)
+    kolom: dict[str, list[str]] = {k: [] for k in next(it)}
+    isi = list(kolom.items())
+    nomor: list[int] = []
+    for baris, row in it:
+        nomor.append(baris)
+        for k, nilai in isi:
+            nilai.append(row[k])
+    return nomor, kolom
@@ -0,0 +1,214 @@
+# core/template_cache.py
+from __future__ import annotations
+
+import copy
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+from core.profiling import span
+
+if TYPE_CHECKING:
+    from docxtpl import DocxTemplate
+    from jinja2 import Environment
+
+
+@dataclass(frozen=True)
+class _Kunci:
+    path: str
+    mtime_ns: int
+    size: int
+
+
+@dataclass
+class _Entri:
+    kunci: _Kunci
+    blob: bytes  # isi file .docx mentah
+    digest: str  # sha256 blob, dipakai manifest output
+    docx: Any  # docx.Document hasil parse (prototype, tidak pernah di-render)
+    xml_body: str  # body prototype sebagai string, input patch_xml
+    env: Any  # Environment Jinja versi file ini, hasil compile di-cache
+    patch_xml: Callable[[str], str]  # patch_xml docxtpl dengan memo per sumber
+    variabel: frozenset[str] | None = None  # diisi saat pertama diminta
+
+
+def _jinja_sekali() -> Environment:
+    """
+    Environment Jinja yang meng-cache from_string per sumber: docxtpl memanggil
+    from_string tiap render, di sini sumber yang sama hanya di-compile sekali.
+    """
+    from jinja2 import Environment
+
+    class _Env(Environment):
+        def __init__(self):
+            super().__init__()
+            self._compiled: dict[str, Any] = {}
+
+        def from_string(self, source, *args, **kwargs):
+            t = self._compiled.get(source)
+            if t is None:
+                t = super().from_string(source, *args, **kwargs)
+                self._compiled[source] = t
+            return t
+
+    return _Env()
+
+
+def _patch_sekali(proto: DocxTemplate) -> Callable[[str], str]:
+    """
+    patch_xml (belasan regex) hanya bergantung pada string input, jadi hasilnya
+    aman di-memo per sumber (body, header, footer, footnote).
+    """
+    hasil: dict[str, str] = {}
+
+    def patch_xml(src_xml: str) -> str:
+        patched = hasil.get(src_xml)
+        if patched is None:
+            patched = proto.patch_xml(src_xml)
+            hasil[src_xml] = patched
+        return patched
+
+    return patch_xml
+
+
+class TemplateCache:
+    """
+    Cache template .docx yang sudah di-parse.
+
+    - key: path absolut + mtime + size (file berubah -> otomatis parse ulang)
+    - eviction LRU, ukuran maksimum bisa diatur
+    - get() selalu mengembalikan DocxTemplate baru (salinan), aman di-render
+    - XML hasil patch_xml dan template Jinja hasil compile ikut di-cache per
+      versi file: render dengan get_env() tidak mengulang keduanya
+    """
+
+    def __init__(self, maxsize: int = 8):
+        if maxsize < 1:
+            raise ValueError("maxsize minimal 1")
+        self._maxsize = maxsize
+        self._entries: OrderedDict[str, _Entri] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    def set_maxsize(self, maxsize: int) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize minimal 1")
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, template_path: Path) -> DocxTemplate:
+        """
+        DocxTemplate siap render (sekali). Prototype di cache tidak ikut berubah.
+        """
+        from docxtpl import DocxTemplate
+
+        entri = self._entri(template_path)
+        tpl = DocxTemplate(io.BytesIO(entri.blob))
+        # docxtpl hanya memuat ulang file kalau .docx belum ada / sudah di-render,
+        # jadi salinan prototype ini yang dipakai saat render().
+        tpl.docx = copy.deepcopy(entri.docx)
+        # body salinan = body prototype sampai di-render: tidak perlu serialisasi
+        # dan patch ulang
+        tpl.get_xml = lambda: entri.xml_body
+        tpl.patch_xml = entri.patch_xml
+        return tpl
+
+    def get_env(self, template_path: Path) -> Environment:
+        """
+        Environment Jinja untuk render(context, env): sumber yang sama hanya
+        di-compile sekali per versi file.
+        """
+        return self._entri(template_path).env
+
+    def get_bytes(self, template_path: Path) -> bytes:
+        return self._entri(template_path).blob
+
+    def get_digest(self, template_path: Path) -> str:
+        return self._entri(template_path).digest
+
+    def get_variabel(self, template_path: Path) -> frozenset[str]:
+        """
+        Nama variabel Jinja yang dipakai template (body, header, footer).
+        Dihitung sekali per versi file, lalu ikut di-cache.
+        """
+        from docxtpl import DocxTemplate
+
+        entri = self._entri(template_path)
+        if entri.variabel is None:
+            with span("template_schema"):
+                # instance terpisah: prototype di cache tidak boleh tersentuh
+                tpl = DocxTemplate(io.BytesIO(entri.blob))
+                entri.variabel = frozenset(tpl.get_undeclared_template_variables())
+        return entri.variabel
+
+    # ---------- internal ----------
+    def _kunci(self, template_path: Path) -> _Kunci:
+        p = Path(template_path).resolve()
+        st = p.stat()
+        return _Kunci(path=str(p), mtime_ns=st.st_mtime_ns, size=st.st_size)
+
+    def _entri(self, template_path: Path) -> _Entri:
+        kunci = self._kunci(template_path)
+
+        with self._lock:
+            entri = self._entries.get(kunci.path)
+            if entri is not None and entri.kunci == kunci:
+                self._entries.move_to_end(kunci.path)
+                self.hits += 1
+                return entri
+
+        from docxtpl import DocxTemplate
+
+        # parse di luar lock supaya thread lain tidak menunggu
+        with span("template_parse"):
+            blob = Path(kunci.path).read_bytes()
+            proto = DocxTemplate(io.BytesIO(blob))
+            proto.init_docx()
+            xml_body = proto.get_xml()
+        entri = _Entri(
+            kunci=kunci,
+            blob=blob,
+            digest=hashlib.sha256(blob).hexdigest(),
+            docx=proto.docx,
+            xml_body=xml_body,
+            env=_jinja_sekali(),
+            patch_xml=_patch_sekali(proto),
+        )
+
+        with self._lock:
+            self.misses += 1
+            self._entries[kunci.path] = entri
+            self._entries.move_to_end(kunci.path)
+            self._evict()
+        return entri
+
+    def _evict(self) -> None:
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+
+# cache default yang dipakai generate_docx
+template_cache = TemplateCache()
+
+
+def configure_template_cache(maxsize: int) -> None:
+    template_cache.set_maxsize(maxsize)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
+from typing import Mapping, Sequence
 
 
 @dataclass
@@ -12,53 +14,189 @@ class FormData:
     hari: str
     jam_mulai: str  # "HH:mm"
     jam_selesai: str  # "HH:mm"
+    # dosen = Dosen.id ("" kalau belum dipilih)
     pembimbing_1: str
     pembimbing_2: str
     penguji_1: str
     penguji_2: str
 
 
+_RE_HHMM = re.compile(r"\s*([+-]?\d+)\s*:\s*([+-]?\d+)\s*")
+
+
 def _parse_hhmm(t: str) -> tuple[int, int] | None:
     """
     Parse 'HH:mm' -> (HH, mm). Return None kalau format tidak valid.
     """
-    try:
-        hh, mm = t.split(":")
-        return int(hh), int(mm)
-    except Exception:
+    m = _RE_HHMM.fullmatch(t)
+    if not m:
         return None
+    return int(m.group(1)), int(m.group(2))
 
 
-def validate_form(d: FormData) -> tuple[bool, str]:
-    # basic
-    if not d.nama_mahasiswa.strip():
-        return False, "Nama mahasiswa wajib diisi."
-    if not d.npm.strip():
-        return False, "NPM wajib diisi."
-    if not d.judul_skripsi.strip():
-        return False, "Judul skripsi wajib diisi."
-    if not d.hari.strip():
-        return False, "Hari wajib terisi (auto dari tanggal, tapi jangan kosong)."
-
-    # dosen
-    if not d.pembimbing_1.strip():
-        return False, "Pembimbing 1 wajib dipilih."
-    if not d.penguji_1.strip() or not d.penguji_2.strip():
-        return False, "Penguji 1 dan Penguji 2 wajib dipilih."
-    if d.penguji_1.strip() == d.penguji_2.strip():
-        return False, "Penguji 1 dan Penguji 2 tidak boleh orang yang sama."
-    if d.pembimbing_2.strip() and d.pembimbing_2.strip() == d.pembimbing_1.strip():
-        return False, "Pembimbing 2 tidak boleh sama dengan Pembimbing 1."
-
-    # waktu
-    a = _parse_hhmm(d.jam_mulai.strip())
-    b = _parse_hhmm(d.jam_selesai.strip())
-    if not a or not b:
-        return False, "Format jam harus HH:mm (contoh 09:30)."
-
-    if (b[0], b[1]) <= (a[0], a[1]):
-        return False, "Jam selesai harus lebih besar dari jam mulai."
+def jam_ke_menit(t: str) -> int | None:
+    """
+    'HH:mm' -> menit sejak 00:00 (untuk cek bentrok). None kalau tidak valid.
+    """
+    hm = _parse_hhmm(t.strip())
+    if hm is None:
+        return None
+    return hm[0] * 60 + hm[1]
+
+
+# ---------- Validasi per kolom (seluruh roster sekaligus) ----------
+# Kolom yang dibaca engine. Nilai dosen = Dosen.id, baik dari form maupun
+# roster: dua dosen berbeda bisa bernama sama, jadi nama tidak boleh dipakai
+# untuk cek "orang yang sama".
+KOLOM_FORM = (
+    "nama_mahasiswa",
+    "npm",
+    "judul_skripsi",
+    "hari",
+    "jam_mulai",
+    "jam_selesai",
+    "pembimbing_1",
+    "pembimbing_2",
+    "penguji_1",
+    "penguji_2",
+)
+
+
+@dataclass(frozen=True)
+class Pelanggaran:
+    baris: int
+    kolom: str
+    pesan: str
+
+
+def _kolom(data: Mapping[str, Sequence], nama: str, n: int) -> list[str]:
+    if nama not in data:
+        return [""] * n
+    return list(map(str.strip, map(str, data[nama])))
+
+
+def _kolom_jam(nilai: list[str]) -> list[tuple[int, int] | None]:
+    # jam di roster sangat berulang (slot sesi): parse tiap nilai unik sekali
+    unik = {v: _parse_hhmm(v) for v in set(nilai)}
+    return list(map(unik.__getitem__, nilai))
+
+
+def _wajib(kolom: str, pesan: str):
+    def aturan(c: dict[str, list[str]]) -> list[int]:
+        return [i for i, v in enumerate(c[kolom]) if not v]
+
+    return kolom, pesan, aturan
+
+
+def _penguji_wajib(c):
+    return [
+        i
+        for i, (a, b) in enumerate(zip(c["penguji_1"], c["penguji_2"]))
+        if not a or not b
+    ]
+
+
+def _penguji_sama(c):
+    return [
+        i
+        for i, (a, b) in enumerate(zip(c["penguji_1"], c["penguji_2"]))
+        if a and a == b
+    ]
 
+
+def _pembimbing_sama(c):
+    return [
+        i
+        for i, (a, b) in enumerate(zip(c["pembimbing_1"], c["pembimbing_2"]))
+        if b and a == b
+    ]
+
+
+def _jam_format(c):
+    return [
+        i
+        for i, (a, b) in enumerate(zip(c["_mulai"], c["_selesai"]))
+        if a is None or b is None
+    ]
+
+
+def _jam_urutan(c):
+    return [
+        i
+        for i, (a, b) in enumerate(zip(c["_mulai"], c["_selesai"]))
+        if a is not None and b is not None and b <= a
+    ]
+
+
+# urutan = urutan pengecekan validate_form (pesan pertama per baris sama persis)
+_ATURAN = (
+    _wajib("nama_mahasiswa", "Nama mahasiswa wajib diisi."),
+    _wajib("npm", "NPM wajib diisi."),
+    _wajib("judul_skripsi", "Judul skripsi wajib diisi."),
+    _wajib("hari", "Hari wajib terisi (auto dari tanggal, tapi jangan kosong)."),
+    _wajib("pembimbing_1", "Pembimbing 1 wajib dipilih."),
+    ("penguji", "Penguji 1 dan Penguji 2 wajib dipilih.", _penguji_wajib),
+    (
+        "penguji_2",
+        "Penguji 1 dan Penguji 2 tidak boleh orang yang sama.",
+        _penguji_sama,
+    ),
+    (
+        "pembimbing_2",
+        "Pembimbing 2 tidak boleh sama dengan Pembimbing 1.",
+        _pembimbing_sama,
+    ),
+    ("jam", "Format jam harus HH:mm (contoh 09:30).", _jam_format),
+    ("jam_selesai", "Jam selesai harus lebih besar dari jam mulai.", _jam_urutan),
+)
+
+
+def validasi_kolom(
+    data: Mapping[str, Sequence],
+    baris: Sequence[int] | None = None,
+    semua: bool = True,
+) -> list[Pelanggaran]:
+    """
+    Validasi banyak ujian sekaligus, per kolom (bukan per baris).
+
+    data: {nama_kolom: nilai per baris} (dict of list, DataFrame, ...), kolom
+    seperti KOLOM_FORM; kolom yang tidak ada dianggap kosong.
+    baris: nomor baris untuk laporan (default 0..n-1).
+    semua: True -> semua pelanggaran tiap baris; False -> hanya yang pertama
+    (sama dengan validate_form).
+
+    Hasil urut per baris, lalu per urutan aturan.
+    """
+    n = max((len(data[k]) for k in KOLOM_FORM if k in data), default=0)
+    c = {k: _kolom(data, k, n) for k in KOLOM_FORM}
+    c["_mulai"] = _kolom_jam(c["jam_mulai"])
+    c["_selesai"] = _kolom_jam(c["jam_selesai"])
+    nomor = list(baris) if baris is not None else list(range(n))
+
+    temuan: list[tuple[int, int]] = []  # (index baris, index aturan)
+    for r, (_, _, aturan) in enumerate(_ATURAN):
+        temuan.extend((i, r) for i in aturan(c))
+    temuan.sort()
+
+    hasil = []
+    terakhir = -1
+    for i, r in temuan:
+        if not semua and i == terakhir:
+            continue
+        terakhir = i
+        kolom, pesan, _ = _ATURAN[r]
+        hasil.append(Pelanggaran(baris=nomor[i], kolom=kolom, pesan=pesan))
+    return hasil
+
+
+def validate_form(d: FormData) -> tuple[bool, str]:
+    """
+    Validasi satu form: pembungkus validasi_kolom dengan satu baris.
+    """
+    data = {k: (getattr(d, k),) for k in KOLOM_FORM}
+    pelanggaran = validasi_kolom(data, semua=False)
+    if pelanggaran:
+        return False, pelanggaran[0].pesan
     return True, ""
 
 
@@ -1,6 +1,27 @@
+import hashlib
+import io
+import json
+import os
 import re
+import threading
+import zipfile
 from pathlib import Path
-from docxtpl import DocxTemplate
+from typing import TYPE_CHECKING, BinaryIO
+
+from core.output_writer import tulis_atomik
+from core.profiling import span
+from core.template_cache import TemplateCache, template_cache
+
+if TYPE_CHECKING:
+    from core.output_writer import OutputWriter
+
+MANIFEST_NAME = ".manifest.json"
+# naikkan kalau cara render / normalisasi berubah: semua manifest lama jadi basi
+RENDER_VERSION = 1
+# timestamp tetap untuk semua entry zip (nilai minimum format zip)
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+_manifest_lock = threading.Lock()
 
 
 def sanitize_filename(text: str) -> str:
@@ -9,6 +30,165 @@ def sanitize_filename(text: str) -> str:
     return text
 
 
+def output_relpath(
+    nama_mahasiswa: str, npm: str, output_filename: str | None = None
+) -> Path:
+    """
+    Lokasi output relatif terhadap output_root: Nama_NPM / <filename>.docx
+    """
+    nama = sanitize_filename(nama_mahasiswa)
+    npm_clean = sanitize_filename(npm)
+
+    if output_filename:
+        filename = sanitize_filename(output_filename)
+    else:
+        filename = f"Berita Acara dan Nilai Ujian Skripsi_{nama}_{npm_clean}"
+
+    return Path(f"{nama}_{npm_clean}") / f"{filename}.docx"
+
+
+def render_docx_to(
+    template_path: Path,
+    context: dict,
+    fileobj: BinaryIO,
+    cache: TemplateCache | None = None,
+) -> None:
+    """
+    Render template ke file-like object (BytesIO, entry zip, socket, ...).
+    """
+    if not template_path.exists():
+        raise FileNotFoundError(f"Template tidak ditemukan: {template_path}")
+
+    cache = cache or template_cache
+    with span("template"):
+        doc = cache.get(template_path)
+        env = cache.get_env(template_path)
+    with span("render"):
+        doc.render(context, env)
+    with span("save"):
+        buf = io.BytesIO()
+        doc.save(buf)
+        data = normalisasi_zip(buf.getvalue())
+    fileobj.write(data)
+
+
+def render_docx(
+    template_path: Path, context: dict, cache: TemplateCache | None = None
+) -> bytes:
+    """
+    Render template ke memori, tanpa menyentuh disk. Return isi .docx.
+    """
+    buf = io.BytesIO()
+    render_docx_to(template_path, context, buf, cache)
+    return buf.getvalue()
+
+
+def normalisasi_zip(data: bytes) -> bytes:
+    """
+    Tulis ulang zip (.docx) supaya deterministik: [Content_Types].xml di depan,
+    entry lain sesuai urutan asli, timestamp & atribut tetap.
+    Input sama -> bytes sama.
+    """
+    out = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(data)) as src, zipfile.ZipFile(out, "w") as dst:
+        infos = sorted(
+            src.infolist(), key=lambda i: i.filename != "[Content_Types].xml"
+        )
+        for info in infos:
+            baru = zipfile.ZipInfo(info.filename, date_time=ZIP_EPOCH)
+            baru.compress_type = info.compress_type
+            baru.external_attr = 0o644 << 16
+            dst.writestr(baru, src.read(info))
+    return out.getvalue()
+
+
+def render_hash(
+    template_path: Path, context: dict, cache: TemplateCache | None = None
+) -> str:
+    """
+    Hash isi template + context. Sama -> hasil render pasti sama.
+    """
+    ctx = json.dumps(context, sort_keys=True, ensure_ascii=False, default=str)
+    h = hashlib.sha256()
+    h.update(f"v{RENDER_VERSION}\0".encode())
+    h.update((cache or template_cache).get_digest(template_path).encode())
+    h.update(b"\0")
+    h.update(ctx.encode("utf-8"))
+    return h.hexdigest()
+
+
+# ---------- Manifest ----------
+def _baca_manifest(folder: Path) -> dict:
+    try:
+        data = json.loads((folder / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _tulis_manifest(folder: Path, manifest: dict) -> None:
+    """
+    Best effort: manifest hilang/gagal ditulis hanya berarti render ulang.
+    """
+    target = folder / MANIFEST_NAME
+    tmp = target.with_name(f"{MANIFEST_NAME}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(
+            json.dumps(manifest, ensure_ascii=False, indent=1, sort_keys=True),
+            encoding="utf-8",
+        )
+        os.replace(tmp, target)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
+def _masih_sama(out_file: Path, entri: dict | None, digest: str) -> bool:
+    if not entri or entri.get("hash") != digest:
+        return False
+    try:
+        st = out_file.stat()
+    except OSError:
+        return False
+    # file diedit / ditimpa manual -> render ulang
+    return (
+        st.st_size == entri.get("size")
+        and st.st_mtime_ns == entri.get("mtime_ns")
+    )
+
+
+def cek_manifest(
+    template_path: Path,
+    out_file: Path,
+    context: dict,
+    cache: TemplateCache | None = None,
+) -> tuple[str, bool]:
+    """
+    (hash render, True kalau out_file masih hasil render yang sama persis).
+    """
+    with span("manifest"):
+        digest = render_hash(template_path, context, cache)
+        with _manifest_lock:
+            entri = _baca_manifest(out_file.parent).get(out_file.name)
+    return digest, _masih_sama(out_file, entri, digest)
+
+
+def catat_manifest(
+    out_file: Path, digest: str, size: int | None = None, mtime_ns: int | None = None
+) -> None:
+    """
+    Catat hash render out_file. size / mtime_ns boleh diberikan kalau file
+    ditulis proses lain dan stat-nya sudah diketahui.
+    """
+    if size is None or mtime_ns is None:
+        st = out_file.stat()
+        size, mtime_ns = st.st_size, st.st_mtime_ns
+    folder = out_file.parent
+    with span("manifest"), _manifest_lock:
+        manifest = _baca_manifest(folder)
+        manifest[out_file.name] = {"hash": digest, "size": size, "mtime_ns": mtime_ns}
+        _tulis_manifest(folder, manifest)
+
+
 def generate_docx(
     template_path: Path,
     output_root: Path,
@@ -16,6 +196,9 @@ def generate_docx(
     npm: str,
     context: dict,
     output_filename: str | None = None,
+    cache: TemplateCache | None = None,
+    force: bool = False,
+    writer: "OutputWriter | None" = None,
 ) -> Path:
     """
     Render template docx dengan context.
@@ -28,24 +211,36 @@ def generate_docx(
 
     Output disimpan ke:
     output_root / Nama_NPM / <filename>
-    """
-    if not template_path.exists():
-        raise FileNotFoundError(f"Template tidak ditemukan: {template_path}")
 
-    nama = sanitize_filename(nama_mahasiswa)
-    npm_clean = sanitize_filename(npm)
+    Template diambil dari cache (default: template_cache), jadi file .docx
+    hanya di-parse ulang kalau berubah di disk.
 
-    out_dir = Path(output_root) / f"{nama}_{npm_clean}"
-    out_dir.mkdir(parents=True, exist_ok=True)
+    Hash (template + context) dicatat di Nama_NPM/.manifest.json. Kalau hash
+    sama dan file output belum disentuh, render dilewati (kecuali force=True).
 
-    if output_filename:
-        filename = sanitize_filename(output_filename)
-    else:
-        filename = f"Berita Acara dan Nilai Ujian Skripsi_{nama}_{npm_clean}"
+    File ditulis atomik (tmp + rename). Dengan writer, penulisan diserahkan ke
+    thread I/O OutputWriter dan fungsi ini kembali sebelum file ada di disk.
+    """
+    if not template_path.exists():
+        raise FileNotFoundError(f"Template tidak ditemukan: {template_path}")
 
-    out_file = out_dir / f"{filename}.docx"
+    out_file = Path(output_root) / output_relpath(
+        nama_mahasiswa, npm, output_filename
+    )
+    digest, sama = cek_manifest(template_path, out_file, context, cache)
+    if sama and not force:
+        return out_file
 
-    doc = DocxTemplate(str(template_path))
-    doc.render(context)
-    doc.save(str(out_file))
+    # render dulu ke memori: kalau render gagal, tidak ada file kosong tertinggal
+    data = render_docx(template_path, context, cache)
+    if writer is not None:
+        writer.tulis(
+            out_file,
+            data,
+            lambda st: catat_manifest(out_file, digest, st.st_size, st.st_mtime_ns),
+        )
+        return out_file
+    with span("write"):
+        st = tulis_atomik(out_file, data)
+    catat_manifest(out_file, digest, st.st_size, st.st_mtime_ns)
     return out_file
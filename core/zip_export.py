@@ -0,0 +1,91 @@
+# core/zip_export.py
+from __future__ import annotations
+
+import os
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO
+
+from core.profiling import span
+from core.word_generator import ZIP_EPOCH, render_docx
+
+
+class DocxZipWriter:
+    """
+    Tulis banyak dokumen hasil render langsung ke satu file .zip.
+
+    Setiap dokumen di-render ke memori lalu dimasukkan sebagai satu entry,
+    tanpa file sementara per dokumen. Isi .docx sendiri sudah terkompresi,
+    jadi default-nya ZIP_STORED (tidak dikompres ulang).
+
+    Kalau target berupa path, zip ditulis ke <target>.tmp dan baru di-rename
+    saat close() berhasil, jadi tidak ada zip setengah jadi di folder output.
+    Timestamp entry tetap (ZIP_EPOCH): roster sama -> zip sama persis.
+    """
+
+    def __init__(
+        self,
+        target: Path | BinaryIO,
+        compression: int = zipfile.ZIP_STORED,
+    ):
+        self._target_path: Path | None = None
+        self._tmp_path: Path | None = None
+        if isinstance(target, (str, os.PathLike)):
+            self._target_path = Path(target)
+            self._target_path.parent.mkdir(parents=True, exist_ok=True)
+            self._tmp_path = self._target_path.with_name(
+                self._target_path.name + ".tmp"
+            )
+            fileobj: str | BinaryIO = str(self._tmp_path)
+        else:
+            fileobj = target
+        self._zip = zipfile.ZipFile(fileobj, "w", compression=compression)
+        self._names: set[str] = set()
+        self.count = 0
+
+    def add_bytes(self, arcname: str | Path, data: bytes) -> str:
+        name = self._unik(PurePosixPath(*Path(arcname).parts).as_posix())
+        info = zipfile.ZipInfo(name, date_time=ZIP_EPOCH)
+        info.compress_type = self._zip.compression
+        with span("zip_write"):
+            self._zip.writestr(info, data)
+        self.count += 1
+        return name
+
+    def add(self, arcname: str | Path, template_path: Path, context: dict) -> str:
+        """
+        Render template dan simpan sebagai entry `arcname`. Return nama entry.
+        """
+        return self.add_bytes(arcname, render_docx(template_path, context))
+
+    def close(self) -> None:
+        self._zip.close()
+        if self._tmp_path is not None and self._target_path is not None:
+            os.replace(self._tmp_path, self._target_path)
+
+    def abort(self) -> None:
+        self._zip.close()
+        if self._tmp_path is not None:
+            self._tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> DocxZipWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _unik(self, name: str) -> str:
+        # nama entry ganda (mis. mahasiswa sama di dua baris) diberi akhiran
+        if name not in self._names:
+            self._names.add(name)
+            return name
+        stem, dot, ext = name.rpartition(".")
+        n = 2
+        while f"{stem} ({n}){dot}{ext}" in self._names:
+            n += 1
+        unik = f"{stem} ({n}){dot}{ext}"
+        self._names.add(unik)
+        return unik
@@ -1,11 +1,25 @@
+import multiprocessing
 import sys
-from PySide6.QtWidgets import QApplication
-from ui_main import MainWindow
+import time
 
 
 def main():
+    t_launch = time.perf_counter()
+    # EXE (PyInstaller): proses render worker menjalankan exe yang sama; tanpa
+    # ini argumen --multiprocessing-fork dianggap perintah CLI
+    multiprocessing.freeze_support()
+
+    # ada argumen -> mode CLI (tanpa Qt), contoh: main.py ba --json ujian.json
+    if len(sys.argv) > 1:
+        from core.cli import main as cli_main
+
+        sys.exit(cli_main(sys.argv[1:]))
+
+    from PySide6.QtWidgets import QApplication
+    from ui_main import MainWindow
+
     app = QApplication(sys.argv)
-    w = MainWindow()
+    w = MainWindow(t_launch=t_launch)
     w.show()
     sys.exit(app.exec())
 
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QComboBox,
+    QDialog,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+
+from core.arsip import Arsip, Rekaman
+from core.dokumen import JENIS_BERITA_ACARA, JENIS_NOTA_DINAS
+from core.excel_loader import DosenRegistry
+
+_KOLOM = ("Tanggal", "Dokumen", "NPM", "Nama", "Ujian ke-", "ID ND", "Output")
+_CARI_PER = ("NPM", "Dosen", "ID ND")
+_NAMA_JENIS = {JENIS_BERITA_ACARA: "Berita Acara", JENIS_NOTA_DINAS: "Nota Dinas"}
+
+
+class RiwayatDialog(QDialog):
+    """
+    Cari ujian yang pernah di-generate (arsip), lalu muat ke form atau
+    generate ulang dari context yang tersimpan.
+    """
+
+    muat = Signal(object)  # Rekaman
+    ulang = Signal(object)  # Rekaman
+
+    def __init__(self, arsip: Arsip, dosen_by_id: DosenRegistry, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Riwayat Ujian")
+        self.resize(860, 480)
+        self._arsip = arsip
+        self._dosen_by_id = dosen_by_id
+        self._hasil: list[Rekaman] = []
+
+        self.cb_per = QComboBox()
+        self.cb_per.addItems(_CARI_PER)
+        self.in_cari = QLineEdit()
+        self.in_cari.setPlaceholderText("NPM / id dosen / ID ND (kosong = terbaru)")
+        self.in_cari.returnPressed.connect(self.cari)
+        btn_cari = QPushButton("Cari")
+        btn_cari.clicked.connect(self.cari)
+
+        row_cari = QHBoxLayout()
+        row_cari.addWidget(self.cb_per)
+        row_cari.addWidget(self.in_cari, 1)
+        row_cari.addWidget(btn_cari)
+
+        self.tabel = QTableWidget(0, len(_KOLOM))
+        self.tabel.setHorizontalHeaderLabels(_KOLOM)
+        self.tabel.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tabel.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.tabel.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.tabel.horizontalHeader().setStretchLastSection(True)
+        self.tabel.verticalHeader().hide()
+        self.tabel.itemSelectionChanged.connect(self._on_pilih)
+        self.tabel.doubleClicked.connect(lambda _: self._kirim(self.muat))
+
+        self.lbl_info = QLabel("")
+        self.btn_muat = QPushButton("Muat ke Form")
+        self.btn_ulang = QPushButton("Generate Ulang")
+        self.btn_muat.clicked.connect(lambda: self._kirim(self.muat))
+        self.btn_ulang.clicked.connect(lambda: self._kirim(self.ulang))
+        btn_tutup = QPushButton("Tutup")
+        btn_tutup.clicked.connect(self.reject)
+
+        row_btn = QHBoxLayout()
+        row_btn.addWidget(self.lbl_info, 1)
+        row_btn.addWidget(self.btn_muat)
+        row_btn.addWidget(self.btn_ulang)
+        row_btn.addWidget(btn_tutup)
+
+        lay = QVBoxLayout(self)
+        lay.addLayout(row_cari)
+        lay.addWidget(self.tabel, 1)
+        lay.addLayout(row_btn)
+
+        self._on_pilih()
+        self.cari()
+
+    def cari(self):
+        teks = self.in_cari.text().strip()
+        per = self.cb_per.currentText()
+        if not teks:
+            hasil = self._arsip.cari()
+        elif per == "NPM":
+            hasil = self._arsip.cari(npm=teks)
+        elif per == "ID ND":
+            hasil = self._arsip.cari(id_nd=teks)
+        else:
+            d = self._dosen_by_id.get(teks) or self._dosen_by_id.dari_display(teks)
+            hasil = self._arsip.cari(dosen_id=d.id if d else teks)
+        self._tampilkan(hasil)
+
+    def _tampilkan(self, hasil: list[Rekaman]):
+        self._hasil = hasil
+        self.tabel.setRowCount(len(hasil))
+        for r, rek in enumerate(hasil):
+            isi = (
+                rek.tanggal.isoformat(),
+                _NAMA_JENIS.get(rek.jenis, rek.jenis),
+                rek.npm,
+                rek.nama_mahasiswa,
+                str(rek.urutan),
+                rek.id_nd,
+                rek.output,
+            )
+            for c, teks in enumerate(isi):
+                item = QTableWidgetItem(teks)
+                if c == len(isi) - 1:
+                    item.setToolTip(teks)
+                self.tabel.setItem(r, c, item)
+        self.tabel.resizeColumnsToContents()
+        self.lbl_info.setText(f"{len(hasil)} dokumen")
+
+    def _terpilih(self) -> Rekaman | None:
+        baris = self.tabel.currentRow()
+        if 0 <= baris < len(self._hasil) and self.tabel.selectedItems():
+            return self._hasil[baris]
+        return None
+
+    def _on_pilih(self):
+        ada = self._terpilih() is not None
+        self.btn_muat.setEnabled(ada)
+        self.btn_ulang.setEnabled(ada)
+
+    def _kirim(self, sinyal):
+        rek = self._terpilih()
+        if rek is None:
+            return
+        sinyal.emit(rek)
+        if sinyal is self.muat:
+            self.accept()
+
+
+def tampilkan_riwayat(
+    arsip: Arsip, dosen_by_id: DosenRegistry, parent, on_muat, on_ulang
+) -> RiwayatDialog:
+    dlg = RiwayatDialog(arsip, dosen_by_id, parent)
+    dlg.muat.connect(on_muat)
+    dlg.ulang.connect(on_ulang)
+    dlg.setAttribute(Qt.WA_DeleteOnClose)
+    dlg.show()
+    return dlg
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+from PySide6.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QStringListModel,
+    Qt,
+)
+from PySide6.QtWidgets import QComboBox, QCompleter
+
+from core.dosen_search import DosenIndex
+from core.excel_loader import Dosen, display_dosen
+
+ID_ROLE = Qt.UserRole + 1
+
+
+class DosenListModel(QAbstractListModel):
+    """
+    Satu model roster yang dipakai bersama oleh keempat combo dosen.
+
+    Baris 0 selalu kosong (combo belum dipilih), baris berikutnya dosen sesuai
+    urutan yang diberikan. Teks tampilan dihitung saat diminta view, tidak
+    disimpan per baris.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._dosen: Sequence[Dosen] = ()
+        self._baris_by_id: dict[str, int] = {}
+
+    def set_dosen(self, dosen: Sequence[Dosen]):
+        """
+        Ganti seluruh isi model: satu reset untuk semua combo.
+        """
+        self.beginResetModel()
+        self._dosen = dosen
+        self._baris_by_id = {d.id: i + 1 for i, d in enumerate(dosen)}
+        self.endResetModel()
+
+    def perbarui(self, dosen: Sequence[Dosen]):
+        """
+        Ubah isi model menjadi `dosen` lewat remove / dataChanged / move /
+        insert seperlunya, tanpa reset. Combo menyimpan pilihannya sebagai
+        persistent index, jadi pilihan yang dosennya masih ada tidak hilang.
+        """
+        root = QModelIndex()
+        lama = self._dosen = list(self._dosen)
+        baru_by_id = {d.id: d for d in dosen}
+
+        # 1. hapus dosen yang tidak ada lagi (dari belakang, per blok)
+        i = len(lama)
+        while i > 0:
+            i -= 1
+            if lama[i].id in baru_by_id:
+                continue
+            j = i
+            while j > 0 and lama[j - 1].id not in baru_by_id:
+                j -= 1
+            self.beginRemoveRows(root, j + 1, i + 1)
+            del lama[j : i + 1]
+            self.endRemoveRows()
+            i = j
+
+        # 2. nama / jenis_id berubah: ganti isi baris
+        for r, d in enumerate(lama):
+            b = baru_by_id[d.id]
+            if b != d:
+                lama[r] = b
+                idx = self.index(r + 1)
+                self.dataChanged.emit(idx, idx)
+
+        # 3. urutkan ulang; hanya baris yang teksnya berubah yang pindah
+        sisa = {d.id for d in lama}
+        target = [d.id for d in dosen if d.id in sisa]
+        for r, dosen_id in enumerate(target):
+            if lama[r].id == dosen_id:
+                continue
+            src = next(k for k in range(r + 1, len(lama)) if lama[k].id == dosen_id)
+            self.beginMoveRows(root, src + 1, src + 1, root, r + 1)
+            lama.insert(r, lama.pop(src))
+            self.endMoveRows()
+
+        # 4. sisipkan dosen baru di posisinya (per blok)
+        r = 0
+        while r < len(dosen):
+            if r < len(lama) and lama[r].id == dosen[r].id:
+                r += 1
+                continue
+            k = r
+            while k < len(dosen) and dosen[k].id not in sisa:
+                k += 1
+            self.beginInsertRows(root, r + 1, k)
+            lama[r:r] = dosen[r:k]
+            self.endInsertRows()
+            r = k
+
+        self._baris_by_id = {d.id: i + 1 for i, d in enumerate(lama)}
+
+    def dosen_di(self, row: int) -> Dosen | None:
+        if 1 <= row <= len(self._dosen):
+            return self._dosen[row - 1]
+        return None
+
+    def baris_id(self, dosen_id: str | None) -> int:
+        if not dosen_id:
+            return -1
+        return self._baris_by_id.get(dosen_id, -1)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._dosen) + 1
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        d = self.dosen_di(index.row())
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return display_dosen(d) if d else ""
+        if role == ID_ROLE:
+            return d.id if d else ""
+        return None
+
+
+class DosenCompleter(QCompleter):
+    """
+    Completer untuk combo dosen: isi popup diambil dari DosenIndex (token,
+    prefix, tanpa gelar/diakritik), bukan filter substring bawaan QCompleter.
+    """
+
+    def __init__(self, combo: QComboBox, limit: int = 50):
+        super().__init__(combo)
+        self._combo = combo
+        self._limit = limit
+        self._index: DosenIndex | None = None
+        self._model = QStringListModel(self)
+
+        self.setModel(self._model)
+        self.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.setCaseSensitivity(Qt.CaseInsensitive)
+        combo.setCompleter(self)
+        combo.lineEdit().textEdited.connect(self._on_text_edited)
+
+    def set_index(self, index: DosenIndex | None):
+        self._index = index
+        self._model.setStringList([])
+
+    def _on_text_edited(self, text: str):
+        if self._index is None or not text.strip():
+            self._model.setStringList([])
+            return
+        hasil = self._index.cari(text, self._limit)
+        self._model.setStringList([display_dosen(d) for d in hasil])
+        if hasil:
+            self.complete()
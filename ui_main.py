@@ -1,8 +1,20 @@
 from __future__ import annotations
 
+import time
+from collections import deque
+from datetime import date
 from pathlib import Path
-
-from PySide6.QtCore import Qt, QDate, QUrl, QTime
+from typing import Callable, Sequence
+
+from PySide6.QtCore import (
+    Qt,
+    QDate,
+    QUrl,
+    QTime,
+    QThreadPool,
+    QTimer,
+    QFileSystemWatcher,
+)
 from PySide6.QtGui import QFont, QDesktopServices
 from PySide6.QtWidgets import (
     QWidget,
@@ -21,30 +33,60 @@ from PySide6.QtWidgets import (
     QTimeEdit,
     QSpinBox,
     QFrame,
-    QCompleter,
     QSizePolicy,
     QScrollArea,
+    QProgressBar,
+    QCheckBox,
 )
 
-from core.paths import (
-    app_root,
-    resource_path,
-    pilih_template_berdasarkan_pembimbing,
-    pilih_template_nota_dinas_berdasarkan_pembimbing,
+from core.arsip import Arsip, Rekaman
+from core.paths import app_root, resource_path, semua_template
+from core.render_pool import RenderPool, dari_env
+from core.excel_loader import (
+    Dosen,
+    DosenRegistry,
+    diff_dosen,
+    load_dosen_excel,
+    tanda_file,
+)
+from core.dosen_search import DosenIndex
+from core.date_formatter import nama_hari_indonesia
+from core.dokumen import (
+    JENIS_BERITA_ACARA,
+    JENIS_NOTA_DINAS,
+    UjianData,
+    buat_berita_acara,
+    buat_nota_dinas,
+    siapkan_semua,
 )
-from core.excel_loader import load_dosen_excel, Dosen
-from core.date_formatter import (
-    format_tanggal_indonesia,
-    format_tanggal_iso,
-    nama_hari_indonesia,
-    urutan_ke_kata,
+from core.batch import (
+    SEMUA_JENIS,
+    HasilBaris,
+    jalankan_gabungan,
+    jalankan_roster,
+    ringkasan,
+    simpan_paralel,
 )
-from core.validator import FormData, validate_form, validate_nota_dinas_inputs
-from core.word_generator import generate_docx
+from core.konflik import JadwalIndex, jadwal_dari_ujian
+from core.nomor_nd import Nomor, PenomoranND
+from core.output_writer import OutputWriter
+from core import profiling
+from ui_worker import GenerateJob, JobDibatalkan, langkah_berurutan
+from ui_dosen import ID_ROLE, DosenCompleter, DosenListModel
+from ui_arsip import tampilkan_riwayat
+
+# simpan beruntun (Excel menulis file beberapa kali) digabung jadi satu reload
+RELOAD_DEBOUNCE_MS = 800
+# proses render dibuat sesudah window tampil & Excel dosen mulai diload
+RENDER_POOL_DELAY_MS = 1500
+
+
+def _qdate_to_date(qdate: QDate) -> date:
+    return date(qdate.year(), qdate.month(), qdate.day())
 
 
 class MainWindow(QWidget):
-    def __init__(self):
+    def __init__(self, t_launch: float | None = None):
         super().__init__()
         self.setWindowTitle("Generator Berita Acara & Nota Dinas Ujian Skripsi (S1)")
         self.setMinimumWidth(920)
@@ -52,13 +94,73 @@ class MainWindow(QWidget):
         self.excel_path: Path | None = None
         self.output_root: Path = app_root() / "output"
 
-        self.dosen_by_id: dict[str, Dosen] = {}
-        self.display_to_id: dict[str, str] = {}
+        self.dosen_by_id = DosenRegistry()
+        self.dosen_index: DosenIndex | None = None
+        self.dosen_model = DosenListModel(self)
+        self._completers: list[DosenCompleter] = []
+        # ujian yang sudah di-generate, untuk peringatan jadwal bentrok
+        self.jadwal_index = JadwalIndex()
+        # riwayat generate (None kalau file arsip tidak bisa dibuka)
+        self.arsip: Arsip | None = None
+        self._npm_terisi = ""  # NPM terakhir yang diisi dari arsip
+        # nomor ND yang sudah diambil tapi belum dipakai untuk Nota Dinas
+        self._nd_dipesan: tuple[PenomoranND, Nomor] | None = None
+
+        self._job_aktif: GenerateJob | None = None
+        self._job_antrian: deque[GenerateJob] = deque()
+        self._job_load: GenerateJob | None = None
+        # proses render paralel (None = render di thread worker saja)
+        self._render_pool: RenderPool | None = None
+
+        # hot reload: workbook dosen yang sedang dipakai dipantau
+        self._tanda_excel: tuple[int, int] | None = None
+        # file dosen yang ID gandanya sudah ditampilkan sebagai dialog
+        self._duplikat_dilaporkan: set[Path] = set()
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_excel_berubah)
+        # editor yang menyimpan lewat tulis-lalu-rename mengganti file; folder
+        # ikut dipantau supaya file barunya tetap terdeteksi
+        self._watcher.directoryChanged.connect(self._on_excel_berubah)
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(RELOAD_DEBOUNCE_MS)
+        self._reload_timer.timeout.connect(self._reload_excel)
+
+        # waktu startup (ms sejak proses mulai): first_paint, ready
+        self._t_launch = t_launch if t_launch is not None else time.perf_counter()
+        self.startup_timings: dict[str, float] = {}
 
         self._build_ui()
         self._apply_styles()
-        self._load_defaults_if_any()
         self._refresh_output_label()
+        self._buka_arsip()
+        # roster default diload setelah window tampil (lihat paintEvent)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if "first_paint" not in self.startup_timings:
+            self._catat_timing("first_paint")
+            QTimer.singleShot(0, self._load_defaults_if_any)
+            QTimer.singleShot(RENDER_POOL_DELAY_MS, self._siapkan_render_pool)
+
+    def _siapkan_render_pool(self):
+        try:
+            self._render_pool = dari_env(semua_template())
+        except Exception:
+            self._render_pool = None  # tetap jalan, render di thread saja
+
+    def closeEvent(self, event):
+        self._lepas_nomor_nd()
+        if self._render_pool is not None:
+            self._render_pool.shutdown(wait=False)
+            self._render_pool = None
+        if self.arsip is not None:
+            self.arsip.tutup()
+            self.arsip = None
+        super().closeEvent(event)
+
+    def _catat_timing(self, nama: str):
+        self.startup_timings[nama] = (time.perf_counter() - self._t_launch) * 1000
 
     # ---------- UI ----------
     def _build_ui(self):
@@ -165,7 +267,7 @@ class MainWindow(QWidget):
 
         self.in_hari = QLineEdit()
         self.in_hari.setReadOnly(True)
-        self.in_hari.setText(nama_hari_indonesia(self.in_tanggal.date()))
+        self._on_date_changed(self.in_tanggal.date())
 
         self.in_mulai = QTimeEdit()
         self.in_mulai.setDisplayFormat("HH:mm")
@@ -235,6 +337,19 @@ class MainWindow(QWidget):
         lay_nd.setColumnStretch(3, 2)
 
         self.in_id_nd = QLineEdit()
+        self.btn_ambil_nd = QPushButton("Ambil Nomor")
+        self.btn_ambil_nd.setToolTip(
+            "Nomor ND berikutnya untuk prodi + tahun Tanggal ND (dari folder output)"
+        )
+        self.chk_nd_otomatis = QCheckBox("Otomatis")
+        self.chk_nd_otomatis.setChecked(True)
+        self.chk_nd_otomatis.setToolTip(
+            "ID ND kosong (form / baris roster) diisi nomor berikutnya saat generate"
+        )
+        row_id_nd = QHBoxLayout()
+        row_id_nd.addWidget(self.in_id_nd, 1)
+        row_id_nd.addWidget(self.btn_ambil_nd)
+        row_id_nd.addWidget(self.chk_nd_otomatis)
 
         self.in_tanggal_nd = QDateEdit()
         self.in_tanggal_nd.setCalendarPopup(True)
@@ -247,7 +362,7 @@ class MainWindow(QWidget):
         self.in_lokasi_ujian = QLineEdit()
 
         lay_nd.addWidget(QLabel("No ID / ID ND"), 0, 0)
-        lay_nd.addWidget(self.in_id_nd, 0, 1)
+        lay_nd.addLayout(row_id_nd, 0, 1)
 
         lay_nd.addWidget(QLabel("Tanggal ND"), 0, 2)
         lay_nd.addWidget(self.in_tanggal_nd, 0, 3)
@@ -294,8 +409,11 @@ class MainWindow(QWidget):
 
         self.btn_excel = QPushButton("Load Excel Dosen")
         self.btn_reset = QPushButton("Reset")
+        self.btn_riwayat = QPushButton("Riwayat")
+        self.btn_riwayat.setToolTip("Cari ujian yang pernah di-generate")
 
         self.btn_generate_all = QPushButton("Generate Semua")  # <- NEW (ND + BA)
+        self.btn_generate_roster = QPushButton("Generate dari Roster")
         self.btn_generate_nd = QPushButton("Generate Nota Dinas")
 
         self.btn_generate_ba = QPushButton("Generate Berita Acara")
@@ -303,16 +421,42 @@ class MainWindow(QWidget):
 
         row_btn.addWidget(self.btn_excel)
         row_btn.addWidget(self.btn_reset)
+        row_btn.addWidget(self.btn_riwayat)
         row_btn.addStretch(1)
+        row_btn.addWidget(self.btn_generate_roster)
         row_btn.addWidget(self.btn_generate_all)
         row_btn.addWidget(self.btn_generate_nd)
         row_btn.addWidget(self.btn_generate_ba)
 
         root.addLayout(row_btn)
 
+        row_status = QHBoxLayout()
         self.lbl_status = QLabel("Status: siap. Template auto (1/2 pembimbing).")
         self.lbl_status.setStyleSheet("color: #444; margin-top: 4px;")
-        root.addWidget(self.lbl_status)
+        self.chk_timing = QCheckBox("Rincian waktu")
+        self.chk_timing.setChecked(profiling.aktif())
+        self.chk_timing.setToolTip(
+            "Catat lama tiap tahap (load Excel, template, render, save, mkdir)"
+        )
+        row_status.addWidget(self.lbl_status, 1)
+        row_status.addWidget(self.chk_timing)
+        root.addLayout(row_status)
+
+        # rincian waktu job terakhir (hanya tampil kalau "Rincian waktu" aktif)
+        self.lbl_timing = QLabel("")
+        self.lbl_timing.setStyleSheet("color: #777; font-size: 11px;")
+        self.lbl_timing.setWordWrap(True)
+        self.lbl_timing.hide()
+        root.addWidget(self.lbl_timing)
+
+        row_progress = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.hide()
+        self.btn_cancel = QPushButton("Batal")
+        self.btn_cancel.hide()
+        row_progress.addWidget(self.progress_bar, 1)
+        row_progress.addWidget(self.btn_cancel)
+        root.addLayout(row_progress)
 
         # signals
         self.btn_excel.clicked.connect(self.on_pick_excel)
@@ -320,9 +464,15 @@ class MainWindow(QWidget):
         self.btn_open_output.clicked.connect(self.on_open_output_folder)
 
         self.btn_reset.clicked.connect(self.on_reset)
+        self.btn_riwayat.clicked.connect(self.on_riwayat)
+        self.btn_ambil_nd.clicked.connect(self.on_ambil_nomor_nd)
+        self.in_npm.editingFinished.connect(self._isi_dari_arsip)
         self.btn_generate_ba.clicked.connect(self.on_generate_berita_acara)
         self.btn_generate_nd.clicked.connect(self.on_generate_nota_dinas)
         self.btn_generate_all.clicked.connect(self.on_generate_all)
+        self.btn_generate_roster.clicked.connect(self.on_generate_roster)
+        self.btn_cancel.clicked.connect(self.on_cancel_job)
+        self.chk_timing.toggled.connect(self._on_timing_toggled)
 
         # spacer bawah
         bottom_spacer = QWidget()
@@ -375,14 +525,16 @@ class MainWindow(QWidget):
         cb.setEditable(True)
         cb.setInsertPolicy(QComboBox.NoInsert)
         cb.setPlaceholderText(placeholder)
+        cb.setProperty("placeholder", placeholder)
+        # model harus dipasang sebelum completer: setModel() ikut mengganti
+        # model completer milik combo
+        cb.setModel(self.dosen_model)
 
-        comp = cb.completer()
-        comp.setCompletionMode(QCompleter.PopupCompletion)
-        comp.setFilterMode(Qt.MatchContains)
+        self._completers.append(DosenCompleter(cb))
         return cb
 
     def _on_date_changed(self, qdate: QDate):
-        self.in_hari.setText(nama_hari_indonesia(qdate))
+        self.in_hari.setText(nama_hari_indonesia(_qdate_to_date(qdate)))
 
     # ---------- Output folder ----------
     def _refresh_output_label(self):
@@ -406,66 +558,220 @@ class MainWindow(QWidget):
     # ---------- Defaults ----------
     def _load_defaults_if_any(self):
         default_excel = resource_path("resources/dosen.xlsx")
-        if default_excel.exists():
-            self.excel_path = default_excel
-            try:
-                self._load_excel_into_ui(default_excel)
-                self.lbl_status.setText(
-                    "Status: default Excel terdeteksi. Template auto (1/2 pembimbing)."
-                )
-            except Exception as e:
-                self.lbl_status.setText(
-                    f"Status: default Excel ditemukan, tapi gagal load: {e}"
-                )
+        if not default_excel.exists():
+            self._catat_timing("ready")
+            return
+        self.excel_path = default_excel
+
+        def selesai():
+            self._catat_timing("ready")
+            t = self.startup_timings
+            self.lbl_status.setText(
+                "Status: default Excel terdeteksi. Template auto (1/2 pembimbing). "
+                f"(tampil {t['first_paint']:.0f} ms, siap {t['ready']:.0f} ms)"
+            )
+
+        def gagal(msg: str):
+            self._catat_timing("ready")
+            self.lbl_status.setText(
+                f"Status: default Excel ditemukan, tapi gagal load: {msg}"
+            )
+
+        self._load_excel_async(default_excel, selesai, gagal)
 
     # ---------- Excel ----------
     def on_pick_excel(self):
         path, _ = QFileDialog.getOpenFileName(
-            self, "Pilih Excel Dosen", str(app_root()), "Excel (*.xlsx)"
+            self, "Pilih Excel Dosen", str(app_root()), "Excel / CSV (*.xlsx *.csv)"
         )
         if not path:
             return
         self.excel_path = Path(path)
-        try:
-            self._load_excel_into_ui(self.excel_path)
+
+        def selesai():
             self.lbl_status.setText(
                 f"Status: Excel dosen loaded: {self.excel_path.name}"
             )
-        except Exception as e:
-            QMessageBox.critical(self, "Gagal load Excel", str(e))
 
-    def _load_excel_into_ui(self, path: Path):
-        self.dosen_by_id, self.display_to_id = load_dosen_excel(path)
-        self._refill_combos()
+        def gagal(msg: str):
+            QMessageBox.critical(self, "Gagal load Excel", msg)
+
+        self._load_excel_async(self.excel_path, selesai, gagal, manual=True)
+
+    def _dosen_combos(self) -> tuple[QComboBox, ...]:
+        return (self.cb_pb1, self.cb_pb2, self.cb_pj1, self.cb_pj2)
 
-    def _refill_combos(self):
-        items = sorted(self.display_to_id.keys())
+    def _load_excel_async(
+        self,
+        path: Path,
+        on_selesai: Callable[[], None],
+        on_gagal: Callable[[str], None],
+        inkremental: bool = False,
+        manual: bool = False,
+    ):
+        """
+        Parse Excel di thread worker; combo dosen menampilkan "memuat…" sampai
+        selesai. Hasil dipasang ke UI di thread GUI.
+
+        inkremental=True (hot reload): combo tetap bisa dipakai selama load,
+        lalu hanya perubahannya yang diterapkan ke model.
+        manual=True: dipilih user lewat dialog; ID ganda ditampilkan sebagai
+        peringatan (sekali per file), load lain cukup di status.
+        """
+        if self._job_load is not None:
+            self._job_load.batal.set()
+
+        if not inkremental:
+            for cb in self._dosen_combos():
+                cb.setEnabled(False)
+                cb.setPlaceholderText("Memuat data dosen…")
+            self.btn_excel.setEnabled(False)
+
+        def kerja(progress, batal):
+            # tanda diambil sebelum dibaca: perubahan selama load tetap memicu
+            # reload berikutnya
+            tanda = tanda_file(path)
+            registry = load_dosen_excel(path)
+            # sort + index dibuat sekali di sini (thread worker), bukan per ketikan
+            with profiling.span("index"):
+                index = DosenIndex(registry.urut)
+            return registry, index, tanda
+
+        job = GenerateJob("Load Excel", kerja)
+        self._job_load = job
+
+        def akhiri() -> bool:
+            if self._job_load is not job:
+                return False  # sudah digantikan load yang lebih baru
+            self._job_load = None
+            for cb in self._dosen_combos():
+                cb.setEnabled(True)
+                cb.setPlaceholderText(cb.property("placeholder"))
+            self.btn_excel.setEnabled(True)
+            return True
+
+        def selesai(hasil):
+            if not akhiri():
+                return
+            self._tampilkan_rekaman(job)
+            self.dosen_by_id, self.dosen_index, tanda = hasil
+            for comp in self._completers:
+                comp.set_index(self.dosen_index)
+            if inkremental:
+                self._perbarui_combos(self.dosen_by_id.urut)
+            else:
+                self._refill_combos(self.dosen_by_id.urut)
+                self._muat_jadwal_arsip()
+            self._pantau_excel(path, tanda)
+            on_selesai()
+            if self.dosen_by_id.duplikat:
+                self._lapor_duplikat(path, manual)
+
+        def gagal(msg: str):
+            if akhiri():
+                on_gagal(msg)
+
+        job.signals.selesai.connect(selesai)
+        job.signals.gagal.connect(gagal)
+        QThreadPool.globalInstance().start(job)
+
+    def _lapor_duplikat(self, path: Path, manual: bool):
+        pesan = self.dosen_by_id.pesan_duplikat()
+        if manual and path not in self._duplikat_dilaporkan:
+            self._duplikat_dilaporkan.add(path)
+            QMessageBox.warning(self, "Excel dosen", pesan)
+            return
+        # load default / hot reload: jangan memblokir dengan dialog
+        status = self.lbl_status.text()
+        if pesan not in status:
+            self.lbl_status.setText(f"{status} ⚠ {pesan}")
+
+    def _refill_combos(self, urut: Sequence[Dosen]):
+        combos = self._dosen_combos()
+        keep = [cb.currentText() for cb in combos]
 
-        def refill(cb: QComboBox, keep_text: str | None = None):
+        for cb in combos:
             cb.blockSignals(True)
-            cb.clear()
-            cb.addItem("")
-            cb.addItems(items)
+        self.dosen_model.set_dosen(urut)
+
+        for cb, keep_text in zip(combos, keep):
             if keep_text:
-                idx = cb.findText(keep_text)
-                if idx >= 0:
-                    cb.setCurrentIndex(idx)
+                d = self.dosen_by_id.dari_display(keep_text)
+                row = self.dosen_model.baris_id(d.id if d else None)
+                if row >= 0:
+                    cb.setCurrentIndex(row)
                 else:
                     cb.setEditText(keep_text)
+            else:
+                cb.setCurrentIndex(0)
             cb.blockSignals(False)
 
-        refill(self.cb_pb1, self.cb_pb1.currentText())
-        refill(self.cb_pb2, self.cb_pb2.currentText())
-        refill(self.cb_pj1, self.cb_pj1.currentText())
-        refill(self.cb_pj2, self.cb_pj2.currentText())
+    def _perbarui_combos(self, urut: Sequence[Dosen]):
+        """
+        Terapkan hasil reload ke model tanpa reset: pilihan yang dosennya masih
+        ada tetap (teksnya ikut berubah kalau nama diubah).
+        """
+        combos = self._dosen_combos()
+        sebelum = [(cb.currentData(ID_ROLE), cb.currentText()) for cb in combos]
+
+        for cb in combos:
+            cb.blockSignals(True)
+        self.dosen_model.perbarui(urut)
+
+        for cb, (dosen_id, teks) in zip(combos, sebelum):
+            if dosen_id and dosen_id not in self.dosen_by_id:
+                # dosen terpilih dihapus dari Excel: jangan diam-diam pindah ke
+                # dosen lain, teks lama dibiarkan supaya validasi menolaknya
+                cb.setCurrentIndex(0)
+                cb.setEditText(teks)
+            cb.blockSignals(False)
+
+    # ---------- Hot reload ----------
+    def _pantau_excel(self, path: Path, tanda: tuple[int, int] | None):
+        lama = self._watcher.files() + self._watcher.directories()
+        if lama:
+            self._watcher.removePaths(lama)
+        self._watcher.addPaths([str(path), str(path.parent)])
+        self._tanda_excel = tanda
+
+    def _on_excel_berubah(self, _path: str):
+        self._reload_timer.start()  # start ulang = debounce
+
+    def _reload_excel(self):
+        path = self.excel_path
+        if path is None:
+            return
+        if str(path) not in self._watcher.files() and path.exists():
+            self._watcher.addPath(str(path))  # file diganti (rename) saat simpan
+        tanda = tanda_file(path)
+        if tanda is None or tanda == self._tanda_excel:
+            return  # file sementara Excel (~$...) / tidak ada perubahan isi
+        if self._job_load is not None:
+            self._reload_timer.start()  # tunggu load yang sedang jalan
+            return
+
+        lama = self.dosen_by_id
+
+        def selesai():
+            diff = diff_dosen(lama, self.dosen_by_id)
+            if diff:
+                self.lbl_status.setText(
+                    f"Status: Excel dosen diperbarui otomatis ({diff.ringkas()})"
+                )
+
+        def gagal(msg: str):
+            # sering terjadi saat file masih ditulis; perubahan berikutnya
+            # memicu reload lagi, data lama tetap dipakai
+            self.lbl_status.setText(
+                f"Status: gagal reload Excel dosen, data lama dipakai: {msg}"
+            )
+
+        self._load_excel_async(path, selesai, gagal, inkremental=True)
 
     def _selected_dosen(self, display_text: str) -> Dosen | None:
         if not display_text:
             return None
-        dosen_id = self.display_to_id.get(display_text)
-        if not dosen_id:
-            return None
-        return self.dosen_by_id.get(dosen_id)
+        return self.dosen_by_id.dari_display(display_text)
 
     # ---------- Reset ----------
     def on_reset(self):
@@ -477,7 +783,7 @@ class MainWindow(QWidget):
 
         # Waktu ujian default hari ini
         self.in_tanggal.setDate(QDate.currentDate())
-        self.in_hari.setText(nama_hari_indonesia(self.in_tanggal.date()))
+        self._on_date_changed(self.in_tanggal.date())
         self.in_mulai.setTime(QTime(0, 0))
         self.in_selesai.setTime(QTime(0, 0))
 
@@ -487,6 +793,7 @@ class MainWindow(QWidget):
             cb.setEditText("")
 
         # Nota Dinas
+        self._lepas_nomor_nd()
         self.in_id_nd.clear()
         self.in_lokasi_ujian.clear()
         self.in_tanggal_nd.setDate(QDate.currentDate())
@@ -496,221 +803,574 @@ class MainWindow(QWidget):
         self.lbl_status.setText("Status: form di-reset (folder output & Excel tetap).")
 
     # ---------- Common gather ----------
-    def _get_common_form(self) -> tuple[bool, str, dict]:
+    def _ujian_dari_form(self) -> UjianData:
         if not self.excel_path or not self.excel_path.exists():
-            return False, "Excel dosen belum diload / tidak ditemukan.", {}
-
-        pb1 = self._selected_dosen(self.cb_pb1.currentText().strip())
-        pb2 = self._selected_dosen(self.cb_pb2.currentText().strip())
-        pj1 = self._selected_dosen(self.cb_pj1.currentText().strip())
-        pj2 = self._selected_dosen(self.cb_pj2.currentText().strip())
-
-        if not pb1:
-            return False, "Pembimbing 1 wajib dipilih.", {}
-
-        jumlah_pembimbing = 2 if pb2 else 1
-
-        nama_mhs = self.in_nama.text().strip()
-        npm = self.in_npm.text().strip()
-        judul = self.in_judul.toPlainText().strip()
+            raise ValueError("Excel dosen belum diload / tidak ditemukan.")
+
+        return UjianData(
+            nama_mahasiswa=self.in_nama.text().strip(),
+            npm=self.in_npm.text().strip(),
+            judul_skripsi=self.in_judul.toPlainText().strip(),
+            urutan=int(self.in_urutan.value()),
+            tanggal=_qdate_to_date(self.in_tanggal.date()),
+            jam_mulai=self.in_mulai.time().toString("HH:mm"),
+            jam_selesai=self.in_selesai.time().toString("HH:mm"),
+            pembimbing_1=self._selected_dosen(self.cb_pb1.currentText().strip()),
+            pembimbing_2=self._selected_dosen(self.cb_pb2.currentText().strip()),
+            penguji_1=self._selected_dosen(self.cb_pj1.currentText().strip()),
+            penguji_2=self._selected_dosen(self.cb_pj2.currentText().strip()),
+            id_nd=self.in_id_nd.text().strip(),
+            tanggal_nd=_qdate_to_date(self.in_tanggal_nd.date()),
+            lokasi_ujian=self.in_lokasi_ujian.text().strip(),
+            prodi=self.cb_prodi.currentText().strip(),
+        )
 
-        urutan_angka = int(self.in_urutan.value())
-        urutan_kata = urutan_ke_kata(urutan_angka)
+    # ---------- Internal generators ----------
+    # Dipanggil di thread GUI: hanya mengumpulkan data form. Hasilnya fungsi
+    # render tanpa argumen yang aman dijalankan di thread worker.
+    def _generate_berita_acara(self, u: UjianData) -> Callable[[], Path]:
+        self._refresh_output_label()
+        output_root = self.output_root
+        return lambda: buat_berita_acara(u, output_root)
 
-        hari = self.in_hari.text().strip()
-        tanggal_str = format_tanggal_indonesia(self.in_tanggal.date())
-        jam_mulai = self.in_mulai.time().toString("HH:mm")
-        jam_selesai = self.in_selesai.time().toString("HH:mm")
+    def _generate_nota_dinas(self, u: UjianData) -> Callable[[], Path]:
+        self._refresh_output_label()
+        output_root = self.output_root
+        return lambda: buat_nota_dinas(u, output_root)
 
+    # ---------- Job queue ----------
+    def _generate_buttons(self) -> tuple[QPushButton, ...]:
         return (
-            True,
-            "",
-            {
-                "pb1": pb1,
-                "pb2": pb2,
-                "pj1": pj1,
-                "pj2": pj2,
-                "jumlah_pembimbing": jumlah_pembimbing,
-                "nama_mhs": nama_mhs,
-                "npm": npm,
-                "judul": judul,
-                "urutan_angka": urutan_angka,
-                "urutan_kata": urutan_kata,
-                "hari": hari,
-                "tanggal_str": tanggal_str,
-                "jam_mulai": jam_mulai,
-                "jam_selesai": jam_selesai,
-            },
+            self.btn_generate_ba,
+            self.btn_generate_nd,
+            self.btn_generate_all,
+            self.btn_generate_roster,
         )
 
-    # ---------- Internal generators (return Path) ----------
-    def _generate_berita_acara(self) -> Path:
-        ok, msg, data = self._get_common_form()
-        if not ok:
-            raise ValueError(msg)
-
-        pb1: Dosen = data["pb1"]
-        pb2: Dosen | None = data["pb2"]
-        pj1: Dosen | None = data["pj1"]
-        pj2: Dosen | None = data["pj2"]
-        jumlah_pembimbing: int = data["jumlah_pembimbing"]
-
-        template_path = pilih_template_berdasarkan_pembimbing(jumlah_pembimbing)
-        if not template_path.exists():
-            raise FileNotFoundError(
-                f"Template berita acara tidak ditemukan: {template_path}"
+    def _submit_job(self, job: GenerateJob):
+        if self._job_aktif is not None:
+            self._job_antrian.append(job)
+            self.lbl_status.setText(
+                f"Status: {job.judul} masuk antrian ({len(self._job_antrian)})"
             )
-
-        fd = FormData(
-            nama_mahasiswa=data["nama_mhs"],
-            npm=data["npm"],
-            judul_skripsi=data["judul"],
-            urutan=data["urutan_angka"],
-            hari=data["hari"],
-            jam_mulai=data["jam_mulai"],
-            jam_selesai=data["jam_selesai"],
-            pembimbing_1=pb1.nama,
-            pembimbing_2=pb2.nama if pb2 else "",
-            penguji_1=pj1.nama if pj1 else "",
-            penguji_2=pj2.nama if pj2 else "",
+            return
+        self._mulai_job(job)
+
+    def _mulai_job(self, job: GenerateJob):
+        self._job_aktif = job
+        for btn in self._generate_buttons():
+            btn.setEnabled(False)
+        self.btn_cancel.setEnabled(True)
+        self.btn_cancel.show()
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.show()
+        self.lbl_status.setText(f"Status: {job.judul} berjalan…")
+
+        job.signals.progress.connect(self._on_job_progress)
+        job.signals.selesai.connect(self._on_job_selesai)
+        job.signals.gagal.connect(self._on_job_gagal)
+        job.signals.dibatalkan.connect(self._on_job_dibatalkan)
+        QThreadPool.globalInstance().start(job)
+
+    def _akhiri_job(self):
+        self._job_aktif = None
+        if self._job_antrian:
+            self._mulai_job(self._job_antrian.popleft())
+            return
+        for btn in self._generate_buttons():
+            btn.setEnabled(True)
+        self.btn_cancel.hide()
+        self.progress_bar.hide()
+
+    def on_cancel_job(self):
+        job = self._job_aktif
+        if job is None:
+            return
+        job.batal.set()
+        for antri in self._job_antrian:
+            antri.batal.set()
+        self._job_antrian.clear()
+        self.btn_cancel.setEnabled(False)
+        self.lbl_status.setText(f"Status: membatalkan {job.judul}…")
+
+    def _on_job_progress(self, selesai: int, total: int, pesan: str):
+        job = self._job_aktif
+        self.progress_bar.setRange(0, max(total, 1))
+        self.progress_bar.setValue(selesai)
+        judul = job.judul if job else "Generate"
+        self.lbl_status.setText(f"Status: {judul} {selesai}/{total} → {pesan}")
+
+    def _on_timing_toggled(self, on: bool):
+        profiling.set_aktif(on)
+        if not on:
+            self.lbl_timing.hide()
+
+    def _tampilkan_rekaman(self, job: GenerateJob):
+        rek = job.rekaman
+        if not rek:
+            return
+        teks = f"⏱ {job.judul}: {rek.ringkas()}"
+        if rek.files:
+            teks += f" — profil: {rek.files[0].parent}"
+        self.lbl_timing.setText(teks)
+        self.lbl_timing.show()
+
+    def _on_job_selesai(self, hasil):
+        job = self._job_aktif
+        if job is not None:
+            self._tampilkan_rekaman(job)
+        self._akhiri_job()
+        if job is not None and job.on_selesai:
+            job.on_selesai(hasil)
+
+    def _on_job_gagal(self, msg: str):
+        job = self._job_aktif
+        self._akhiri_job()
+        judul = job.judul if job else "Generate"
+        QMessageBox.critical(self, f"Gagal generate {judul}", msg)
+
+    def _on_job_dibatalkan(self):
+        job = self._job_aktif
+        self._akhiri_job()
+        judul = job.judul if job else "Generate"
+        self.lbl_status.setText(f"Status: {judul} dibatalkan.")
+
+    # ---------- Jadwal bentrok ----------
+    def _konfirmasi_bentrok(self, u: UjianData) -> bool:
+        """
+        Cek dosen / lokasi bentrok dengan ujian yang sudah dibuat di sesi ini.
+        Return True kalau boleh lanjut generate.
+        """
+        j = jadwal_dari_ujian(u)
+        konflik = self.jadwal_index.cek(j) if j else []
+        if not konflik:
+            return True
+        daftar = "\n".join(f"- {k.pesan()}" for k in konflik[:10])
+        jawab = QMessageBox.warning(
+            self,
+            "Jadwal bentrok",
+            f"Jadwal ujian ini bentrok:\n{daftar}\n\nTetap generate?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No,
         )
-        ok2, msg2 = validate_form(fd)
-        if not ok2:
-            raise ValueError(msg2)
-
-        context = {
-            "hari": data["hari"],
-            "tanggal_bulan_tahun": data["tanggal_str"],
-            "jam_mulai": data["jam_mulai"],
-            "jam_selesai": data["jam_selesai"],
-            "urutan": data["urutan_kata"],
-            "nama_mahasiswa": data["nama_mhs"],
-            "npm": data["npm"],
-            "judul_skripsi": data["judul"],
-            "pembimbing_1": pb1.nama,
-            "pembimbing_2": pb2.nama if pb2 else "",
-            "penguji_1": pj1.nama if pj1 else "",
-            "penguji_2": pj2.nama if pj2 else "",
-            "nipnup_penguji1": pj1.jenis_id if pj1 else "",
-            "nomor_nipnup_penguji1": pj1.id if pj1 else "",
-            "nipnup_penguji2": pj2.jenis_id if pj2 else "",
-            "nomor_nipnup_penguji2": pj2.id if pj2 else "",
-        }
+        return jawab == QMessageBox.Yes
 
-        self._refresh_output_label()
-        return generate_docx(
-            template_path=template_path,
-            output_root=self.output_root,
-            nama_mahasiswa=data["nama_mhs"],
-            npm=data["npm"],
-            context=context,
-            output_filename=f"Berita Acara dan Nilai Ujian Skripsi_{data['nama_mhs']}_{data['npm']}",
+    def _catat_jadwal(self, ujian: list[UjianData]):
+        for u in ujian:
+            j = jadwal_dari_ujian(u)
+            if j is not None:
+                self.jadwal_index.tambah(j)
+
+    # ---------- Nomor ND ----------
+    def on_ambil_nomor_nd(self):
+        self._ambil_nomor_nd()
+
+    def _ambil_nomor_nd(self) -> bool:
+        prodi = self.cb_prodi.currentText().strip()
+        tahun = self.in_tanggal_nd.date().year()
+        self._lepas_nomor_nd()
+        penomoran = PenomoranND(self.output_root)
+        try:
+            [n] = penomoran.ambil(prodi, tahun)
+        except Exception as e:
+            QMessageBox.critical(self, "Gagal mengambil nomor ND", str(e))
+            return False
+        self._nd_dipesan = (penomoran, n)
+        self.in_id_nd.setText(n.teks())
+        self.lbl_status.setText(
+            f"Status: nomor ND {n.teks()} diambil ({prodi} {tahun})."
         )
+        return True
 
-    def _generate_nota_dinas(self) -> Path:
-        ok, msg, data = self._get_common_form()
-        if not ok:
-            raise ValueError(msg)
+    def _isi_nomor_nd_kosong(self) -> bool:
+        """
+        Sebelum generate Nota Dinas: ID ND kosong + "Otomatis" -> ambil nomor.
+        False kalau nomor gagal diambil.
+        """
+        if self.in_id_nd.text().strip() or not self.chk_nd_otomatis.isChecked():
+            return True
+        return self._ambil_nomor_nd()
 
-        pb1: Dosen = data["pb1"]
-        pb2: Dosen | None = data["pb2"]
-        pj1: Dosen | None = data["pj1"]
-        pj2: Dosen | None = data["pj2"]
-        jumlah_pembimbing: int = data["jumlah_pembimbing"]
+    def _nomor_nd_terpakai(self, u: UjianData):
+        if self._nd_dipesan is not None and u.id_nd == self._nd_dipesan[1].teks():
+            self._nd_dipesan = None
 
-        id_nd = self.in_id_nd.text().strip()
-        prodi = self.cb_prodi.currentText().strip()
-        lokasi_ujian = self.in_lokasi_ujian.text().strip()
+    def _lepas_nomor_nd(self):
+        """
+        Nomor yang diambil tapi tidak jadi dipakai dikembalikan, supaya urutan
+        tidak bolong.
+        """
+        dipesan, self._nd_dipesan = self._nd_dipesan, None
+        if dipesan is None:
+            return
+        penomoran, n = dipesan
+        try:
+            penomoran.kembalikan([n])
+        except Exception:
+            pass  # hanya membuat urutan bolong
 
-        ok_nd, msg_nd = validate_nota_dinas_inputs(id_nd, lokasi_ujian, prodi)
-        if not ok_nd:
-            raise ValueError(msg_nd)
+    # ---------- Arsip ----------
+    def _buka_arsip(self):
+        try:
+            self.arsip = Arsip()
+        except Exception as e:
+            # aplikasi tetap jalan, hanya tanpa riwayat
+            self.arsip = None
+            self.btn_riwayat.setEnabled(False)
+            self.lbl_status.setText(f"Status: arsip ujian tidak bisa dibuka: {e}")
 
-        template_path = pilih_template_nota_dinas_berdasarkan_pembimbing(
-            jumlah_pembimbing
-        )
-        if not template_path.exists():
-            raise FileNotFoundError(
-                f"Template nota dinas tidak ditemukan: {template_path}"
+    def _catat_arsip(self, items: list[tuple[str, UjianData, Path]]):
+        if self.arsip is None:
+            return
+        try:
+            self.arsip.catat_banyak(items)
+        except Exception as e:
+            QMessageBox.warning(
+                self, "Arsip", f"Dokumen sudah dibuat, tapi gagal dicatat: {e}"
             )
 
-        tanggal_nd_qdate = self.in_tanggal_nd.date()
-        tanggal_nd_iso = format_tanggal_iso(tanggal_nd_qdate)  # 2025-12-23
-        tanggal_nd_id = format_tanggal_indonesia(tanggal_nd_qdate)  # 23 Desember 2025
+    def _muat_jadwal_arsip(self):
+        """
+        Ujian mendatang dari arsip masuk ke index bentrok, jadi peringatan
+        bentrok tetap berlaku setelah aplikasi ditutup.
+        """
+        if self.arsip is None:
+            return
+        try:
+            rekaman = self.arsip.cari(dari=date.today(), limit=10000)
+        except Exception:
+            return
+        # terbaru dulu -> dibalik, supaya rekaman terbaru per NPM yang dipakai
+        for rek in reversed(rekaman):
+            j = jadwal_dari_ujian(rek.ke_ujian(self.dosen_by_id))
+            if j is not None:
+                self.jadwal_index.tambah(j)
+
+    def _set_dosen_combo(self, cb: QComboBox, d: Dosen | None):
+        row = self.dosen_model.baris_id(d.id if d else None)
+        cb.setCurrentIndex(max(row, 0))
+        if row < 0:
+            cb.setEditText("")
 
-        output_filename = (
-            f"{tanggal_nd_iso}_{id_nd}_Undangan_Ujian_Skripsi_S1_"
-            f"{prodi}_{data['nama_mhs']}_{data['npm']}"
+    def _isi_dari_arsip(self):
+        """
+        NPM yang pernah ujian: isi field yang masih kosong dari ujian terakhirnya
+        dan "Ujian ke-" berikutnya. Tanggal, jam, dan ID ND tidak disentuh.
+        """
+        npm = self.in_npm.text().strip()
+        if self.arsip is None or not npm or npm == self._npm_terisi:
+            return
+        self._npm_terisi = npm
+        try:
+            rek = self.arsip.terakhir(npm)
+            if rek is None:
+                return
+            tanggal = _qdate_to_date(self.in_tanggal.date())
+            urutan = self.arsip.urutan_berikut(npm, sebelum=tanggal)
+        except Exception:
+            return
+        u = rek.ke_ujian(self.dosen_by_id)
+
+        if not self.in_nama.text().strip():
+            self.in_nama.setText(u.nama_mahasiswa)
+        if not self.in_judul.toPlainText().strip():
+            self.in_judul.setPlainText(u.judul_skripsi)
+        if self.in_urutan.value() == 1:
+            self.in_urutan.setValue(urutan)
+        for cb, d in zip(
+            self._dosen_combos(),
+            (u.pembimbing_1, u.pembimbing_2, u.penguji_1, u.penguji_2),
+        ):
+            if not cb.currentText().strip():
+                self._set_dosen_combo(cb, d)
+        if not self.in_lokasi_ujian.text().strip():
+            self.in_lokasi_ujian.setText(u.lokasi_ujian)
+        idx = self.cb_prodi.findText(u.prodi)
+        if idx >= 0:
+            self.cb_prodi.setCurrentIndex(idx)
+
+        self.lbl_status.setText(
+            f"Status: data {u.nama_mahasiswa} dari arsip (ujian terakhir "
+            f"{rek.tanggal.isoformat()}, ke-{rek.urutan}) → ujian ke-{urutan}."
         )
 
-        context = {
-            "id_nd": id_nd,
-            "prodi": prodi,
-            "lokasi_ujian": lokasi_ujian,
-            "tanggal_hari_ini": tanggal_nd_id,
-            "nama_mahasiswa": data["nama_mhs"],
-            "npm": data["npm"],
-            "judul_skripsi": data["judul"],
-            "hari": data["hari"],
-            "tanggal_bulan_tahun": data["tanggal_str"],
-            "jam_mulai": data["jam_mulai"],
-            "jam_selesai": data["jam_selesai"],
-            "penguji_1": pj1.nama if pj1 else "",
-            "penguji_2": pj2.nama if pj2 else "",
-            "pembimbing_1": pb1.nama if pb1 else "",
-            "pembimbing_2": pb2.nama if pb2 else "",
-        }
+    def _muat_rekaman(self, rek: Rekaman):
+        u = rek.ke_ujian(self.dosen_by_id)
+        self._npm_terisi = u.npm
+        self.in_nama.setText(u.nama_mahasiswa)
+        self.in_npm.setText(u.npm)
+        self.in_judul.setPlainText(u.judul_skripsi)
+        self.in_urutan.setValue(u.urutan)
+        self.in_tanggal.setDate(QDate(u.tanggal.year, u.tanggal.month, u.tanggal.day))
+        self.in_mulai.setTime(QTime.fromString(u.jam_mulai, "HH:mm"))
+        self.in_selesai.setTime(QTime.fromString(u.jam_selesai, "HH:mm"))
+        for cb, d in zip(
+            self._dosen_combos(),
+            (u.pembimbing_1, u.pembimbing_2, u.penguji_1, u.penguji_2),
+        ):
+            self._set_dosen_combo(cb, d)
+        self._lepas_nomor_nd()
+        self.in_id_nd.setText(u.id_nd)
+        if u.tanggal_nd:
+            t = u.tanggal_nd
+            self.in_tanggal_nd.setDate(QDate(t.year, t.month, t.day))
+        self.in_lokasi_ujian.setText(u.lokasi_ujian)
+        idx = self.cb_prodi.findText(u.prodi)
+        if idx >= 0:
+            self.cb_prodi.setCurrentIndex(idx)
+        self.lbl_status.setText(
+            f"Status: form diisi dari arsip ({u.nama_mahasiswa}, "
+            f"{rek.tanggal.isoformat()})."
+        )
 
+    def _generate_ulang(self, rek: Rekaman):
+        """
+        Generate ulang persis dari context yang tersimpan (nama dosen, nomor ND,
+        tanggal seperti saat itu) ke folder output sekarang.
+        """
         self._refresh_output_label()
-        return generate_docx(
-            template_path=template_path,
-            output_root=self.output_root,
-            nama_mahasiswa=data["nama_mhs"],
-            npm=data["npm"],
-            context=context,
-            output_filename=output_filename,
+        output_root = self.output_root
+        dok = rek.dokumen()
+        judul = "Berita Acara" if rek.jenis == JENIS_BERITA_ACARA else "Nota Dinas"
+
+        def selesai(hasil: list[Path]):
+            out_path = hasil[0]
+            self.lbl_status.setText(f"Status: {judul} dibuat ulang → {out_path}")
+
+        kerja = langkah_berurutan(
+            [(judul, lambda: dok.simpan(output_root, force=True))]
+        )
+        self._submit_job(GenerateJob(f"{judul} (ulang)", kerja, selesai))
+
+    def on_riwayat(self):
+        if self.arsip is None:
+            return
+        tampilkan_riwayat(
+            self.arsip,
+            self.dosen_by_id,
+            self,
+            self._muat_rekaman,
+            self._generate_ulang,
         )
 
     # ---------- Button handlers ----------
     def on_generate_berita_acara(self):
         try:
-            out_path = self._generate_berita_acara()
+            u = self._ujian_dari_form()
+            render_ba = self._generate_berita_acara(u)
         except Exception as e:
             QMessageBox.critical(self, "Gagal generate Berita Acara", str(e))
             return
+        if not self._konfirmasi_bentrok(u):
+            return
 
-        self.lbl_status.setText(f"Status: Berita Acara sukses → {out_path}")
-        QMessageBox.information(
-            self, "Sukses", f"Berita Acara berhasil dibuat:\n{out_path}"
-        )
+        def selesai(hasil: list[Path]):
+            self._catat_jadwal([u])
+            out_path = hasil[0]
+            self._catat_arsip([(JENIS_BERITA_ACARA, u, out_path)])
+            self.lbl_status.setText(f"Status: Berita Acara sukses → {out_path}")
+            QMessageBox.information(
+                self, "Sukses", f"Berita Acara berhasil dibuat:\n{out_path}"
+            )
+
+        kerja = langkah_berurutan([("Berita Acara", render_ba)])
+        self._submit_job(GenerateJob("Berita Acara", kerja, selesai))
 
     def on_generate_nota_dinas(self):
+        if not self._isi_nomor_nd_kosong():
+            return
         try:
-            out_path = self._generate_nota_dinas()
+            u = self._ujian_dari_form()
+            render_nd = self._generate_nota_dinas(u)
         except Exception as e:
             QMessageBox.critical(self, "Gagal generate Nota Dinas", str(e))
             return
+        if not self._konfirmasi_bentrok(u):
+            return
 
-        self.lbl_status.setText(f"Status: Nota Dinas sukses → {out_path}")
-        QMessageBox.information(
-            self, "Sukses", f"Nota Dinas berhasil dibuat:\n{out_path}"
-        )
+        def selesai(hasil: list[Path]):
+            self._catat_jadwal([u])
+            out_path = hasil[0]
+            self._nomor_nd_terpakai(u)
+            self._catat_arsip([(JENIS_NOTA_DINAS, u, out_path)])
+            self.lbl_status.setText(f"Status: Nota Dinas sukses → {out_path}")
+            QMessageBox.information(
+                self, "Sukses", f"Nota Dinas berhasil dibuat:\n{out_path}"
+            )
+
+        kerja = langkah_berurutan([("Nota Dinas", render_nd)])
+        self._submit_job(GenerateJob("Nota Dinas", kerja, selesai))
 
     def on_generate_all(self):
+        if not self._isi_nomor_nd_kosong():
+            return
         try:
-            out_nd = self._generate_nota_dinas()
-            out_ba = self._generate_berita_acara()
+            u = self._ujian_dari_form()
         except Exception as e:
             QMessageBox.critical(self, "Gagal generate Semua", str(e))
             return
+        if not self._konfirmasi_bentrok(u):
+            return
+        self._refresh_output_label()
+        output_root = self.output_root
+
+        def selesai(hasil: list[Path]):
+            self._catat_jadwal([u])
+            out_nd, out_ba = hasil
+            self._nomor_nd_terpakai(u)
+            self._catat_arsip(
+                [(JENIS_NOTA_DINAS, u, out_nd), (JENIS_BERITA_ACARA, u, out_ba)]
+            )
+            self.lbl_status.setText(
+                "Status: sukses generate Semua → "
+                f"ND: {out_nd.name} | BA: {out_ba.name}"
+            )
+            QMessageBox.information(
+                self,
+                "Sukses",
+                "Berhasil generate 2 dokumen:\n"
+                f"1) Nota Dinas:\n{out_nd}\n\n"
+                f"2) Berita Acara:\n{out_ba}",
+            )
 
-        self.lbl_status.setText(
-            f"Status: sukses generate Semua → ND: {out_nd.name} | BA: {out_ba.name}"
-        )
-        QMessageBox.information(
+        pool = self._render_pool
+
+        def kerja(progress, batal):
+            # pre-flight keduanya dulu: kalau BA tidak valid, ND juga tidak ditulis
+            nd, ba = siapkan_semua(u, (JENIS_NOTA_DINAS, JENIS_BERITA_ACARA))
+            if pool is not None:
+                # ND dan BA di-render bersamaan di dua proses
+                progress(0, 2, "Nota Dinas + Berita Acara")
+                hasil = simpan_paralel([nd, ba], output_root, pool, batal)
+                if batal.is_set():
+                    raise JobDibatalkan()
+                progress(2, 2, "selesai")
+                return hasil
+            langkah = langkah_berurutan(
+                [
+                    ("Nota Dinas", lambda: nd.simpan(output_root)),
+                    ("Berita Acara", lambda: ba.simpan(output_root)),
+                ]
+            )
+            return langkah(progress, batal)
+
+        self._submit_job(GenerateJob("Semua", kerja, selesai))
+
+    def on_generate_roster(self):
+        if not self.dosen_by_id:
+            QMessageBox.critical(
+                self, "Gagal generate Roster", "Excel dosen belum diload."
+            )
+            return
+
+        path, _ = QFileDialog.getOpenFileName(
             self,
-            "Sukses",
-            "Berhasil generate 2 dokumen:\n"
-            f"1) Nota Dinas:\n{out_nd}\n\n"
-            f"2) Berita Acara:\n{out_ba}",
+            "Pilih Roster Ujian",
+            str(app_root()),
+            "Roster (*.xlsx *.csv)",
+        )
+        if not path:
+            return
+
+        zip_path: Path | None = None
+        tanya = QMessageBox(self)
+        tanya.setWindowTitle("Generate dari Roster")
+        tanya.setText(
+            "Simpan dokumen roster sebagai:\n"
+            "- Per folder Nama_NPM di folder output\n"
+            "- Satu file ZIP\n"
+            "- Satu file per hari ujian (semua BA / ND hari itu digabung)"
         )
+        b_folder = tanya.addButton("Per folder", QMessageBox.AcceptRole)
+        b_zip = tanya.addButton("ZIP", QMessageBox.AcceptRole)
+        b_hari = tanya.addButton("Gabung per hari", QMessageBox.AcceptRole)
+        tanya.addButton(QMessageBox.Cancel)
+        tanya.setDefaultButton(b_folder)
+        tanya.exec()
+        pilihan = tanya.clickedButton()
+        if pilihan not in (b_folder, b_zip, b_hari):
+            return
+        gabung = pilihan is b_hari
+        if pilihan is b_zip:
+            zip_file, _ = QFileDialog.getSaveFileName(
+                self,
+                "Simpan ZIP",
+                str(self.output_root / f"{Path(path).stem}.zip"),
+                "ZIP (*.zip)",
+            )
+            if not zip_file:
+                return
+            zip_path = Path(zip_file)
+
+        self._refresh_output_label()
+        roster_path = Path(path)
+        dosen_by_id = self.dosen_by_id
+        output_root = self.output_root
+        pool = self._render_pool
+        # write-behind ke folder output (bisa share jaringan); statistiknya
+        # ditampilkan di status
+        writer = None
+        if zip_path is None and pool is None and not gabung:
+            writer = OutputWriter()
+
+        arsip = self.arsip
+        # baris roster tanpa id_nd diberi nomor dari counter folder output
+        penomoran = (
+            PenomoranND(output_root) if self.chk_nd_otomatis.isChecked() else None
+        )
+
+        def render(progress, batal) -> list[HasilBaris]:
+            if gabung:
+                return jalankan_gabungan(
+                    roster_path,
+                    dosen_by_id,
+                    output_root,
+                    progress=lambda n, total, h: progress(
+                        n, total, f"baris {h.baris}: {h.nama_mahasiswa}"
+                    ),
+                    batal=batal,
+                    penomoran=penomoran,
+                )
+            try:
+                return jalankan_roster(
+                    roster_path,
+                    dosen_by_id,
+                    output_root,
+                    progress=lambda n, total, h: progress(
+                        n, total, f"baris {h.baris}: {h.nama_mahasiswa}"
+                    ),
+                    batal=batal,
+                    zip_path=zip_path,
+                    pool=pool,
+                    writer=writer,
+                    penomoran=penomoran,
+                )
+            finally:
+                if writer is not None:
+                    writer.tutup()
+
+        def kerja(progress, batal) -> list[HasilBaris]:
+            hasil = render(progress, batal)
+            if arsip is not None:
+                try:
+                    arsip.catat_hasil(hasil, SEMUA_JENIS)
+                except Exception:
+                    pass  # dokumen sudah jadi; arsip hanya pelengkap
+            return hasil
+
+        job = GenerateJob("Roster", kerja)
+
+        def selesai(hasil: list[HasilBaris]):
+            self._catat_jadwal([h.ujian for h in hasil if h.ok and h.ujian])
+            ok = sum(1 for h in hasil if h.ok)
+            info = " (dibatalkan)" if job.batal.is_set() else ""
+            if writer is not None and writer.files:
+                info += f" [tulis: {writer.ringkas()}]"
+            self.lbl_status.setText(
+                f"Status: roster selesai{info} → {ok}/{len(hasil)} baris sukses"
+            )
+            box = QMessageBox.warning if ok < len(hasil) else QMessageBox.information
+            box(self, "Generate dari Roster", ringkasan(hasil))
+
+        job.on_selesai = selesai
+        self._submit_job(job)
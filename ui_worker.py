@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from core.profiling import Rekaman, rekam
+
+# kerja(progress, batal) -> hasil
+#   progress(selesai, total, pesan) boleh dipanggil dari thread worker
+#   batal: Event yang di-set saat user klik "Batal"
+Kerja = Callable[[Callable[[int, int, str], None], threading.Event], Any]
+
+
+class JobDibatalkan(Exception):
+    pass
+
+
+class JobSignals(QObject):
+    progress = Signal(int, int, str)
+    selesai = Signal(object)
+    gagal = Signal(str)
+    dibatalkan = Signal()
+
+
+class GenerateJob(QRunnable):
+    """
+    Satu pekerjaan generate yang dijalankan di QThreadPool.
+
+    Semua input (form, folder output) sudah dikumpulkan di thread GUI sebelum
+    job dibuat; di sini hanya render + simpan file, tanpa menyentuh widget.
+    """
+
+    def __init__(
+        self,
+        judul: str,
+        kerja: Kerja,
+        on_selesai: Callable[[Any], None] | None = None,
+    ):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.judul = judul
+        self.kerja = kerja
+        self.on_selesai = on_selesai
+        self.batal = threading.Event()
+        self.signals = JobSignals()
+        # rincian waktu per tahap (kosong kalau profiling nonaktif)
+        self.rekaman = Rekaman()
+
+    def run(self):
+        try:
+            with rekam(self.judul.replace(" ", "_").lower()) as self.rekaman:
+                hasil = self.kerja(self.signals.progress.emit, self.batal)
+        except JobDibatalkan:
+            self.signals.dibatalkan.emit()
+            return
+        except Exception as e:
+            self.signals.gagal.emit(str(e))
+            return
+        # kerja yang berhenti sendiri saat batal (mis. roster) tetap mengirim
+        # hasil parsial; cek job.batal di handler kalau perlu
+        self.signals.selesai.emit(hasil)
+
+
+def langkah_berurutan(
+    langkah: list[tuple[str, Callable[[], Any]]],
+) -> Kerja:
+    """
+    Kerja dari daftar (label, fungsi). Pembatalan dicek sebelum tiap dokumen.
+    """
+
+    def kerja(progress, batal: threading.Event) -> list[Any]:
+        hasil = []
+        total = len(langkah)
+        for i, (label, fn) in enumerate(langkah):
+            if batal.is_set():
+                raise JobDibatalkan()
+            progress(i, total, label)
+            hasil.append(fn())
+        progress(total, total, "selesai")
+        return hasil
+
+    return kerja